@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from src.data.loader import DataLoader
+from src.data.storage import DataStorage
 
 
 @st.cache_data(ttl=3600)
@@ -60,6 +61,30 @@ def get_recent_market_data(symbol: str, period_days: int = 30) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=3600)
+def get_recent_close_panel(symbols: list[str], period_days: int = 30) -> pd.DataFrame:
+    """
+    一次读取多个品种最近 N 天的收盘价面板（不触发下载，先用 get_recent_market_data 更新本地数据）。
+
+    Args:
+        symbols: 品种代码列表
+        period_days: 时间窗口（天）
+
+    Returns:
+        DataFrame，index 为日期（统一交易日历），列为品种代码，无行情处为 NaN
+    """
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=period_days)
+
+    try:
+        storage = DataStorage(storage_dir="data")
+        panel = storage.load_panel("close", symbols, start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d"))
+        return panel.dropna(how="all")
+    except Exception as e:
+        st.warning(f"收盘价面板读取失败: {e}")
+        return pd.DataFrame()
+
+
 def calculate_period_return(df: pd.DataFrame) -> float:
     """计算区间内的简单收益率（百分比）"""
     if df.empty or len(df) < 2:
@@ -7,7 +7,7 @@ import pandas as pd
 import plotly.graph_objects as go
 
 from src.data.etf_catalog import ETFCatalog
-from components.data_loader import get_recent_market_data, calculate_period_return
+from components.data_loader import get_recent_market_data, get_recent_close_panel, calculate_period_return
 
 st.set_page_config(page_title="行情看板", page_icon="📊", layout="wide")
 
@@ -79,13 +79,18 @@ else:
 
         fig = go.Figure()
 
-        for sym, df in historical_data.items():
+        # 一次读取所选品种的收盘价面板（统一交易日历，各品种去掉无行情的日期）
+        closes = get_recent_close_panel(list(historical_data), period_days=days)
+        for sym in closes.columns:
             name = etf_options.get(sym, sym).split(" - ")[-1]
-            base_price = df.iloc[0]['收盘']
-            normalized_close = df['收盘'] / base_price
+            close = closes[sym].dropna()
+            if close.empty:
+                continue
+            base_price = close.iloc[0]
+            normalized_close = close / base_price
 
             fig.add_trace(go.Scatter(
-                x=df.index,
+                x=close.index,
                 y=normalized_close,
                 mode='lines',
                 name=name
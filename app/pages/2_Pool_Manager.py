@@ -84,14 +84,11 @@ def compute_momentum(codes: list[str], names_map: dict, momentum_days: int,
     """
     对给定标的列表计算动量得分。
 
-    执行增量数据更新后计算动量。
+    逐个标的执行增量数据更新后，一次读取收盘价面板计算动量。
     """
     total = len(codes)
-    ranking_data = []
 
     for i, sym in enumerate(codes):
-        name = names_map.get(sym, sym)
-
         # 增量数据更新
         last_date = storage.get_last_date(sym)
         try:
@@ -101,27 +98,30 @@ def compute_momentum(codes: list[str], names_map: dict, momentum_days: int,
         except Exception:
             pass
 
-        # 加载数据并计算动量
-        df = storage.load_bars(sym)
-        if not df.empty and len(df) >= 2:
-            current_price = df.iloc[-1]["close"]
-            past_idx = max(0, len(df) - momentum_days - 1)
-            past_price = df.iloc[past_idx]["close"]
+        # 更新进度
+        if progress_bar is not None and ((i + 1) % 10 == 0 or (i + 1) == total):
+            progress_bar.progress((i + 1) / total)
+            if status_container is not None:
+                status_container.write(f"已处理 {i+1}/{total}...")
+
+    # 加载收盘价面板并计算动量（面板为统一交易日历，各标的去掉无行情的日期）
+    closes = storage.load_panel("close", codes)
+    ranking_data = []
+    for sym in closes.columns:
+        close = closes[sym].dropna()
+        if len(close) >= 2:
+            current_price = close.iloc[-1]
+            past_idx = max(0, len(close) - momentum_days - 1)
+            past_price = close.iloc[past_idx]
             momentum_score = (current_price / past_price) - 1
 
             ranking_data.append({
                 "代码": sym,
-                "名称": name,
+                "名称": names_map.get(sym, sym),
                 "当前价格": round(current_price, 4),
                 "动量得分": round(momentum_score, 4),
             })
 
-        # 更新进度
-        if progress_bar is not None and ((i + 1) % 10 == 0 or (i + 1) == total):
-            progress_bar.progress((i + 1) / total)
-            if status_container is not None:
-                status_container.write(f"已处理 {i+1}/{total}...")
-
     if ranking_data:
         result_df = pd.DataFrame(ranking_data)
         result_df = result_df.sort_values(by="动量得分", ascending=False).reset_index(drop=True)
@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from src.config import STRATEGY_REGISTRY, create_strategy
 from src.backtest.engine import BacktestEngine
+from src.backtest.multi import MultiStrategyEngine
 from src.risk.position_sizer import PositionSizer
 from src.backtest.metrics import (
     format_report,
@@ -125,33 +126,49 @@ if run_clicked:
                 f"{df.index[0].strftime('%Y-%m-%d')} ~ {df.index[-1].strftime('%Y-%m-%d')}"
             )
 
-            # — 循环回测所有策略 —
+            # — 所有策略共享一次行情遍历 —
             all_results: list[dict] = []
             progress = st.progress(0, text="回测进行中...")
 
-            for i, sname in enumerate(selected_strategies):
-                progress.progress(
-                    (i + 1) / len(selected_strategies),
-                    text=f"正在回测: {STRATEGY_LABELS.get(sname, sname)}...",
-                )
+            engines: dict[str, BacktestEngine] = {}
+            for sname in selected_strategies:
                 try:
                     strategy = create_strategy({"name": sname, "params": {}})
-                    engine = BacktestEngine(
+                    engines[sname] = BacktestEngine(
                         strategy=strategy,
                         position_sizer=PositionSizer(risk_fraction=0.95),
                         initial_capital=initial_capital,
                         commission_rate=commission_rate,
                     )
-                    result = engine.run(df)
-                    all_results.append({
-                        "name": sname,
-                        "display_name": STRATEGY_LABELS.get(sname, sname),
-                        "strategy_name": result.strategy_name,
-                        "result": result,
-                    })
                 except Exception as e:
                     st.warning(f"策略 {sname} 回测失败: {e}")
 
+            try:
+                results = MultiStrategyEngine(list(engines.values())).run(df)
+            except Exception:
+                # 单次遍历失败时逐个策略回测，定位出错的策略
+                results = []
+                for i, (sname, engine) in enumerate(engines.items()):
+                    progress.progress(
+                        (i + 1) / len(engines),
+                        text=f"正在回测: {STRATEGY_LABELS.get(sname, sname)}...",
+                    )
+                    try:
+                        results.append(engine.run(df))
+                    except Exception as e:
+                        st.warning(f"策略 {sname} 回测失败: {e}")
+                        results.append(None)
+
+            for sname, result in zip(engines, results):
+                if result is None:
+                    continue
+                all_results.append({
+                    "name": sname,
+                    "display_name": STRATEGY_LABELS.get(sname, sname),
+                    "strategy_name": result.strategy_name,
+                    "result": result,
+                })
+
             progress.empty()
 
             if not all_results:
@@ -0,0 +1,68 @@
+"""
+回测提前终止条件
+
+参数扫描中大量组合很早就明显表现不佳（回撤过大、净值过低），
+满足任一终止条件时引擎停止推进，返回带 terminated 标记的部分结果。
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class EarlyStop:
+    """
+    提前终止条件（满足任一即终止）
+
+    Attributes:
+        max_drawdown: 回撤阈值（负数），如 -0.3 表示回撤达到 30% 时终止
+        min_equity: 净值下限（相对初始资金的比例），如 0.8 表示净值跌破初始资金 80% 时终止
+        min_equity_after: 从第 N 根 bar（0 起）开始检查净值下限
+    """
+    max_drawdown: float | None = None
+    min_equity: float | None = None
+    min_equity_after: int = 0
+
+    def __post_init__(self):
+        if self.max_drawdown is not None and not -1.0 <= self.max_drawdown < 0.0:
+            raise ValueError(f"max_drawdown 应在 [-1, 0) 之间，当前为 {self.max_drawdown}")
+        if self.min_equity is not None and self.min_equity <= 0:
+            raise ValueError(f"min_equity 应大于 0，当前为 {self.min_equity}")
+
+    def check(self, bar_index: int, equity: float, peak: float, initial_capital: float) -> str:
+        """
+        检查单个账户是否应终止
+
+        Args:
+            bar_index: 当前 bar 序号（0 起）
+            equity: 当前净值
+            peak: 截至当前的最高净值
+            initial_capital: 初始资金
+
+        Returns:
+            终止原因；未触发时返回空字符串
+        """
+        if self.max_drawdown is not None and peak > 0:
+            drawdown = (equity - peak) / peak
+            if drawdown <= self.max_drawdown:
+                return f"提前终止: 回撤 {drawdown:.2%} <= {self.max_drawdown:.2%}"
+        if (
+            self.min_equity is not None
+            and bar_index >= self.min_equity_after
+            and equity < initial_capital * self.min_equity
+        ):
+            return f"提前终止: 净值 {equity / initial_capital:.2%} < {self.min_equity:.2%} (第 {bar_index} 根 bar)"
+        return ""
+
+    def triggered(
+        self, bar_index: int, equity: np.ndarray, peak: np.ndarray, initial_capital: float
+    ) -> np.ndarray:
+        """批量检查多个账户（参数组合），返回是否触发终止的布尔数组（判断与 check 逐项一致）"""
+        hit = np.zeros(len(equity), dtype=bool)
+        if self.max_drawdown is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                hit |= (peak > 0) & ((equity - peak) / peak <= self.max_drawdown)
+        if self.min_equity is not None and bar_index >= self.min_equity_after:
+            hit |= equity < initial_capital * self.min_equity
+        return hit
@@ -2,26 +2,153 @@
 事件驱动回测引擎 - 逐 bar 推送，与实盘逻辑一致
 """
 
-from dataclasses import dataclass, field
+import copy
+import pickle
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Generator, Iterable, Iterator
+
+import numpy as np
 import pandas as pd
 
+from src.backtest.early_stop import EarlyStop
+from src.backtest.profiling import EngineProfile
 from src.strategy.base import Strategy, Signal
 from src.risk.risk_manager import RiskManager, RiskAction
 from src.risk.position_sizer import PositionSizer
 
 
-@dataclass
+# 回测运行模式：columnar 为默认快速路径，iterrows 为参考实现
+RUN_MODES = ("columnar", "iterrows")
+
+# 每日状态记录的紧凑结构（按 bar 数预分配，逐 bar 按下标写入）
+EQUITY_HISTORY_DTYPE = np.dtype(
+    [
+        ("equity", np.float64),
+        ("cash", np.float64),
+        ("position", np.int64),
+        ("price", np.float64),
+    ]
+)
+
+
+@dataclass(slots=True)
 class Trade:
     """交易记录"""
     date_open: str
     date_close: str
-    side: str           # "BUY"
+    side: str           # "LONG"
     quantity: int
     entry_price: float
     exit_price: float
     pnl: float          # 盈亏金额
     pnl_pct: float       # 盈亏百分比
     commission: float    # 总手续费
+    reason: str = ""     # 平仓原因
+
+
+# 交易记录各字段的 NumPy 列类型
+TRADE_COLUMN_DTYPES: dict[str, type] = {
+    "date_open": object,
+    "date_close": object,
+    "side": object,
+    "quantity": np.int64,
+    "entry_price": np.float64,
+    "exit_price": np.float64,
+    "pnl": np.float64,
+    "pnl_pct": np.float64,
+    "commission": np.float64,
+    "reason": object,
+}
+
+
+class TradeLog:
+    """
+    列式交易记录（struct-of-arrays）
+
+    每个字段单独存为一列，绩效指标直接在 NumPy 列上向量化计算。
+    兼容原 list[dict] 用法：len()、迭代、下标访问均返回字典形式的交易记录。
+    """
+
+    COLUMNS: tuple[str, ...] = tuple(f.name for f in fields(Trade))
+
+    def __init__(self):
+        self._data: dict[str, list] = {name: [] for name in self.COLUMNS}
+        self._arrays: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_dicts(cls, trades: Iterable[dict]) -> "TradeLog":
+        """由字典形式的交易记录构造（缺失的字段按 Trade 默认值或 0 填充）"""
+        log = cls()
+        for t in trades:
+            for name in cls.COLUMNS:
+                default = "" if TRADE_COLUMN_DTYPES[name] is object else 0
+                log._data[name].append(t.get(name, default))
+        return log
+
+    def append(self, trade: Trade) -> None:
+        """追加一笔交易"""
+        for name in self.COLUMNS:
+            self._data[name].append(getattr(trade, name))
+        self._arrays.clear()
+
+    def column(self, name: str) -> np.ndarray:
+        """获取单列 NumPy 数组（按需构建并缓存）"""
+        if name not in self._arrays:
+            self._arrays[name] = np.array(self._data[name], dtype=TRADE_COLUMN_DTYPES[name])
+        return self._arrays[name]
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """获取全部列"""
+        return {name: self.column(name) for name in self.COLUMNS}
+
+    def record(self, i: int) -> Trade:
+        """获取第 i 笔交易的 Trade 记录"""
+        return Trade(**{name: self._data[name][i] for name in self.COLUMNS})
+
+    def to_dicts(self) -> list[dict]:
+        """转换为 list[dict]（兼容旧接口）"""
+        return [self[i] for i in range(len(self))]
+
+    def to_frame(self) -> pd.DataFrame:
+        """转换为 DataFrame"""
+        return pd.DataFrame(self.columns(), columns=list(self.COLUMNS))
+
+    def to_arrow(self):
+        """转换为 pyarrow.Table"""
+        import pyarrow as pa
+
+        return pa.table({name: self._data[name] for name in self.COLUMNS})
+
+    def copy(self) -> "TradeLog":
+        log = TradeLog()
+        log._data = {name: values.copy() for name, values in self._data.items()}
+        return log
+
+    def clear(self) -> None:
+        for values in self._data.values():
+            values.clear()
+        self._arrays.clear()
+
+    def __len__(self) -> int:
+        return len(self._data["pnl"])
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> dict:
+        return {name: self._data[name][i] for name in self.COLUMNS}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TradeLog):
+            return self._data == other._data
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeLog({len(self)} trades)"
 
 
 @dataclass
@@ -31,10 +158,51 @@ class BacktestResult:
     daily_returns: pd.Series = field(default_factory=pd.Series)
     benchmark_returns: pd.Series = field(default_factory=pd.Series)
     benchmark_curve: pd.Series = field(default_factory=pd.Series)
-    trades: list[dict] = field(default_factory=list)
+    trades: TradeLog = field(default_factory=TradeLog)
     final_equity: float = 0.0
     initial_capital: float = 0.0
     strategy_name: str = ""
+    profile: EngineProfile | None = None  # 分阶段性能统计（profile 模式）
+    terminated: bool = False    # 是否因提前终止条件而未跑完全部 bar
+    termination_reason: str = ""
+
+
+@dataclass
+class EngineCheckpoint:
+    """
+    回测引擎断点快照
+
+    保存账户状态、每日状态记录、交易记录与策略内部状态（deque、均线等），
+    用于之后只追加新 bar 继续回测。
+    """
+    cash: float
+    position: int
+    entry_price: float
+    entry_date: str
+    equity_history: np.ndarray
+    index: pd.Index
+    trades: TradeLog
+    strategy: Strategy
+    # 引擎配置 (initial_capital, slippage, commission_rate)，恢复时校验
+    config: tuple[float, float, float]
+    peak_equity: float = float("-inf")
+    stop_reason: str = ""
+
+    def save(self, path: str | Path) -> None:
+        """保存快照到文件（pickle）"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "EngineCheckpoint":
+        """从文件加载快照（仅加载可信来源的文件）"""
+        with open(path, "rb") as f:
+            checkpoint = pickle.load(f)
+        if not isinstance(checkpoint, cls):
+            raise ValueError(f"文件不是回测引擎快照: {path}")
+        return checkpoint
 
 
 class BacktestEngine:
@@ -52,6 +220,8 @@ class BacktestEngine:
         initial_capital: float = 100_000.0,
         slippage: float = 0.0001,       # 0.01%
         commission_rate: float = 0.0003, # 0.03%
+        profile: bool = False,
+        early_stop: EarlyStop | None = None,
     ):
         self.strategy = strategy
         self.risk_manager = risk_manager or RiskManager()
@@ -59,27 +229,251 @@ class BacktestEngine:
         self.initial_capital = initial_capital
         self.slippage = slippage
         self.commission_rate = commission_rate
+        self.profile = profile      # 是否记录分阶段耗时
+        self._profile: EngineProfile | None = None
+        self.early_stop = early_stop  # 提前终止条件（None 表示跑完全部 bar）
+        self._peak_equity = float("-inf")
+        self._stop_reason = ""
 
         # 账户状态
         self._cash = initial_capital
         self._position = 0          # 持仓数量
         self._entry_price = 0.0     # 开仓均价
         self._entry_date = ""       # 开仓日期
-        self._equity_history: list[dict] = []
-        self._trades: list[dict] = []
-
-    def run(self, data: pd.DataFrame) -> BacktestResult:
+        self._equity_history = np.zeros(0, dtype=EQUITY_HISTORY_DTYPE)
+        self._bar_count = 0         # 已记录的 bar 数
+        self._index = pd.Index([], name="date")  # 已处理 bar 的日期
+        self._trades = TradeLog()
+
+        # 批量信号模式会跳过 on_bar，此时策略指标状态未同步，断点续跑前需按历史 bar 补放
+        self._strategy_synced = True
+        self._data: pd.DataFrame | None = None
+
+        # 依赖成交回报的策略：信号由 signal_stepper() 按实际成交逐 bar 推进，
+        # 成交记入日志 (bar 序号, 是否在信号之后, 信号)，供补放策略状态时使用
+        self._stepper: Generator[Signal, tuple, None] | None = None
+        self._fill_log: list[tuple[int, bool, Signal]] | None = None
+        self._fills_after: list[Signal] = []   # 上一根信号之后的成交
+        self._fills_before: list[Signal] = []  # 当根信号之前的成交
+        self._signal_generated = False
+
+    def run(self, data: pd.DataFrame, mode: str = "columnar") -> BacktestResult:
         """
         运行回测
 
         Args:
             data: 包含 open, high, low, close, volume 列的 DataFrame，index 为日期
+            mode: 运行模式
+                - "columnar": 一次性抽取 OHLCV 列为连续数组，按整数下标驱动（默认）；
+                  策略实现了 generate_signals() 时自动改用批量信号
+                - "iterrows": 逐行 iterrows 的参考实现，用于一致性校验
 
         Returns:
             BacktestResult 包含净值曲线、交易记录等
         """
-        self._reset()
+        if mode not in RUN_MODES:
+            available = ", ".join(RUN_MODES)
+            raise ValueError(f"未知运行模式: '{mode}'。可用模式: {available}")
+
+        self._reset(data)
+
+        if mode == "iterrows":
+            self._run_iterrows(data)
+        else:
+            self._run_columnar(data)
+
+        return self._build_result()
+
+    def append(self, data: pd.DataFrame) -> BacktestResult:
+        """
+        增量追加新 bar，从当前状态继续回测
+
+        只处理晚于已处理最后一根 bar 的数据，新 bar 逐根推送给策略。
+        结果与对完整历史重新调用 run() 一致，耗时只与新 bar 数量有关。
+
+        Args:
+            data: 新增行情（可与已处理数据重叠，重叠部分自动跳过）
+
+        Returns:
+            覆盖完整历史的 BacktestResult
+        """
+        if self._stop_reason:
+            return self._build_result()  # 已提前终止，不再推进
+        if self._bar_count > 0:
+            data = data[data.index > self._index[self._bar_count - 1]]
+
+        self._sync_strategy()
+        self._bind_stages()
+        self._equity_history = np.concatenate(
+            [
+                self._equity_history[: self._bar_count],
+                np.zeros(len(data), dtype=EQUITY_HISTORY_DTYPE),
+            ]
+        )
+        if self._bar_count == 0:
+            self._index = data.index.rename("date")
+        else:
+            self._index = self._index[: self._bar_count].append(data.index).rename("date")
+
+        for date, bar in iter_bars(data):
+            self._step(date, bar)
+            if self._stop_reason:
+                break
+
+        return self._build_result()
+
+    def _bind_stages(self) -> None:
+        """
+        绑定热循环各阶段的调用入口
+
+        profile 模式下替换为计时包装并新建统计；否则直接绑定原方法，无额外开销。
+        """
+        stages = {
+            "batch_signals": self._batch_signals,
+            "on_bar": self.strategy.on_bar,
+            "risk_check": self.risk_manager.check,
+            "generate_signal": self.strategy.generate_signal,
+            "execute_buy": self._execute_buy,
+            "execute_sell": self._execute_sell,
+            "record": self._record,
+        }
+        if self.profile:
+            self._profile = EngineProfile()
+            stages = {name: self._profile.timed(name, func) for name, func in stages.items()}
+        else:
+            self._profile = None
+
+        self._stage_batch_signals = stages["batch_signals"]
+        self._stage_on_bar = stages["on_bar"]
+        self._stage_risk_check = stages["risk_check"]
+        self._stage_generate_signal = stages["generate_signal"]
+        self._stage_execute_buy = stages["execute_buy"]
+        self._stage_execute_sell = stages["execute_sell"]
+        self._stage_record = stages["record"]
+
+    def checkpoint(self) -> EngineCheckpoint:
+        """生成当前状态的断点快照（与引擎后续运行互不影响）"""
+        self._sync_strategy()
+        return EngineCheckpoint(
+            cash=self._cash,
+            position=self._position,
+            entry_price=self._entry_price,
+            entry_date=self._entry_date,
+            equity_history=self._equity_history[: self._bar_count].copy(),
+            index=self._index[: self._bar_count],
+            trades=self._trades.copy(),
+            strategy=copy.deepcopy(self.strategy),
+            config=(self.initial_capital, self.slippage, self.commission_rate),
+            peak_equity=self._peak_equity,
+            stop_reason=self._stop_reason,
+        )
+
+    def restore(self, checkpoint: EngineCheckpoint) -> None:
+        """
+        从断点快照恢复状态，之后可调用 append() 追加新 bar
+
+        Raises:
+            ValueError: 快照的引擎配置或策略类型与当前引擎不一致
+        """
+        config = (self.initial_capital, self.slippage, self.commission_rate)
+        if checkpoint.config != config:
+            raise ValueError(f"快照引擎配置 {checkpoint.config} 与当前配置 {config} 不一致")
+        if type(checkpoint.strategy) is not type(self.strategy):
+            raise ValueError(
+                f"快照策略类型 {type(checkpoint.strategy).__name__} "
+                f"与当前策略 {type(self.strategy).__name__} 不一致"
+            )
+
+        self._cash = checkpoint.cash
+        self._position = checkpoint.position
+        self._entry_price = checkpoint.entry_price
+        self._entry_date = checkpoint.entry_date
+        self._equity_history = checkpoint.equity_history.copy()
+        self._bar_count = len(checkpoint.equity_history)
+        self._index = checkpoint.index
+        self._trades = checkpoint.trades.copy()
+        self.strategy = copy.deepcopy(checkpoint.strategy)
+        self._peak_equity = checkpoint.peak_equity
+        self._stop_reason = checkpoint.stop_reason
+        self._strategy_synced = True
+        self._data = None
+        self._stepper = None
+        self._fill_log = None
+
+    def _sync_strategy(self) -> None:
+        """批量信号运行后按历史 bar 补放 on_bar，使策略指标状态与逐 bar 运行一致"""
+        if self._strategy_synced:
+            return
+        if self._fill_log is not None:
+            self._replay_fills()
+        else:
+            for _, bar in iter_bars(self._data):
+                self.strategy.on_bar(bar)
+        self._strategy_synced = True
+        self._data = None
+        self._stepper = None
+        self._fill_log = None
+
+    def _replay_fills(self) -> None:
+        """按成交日志补放已处理的 bar：on_bar → 信号前成交 → generate_signal → 信号后成交"""
+        fills: dict[int, list[tuple[bool, Signal]]] = {}
+        for index, after_signal, signal in self._fill_log:
+            fills.setdefault(index, []).append((after_signal, signal))
+
+        for i, (_, bar) in enumerate(iter_bars(self._data)):
+            if i == self._bar_count:
+                break
+            self.strategy.on_bar(bar)
+            for after_signal, signal in fills.get(i, ()):
+                if not after_signal:
+                    self.strategy.on_fill(signal)
+            self.strategy.generate_signal()
+            for after_signal, signal in fills.get(i, ()):
+                if after_signal:
+                    self.strategy.on_fill(signal)
+
+    def _notify_fill(self, signal: Signal) -> None:
+        """通知策略成交；signal_stepper 驱动时记入成交日志，在下次生成信号时转交生成器"""
+        if self._fill_log is None:
+            self.strategy.on_fill(signal)
+            return
+        self._fill_log.append((self._bar_count, self._signal_generated, signal))
+        if self._signal_generated:
+            self._fills_after.append(signal)
+        else:
+            self._fills_before.append(signal)
+
+    def _run_columnar(self, data: pd.DataFrame) -> None:
+        """列式快速路径：OHLCV 列只抽取一次，循环内按下标取值"""
+        signals = self._stage_batch_signals(data)
+        for i, (date, bar) in enumerate(iter_bars(data)):
+            self._step(date, bar, signals[i] if signals is not None else None)
+            if self._stop_reason:
+                break
+
+    def _batch_signals(self, data: pd.DataFrame) -> list[Signal] | None:
+        """
+        获取策略的批量信号，不支持时返回 None（回退逐 bar 模式）
 
+        依赖成交回报的策略不使用批量信号，改由 signal_stepper() 按实际成交逐 bar 推进，
+        同样返回 None；不支持 signal_stepper() 时回退逐 bar 模式。
+        """
+        if self.strategy.fill_dependent_signals:
+            stepper = self.strategy.signal_stepper(data)
+            if stepper is not None:
+                next(stepper)
+                self._stepper = stepper
+                self._fill_log = []
+                self._strategy_synced = False
+            return None
+        signals = self.strategy.generate_signals(data)
+        if signals is None:
+            return None
+        self._strategy_synced = False
+        return signals.tolist()
+
+    def _run_iterrows(self, data: pd.DataFrame) -> None:
+        """参考路径：逐行 iterrows 构造 bar（保留用于一致性校验）"""
         for date, row in data.iterrows():
             bar = {
                 "date": str(date),
@@ -89,55 +483,78 @@ class BacktestEngine:
                 "close": float(row["close"]),
                 "volume": float(row["volume"]),
             }
-            current_price = bar["close"]
+            self._step(date, bar)
+            if self._stop_reason:
+                break
 
-            # 1. 策略接收数据
-            self.strategy.on_bar(bar)
+    def _step(self, date, bar: dict, batch_signal: Signal | None = None) -> None:
+        """
+        处理单根 bar：策略 → 风控 → 执行 → 记录
 
-            # 2. 风控检查现有持仓（止损/止盈）
-            if self._position > 0:
-                risk_result = self.risk_manager.check(
-                    signal=Signal.HOLD,
-                    current_position=self._position,
-                    entry_price=self._entry_price,
-                    current_price=current_price,
-                )
-                if risk_result.should_close:
-                    self._execute_sell(current_price, bar["date"], risk_result.reason)
-
-            # 3. 策略生成信号
-            signal = self.strategy.generate_signal()
-
-            # 4. 风控检查新信号
-            if signal != Signal.HOLD:
-                risk_result = self.risk_manager.check(
-                    signal=signal,
-                    current_position=self._position,
-                    entry_price=self._entry_price if self._position > 0 else None,
-                    current_price=current_price,
-                )
-
-                if risk_result.should_close:
-                    self._execute_sell(current_price, bar["date"], risk_result.reason)
-                elif risk_result.passed:
-                    if signal == Signal.BUY and self._position == 0:
-                        self._execute_buy(current_price, bar["date"])
-                    elif signal == Signal.SELL and self._position > 0:
-                        self._execute_sell(current_price, bar["date"], "策略卖出信号")
-
-            # 5. 记录每日状态
-            equity = self._cash + self._position * current_price
-            self._equity_history.append(
-                {
-                    "date": date,
-                    "equity": equity,
-                    "cash": self._cash,
-                    "position": self._position,
-                    "price": current_price,
-                }
+        传入 batch_signal 时直接使用批量信号，跳过策略的逐 bar 计算。
+        """
+        current_price = bar["close"]
+        stepper = self._stepper
+        if stepper is not None:
+            self._signal_generated = False
+
+        # 1. 策略接收数据
+        if batch_signal is None and stepper is None:
+            self._stage_on_bar(bar)
+
+        # 2. 风控检查现有持仓（止损/止盈）
+        if self._position > 0:
+            risk_result = self._stage_risk_check(
+                signal=Signal.HOLD,
+                current_position=self._position,
+                entry_price=self._entry_price,
+                current_price=current_price,
+            )
+            if risk_result.should_close:
+                self._stage_execute_sell(current_price, bar["date"], risk_result.reason)
+
+        # 3. 策略生成信号
+        if batch_signal is not None:
+            signal = batch_signal
+        elif stepper is not None:
+            signal = stepper.send((self._fills_after, self._fills_before))
+            self._fills_after, self._fills_before = [], []
+            self._signal_generated = True
+        else:
+            signal = self._stage_generate_signal()
+
+        # 4. 风控检查新信号
+        if signal != Signal.HOLD:
+            risk_result = self._stage_risk_check(
+                signal=signal,
+                current_position=self._position,
+                entry_price=self._entry_price if self._position > 0 else None,
+                current_price=current_price,
             )
 
-        return self._build_result(data)
+            if risk_result.should_close:
+                self._stage_execute_sell(current_price, bar["date"], risk_result.reason)
+            elif risk_result.passed:
+                if signal == Signal.BUY and self._position == 0:
+                    self._stage_execute_buy(current_price, bar["date"])
+                elif signal == Signal.SELL and self._position > 0:
+                    self._stage_execute_sell(current_price, bar["date"], "策略卖出信号")
+
+        # 5. 记录每日状态
+        equity = self._cash + self._position * current_price
+        self._stage_record(date, equity, current_price)
+
+        # 6. 提前终止检查
+        if self.early_stop is not None:
+            self._peak_equity = max(self._peak_equity, equity)
+            self._stop_reason = self.early_stop.check(
+                self._bar_count - 1, equity, self._peak_equity, self.initial_capital
+            )
+
+    def _record(self, date, equity: float, price: float) -> None:
+        """写入当根 bar 的账户状态（日期与行情 index 一一对应，无需单独记录）"""
+        self._equity_history[self._bar_count] = (equity, self._cash, self._position, price)
+        self._bar_count += 1
 
     def _execute_buy(self, price: float, date: str) -> None:
         """执行买入"""
@@ -173,7 +590,7 @@ class BacktestEngine:
         self._position = quantity
         self._entry_price = actual_price
         self._entry_date = date
-        self.strategy.on_fill(Signal.BUY)
+        self._notify_fill(Signal.BUY)
 
     def _execute_sell(self, price: float, date: str, reason: str = "") -> None:
         """执行卖出"""
@@ -195,18 +612,18 @@ class BacktestEngine:
 
         # 记录交易
         self._trades.append(
-            {
-                "date_open": self._entry_date or date,
-                "date_close": date,
-                "side": "LONG",
-                "quantity": self._position,
-                "entry_price": self._entry_price,
-                "exit_price": actual_price,
-                "pnl": pnl,
-                "pnl_pct": pnl_pct,
-                "commission": commission + entry_commission,
-                "reason": reason,
-            }
+            Trade(
+                date_open=self._entry_date or date,
+                date_close=date,
+                side="LONG",
+                quantity=self._position,
+                entry_price=self._entry_price,
+                exit_price=actual_price,
+                pnl=pnl,
+                pnl_pct=pnl_pct,
+                commission=commission + entry_commission,
+                reason=reason,
+            )
         )
 
         # 更新账户
@@ -214,35 +631,61 @@ class BacktestEngine:
         self._position = 0
         self._entry_price = 0.0
         self._entry_date = ""
-        self.strategy.on_fill(Signal.SELL)
+        self._notify_fill(Signal.SELL)
 
-    def _reset(self) -> None:
-        """重置引擎状态"""
+    def _reset(self, data: pd.DataFrame) -> None:
+        """重置引擎状态，并按行情 bar 数预分配状态记录"""
         self._cash = self.initial_capital
         self._position = 0
         self._entry_price = 0.0
         self._entry_date = ""
-        self._equity_history.clear()
+        self._equity_history = np.zeros(len(data), dtype=EQUITY_HISTORY_DTYPE)
+        self._bar_count = 0
+        self._index = data.index.rename("date")
         self._trades.clear()
+        self._peak_equity = float("-inf")
+        self._stop_reason = ""
+        self._strategy_synced = True
+        self._data = data
+        self._stepper = None
+        self._fill_log = None
+        self._fills_after, self._fills_before = [], []
+        self._bind_stages()
         self.strategy.reset()
 
-    def _build_result(self, data: pd.DataFrame | None = None) -> BacktestResult:
-        """构建回测结果"""
-        if not self._equity_history:
-            return BacktestResult(initial_capital=self.initial_capital)
+    def _build_result(
+        self, benchmark: tuple[pd.Series, pd.Series] | None = None
+    ) -> BacktestResult:
+        """
+        构建回测结果（profile 模式下同时结束计时并附加统计）
 
-        df = pd.DataFrame(self._equity_history)
-        df.set_index("date", inplace=True)
+        Args:
+            benchmark: 预先计算的 (基准净值, 基准收益)，多策略共享行情时避免重复计算；
+                       默认由记录的每日收盘价构建
+        """
+        if self._profile is None:
+            return self._make_result(benchmark)
+
+        result = self._profile.timed("build_result", self._make_result)(benchmark)
+        self._profile.finish()
+        result.profile = self._profile
+        return result
 
-        equity_curve = df["equity"]
+    def _make_result(self, benchmark: tuple[pd.Series, pd.Series] | None) -> BacktestResult:
+        """由状态记录与交易记录构建 BacktestResult"""
+        if self._bar_count == 0:
+            return BacktestResult(initial_capital=self.initial_capital)
+
+        # 提前终止时 equity_curve 等只覆盖已处理的 bar
+        equity_curve = self._equity_curve()
         daily_returns = equity_curve.pct_change().fillna(0)
 
-        # 构建基准数据
-        benchmark_returns = pd.Series(dtype=float)
-        benchmark_curve = pd.Series(dtype=float)
-        if data is not None and "close" in data.columns:
-            benchmark_curve = data["close"].reindex(equity_curve.index)
-            benchmark_returns = benchmark_curve.pct_change().fillna(0)
+        # 构建基准数据（买入持有）
+        if benchmark is None:
+            prices = self._equity_history["price"][: self._bar_count].copy()
+            benchmark_curve = pd.Series(prices, index=equity_curve.index, name="close")
+            benchmark = (benchmark_curve, benchmark_curve.pct_change().fillna(0))
+        benchmark_curve, benchmark_returns = benchmark
 
         return BacktestResult(
             equity_curve=equity_curve,
@@ -253,4 +696,44 @@ class BacktestEngine:
             final_equity=equity_curve.iloc[-1],
             initial_capital=self.initial_capital,
             strategy_name=self.strategy.name,
+            terminated=bool(self._stop_reason),
+            termination_reason=self._stop_reason,
         )
+
+    def _equity_curve(self) -> pd.Series:
+        """由预分配的状态记录直接构造净值曲线（index 沿用行情日期）"""
+        equity = self._equity_history["equity"][: self._bar_count].copy()
+        return pd.Series(equity, index=self._index[: self._bar_count], name="equity")
+
+
+def iter_bars(data: pd.DataFrame) -> Iterator[tuple[object, dict]]:
+    """
+    按列一次性抽取 OHLCV，逐根产出 (日期, bar 字典)
+
+    tolist() 得到 Python float，与逐行 float(row[...]) 结果逐位一致。
+    """
+    dates = data.index.tolist()
+    opens = data["open"].to_numpy(dtype=np.float64).tolist()
+    highs = data["high"].to_numpy(dtype=np.float64).tolist()
+    lows = data["low"].to_numpy(dtype=np.float64).tolist()
+    closes = data["close"].to_numpy(dtype=np.float64).tolist()
+    volumes = data["volume"].to_numpy(dtype=np.float64).tolist()
+
+    for i in range(len(dates)):
+        date = dates[i]
+        yield date, {
+            "date": str(date),
+            "open": opens[i],
+            "high": highs[i],
+            "low": lows[i],
+            "close": closes[i],
+            "volume": volumes[i],
+        }
+
+
+def benchmark_series(data: pd.DataFrame, index: pd.Index) -> tuple[pd.Series, pd.Series]:
+    """计算基准（买入持有）净值与日收益，行情无 close 列时返回空序列"""
+    if "close" not in data.columns:
+        return pd.Series(dtype=float), pd.Series(dtype=float)
+    benchmark_curve = data["close"].reindex(index)
+    return benchmark_curve, benchmark_curve.pct_change().fillna(0)
@@ -11,6 +11,8 @@
 import numpy as np
 import pandas as pd
 
+from src.backtest.engine import TradeLog
+
 
 # ===== 全局配置 =====
 RISK_FREE_RATE = 0.0
@@ -191,30 +193,50 @@ def sortino_ratio(daily_returns: pd.Series) -> float:
 # 4. 交易统计 (Trade Statistics)
 # =====================================================================
 
-def win_rate(trades: list[dict]) -> float:
+TradeRecords = TradeLog | list[dict]
+
+
+def _trade_log(trades: TradeRecords) -> TradeLog:
+    """统一转换为列式交易记录（兼容 list[dict]）"""
+    return trades if isinstance(trades, TradeLog) else TradeLog.from_dicts(trades)
+
+
+def _max_streak(mask: np.ndarray) -> int:
+    """布尔序列中最长连续 True 的长度"""
+    if not mask.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
+
+
+def win_rate(trades: TradeRecords) -> float:
     """胜率 = 盈利交易数 / 总交易数"""
     if not trades:
         return 0.0
-    winning = sum(1 for t in trades if t.get("pnl", 0) > 0)
-    return winning / len(trades)
+    pnl = _trade_log(trades).column("pnl")
+    return int(np.count_nonzero(pnl > 0)) / len(pnl)
 
 
-def profit_loss_ratio(trades: list[dict]) -> float:
+def profit_loss_ratio(trades: TradeRecords) -> float:
     """盈亏比 = 平均盈利 / |平均亏损|"""
     if not trades:
         return 0.0
-    profits = [t["pnl"] for t in trades if t.get("pnl", 0) > 0]
-    losses = [t["pnl"] for t in trades if t.get("pnl", 0) < 0]
-    if not profits:
+    pnl = _trade_log(trades).column("pnl")
+    profits = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    if len(profits) == 0:
         return 0.0
-    if not losses:
+    if len(losses) == 0:
         return float("inf")
-    avg_profit = sum(profits) / len(profits)
-    avg_loss = abs(sum(losses) / len(losses))
+    # 与逐笔累加的舍入一致（np.mean 为成对求和，少数账本末位不同）
+    avg_profit = sum(profits.tolist()) / len(profits)
+    avg_loss = abs(sum(losses.tolist()) / len(losses))
     return avg_profit / avg_loss if avg_loss > 0 else float("inf")
 
 
-def expectancy(trades: list[dict]) -> float:
+def expectancy(trades: TradeRecords) -> float:
     """
     期望值 = 胜率 × 盈亏比 - (1 - 胜率)
 
@@ -227,57 +249,39 @@ def expectancy(trades: list[dict]) -> float:
     return wr * plr - (1 - wr)
 
 
-def trade_frequency(trades: list[dict], total_days: int) -> float:
+def trade_frequency(trades: TradeRecords, total_days: int) -> float:
     """交易频率: 平均几个交易日做一次交易"""
     if not trades or total_days <= 0:
         return 0.0
     return total_days / len(trades)
 
 
-def avg_holding_period(trades: list[dict]) -> float:
+def avg_holding_period(trades: TradeRecords) -> float:
     """平均持仓天数"""
     if not trades:
         return 0.0
-    holding_days = []
-    for t in trades:
-        try:
-            open_dt = pd.Timestamp(t["date_open"])
-            close_dt = pd.Timestamp(t["date_close"])
-            days = (close_dt - open_dt).days
-            holding_days.append(max(days, 1))  # 至少 1 天
-        except (KeyError, ValueError):
-            continue
-    return sum(holding_days) / len(holding_days) if holding_days else 0.0
-
-
-def max_consecutive_losses(trades: list[dict]) -> int:
+    log = _trade_log(trades)
+    open_dt = pd.to_datetime(log.column("date_open"), errors="coerce")
+    close_dt = pd.to_datetime(log.column("date_close"), errors="coerce")
+    days = np.asarray((close_dt - open_dt).days, dtype=np.float64)
+    days = days[~np.isnan(days)]
+    if len(days) == 0:
+        return 0.0
+    return float(np.maximum(days, 1).mean())  # 至少 1 天
+
+
+def max_consecutive_losses(trades: TradeRecords) -> int:
     """最大连续亏损次数"""
     if not trades:
         return 0
-    max_streak = 0
-    current_streak = 0
-    for t in trades:
-        if t.get("pnl", 0) < 0:
-            current_streak += 1
-            max_streak = max(max_streak, current_streak)
-        else:
-            current_streak = 0
-    return max_streak
-
-
-def max_consecutive_wins(trades: list[dict]) -> int:
+    return _max_streak(_trade_log(trades).column("pnl") < 0)
+
+
+def max_consecutive_wins(trades: TradeRecords) -> int:
     """最大连续盈利次数"""
     if not trades:
         return 0
-    max_streak = 0
-    current_streak = 0
-    for t in trades:
-        if t.get("pnl", 0) > 0:
-            current_streak += 1
-            max_streak = max(max_streak, current_streak)
-        else:
-            current_streak = 0
-    return max_streak
+    return _max_streak(_trade_log(trades).column("pnl") > 0)
 
 
 # =====================================================================
@@ -318,6 +322,47 @@ def monthly_returns_table(daily_returns: pd.Series) -> pd.DataFrame:
     return pivot
 
 
+# =====================================================================
+# 6. 参数网格批量指标
+# =====================================================================
+
+def grid_metrics(equity: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    对净值矩阵（组合数 × 交易日）逐行计算核心指标
+
+    计算方式与 total_return / sharpe_ratio / max_drawdown 作用于单条
+    pd.Series（日收益为 pct_change().fillna(0)）时逐位一致。
+
+    Returns:
+        {"total_return": ..., "sharpe_ratio": ..., "max_drawdown": ...}，每项长度为组合数
+    """
+    n_combos, n = equity.shape
+    if n < 2:
+        zeros = np.zeros(n_combos)
+        return {"total_return": zeros, "sharpe_ratio": zeros.copy(), "max_drawdown": zeros.copy()}
+
+    total_ret = equity[:, -1] / equity[:, 0] - 1
+
+    # 日收益率
+    returns = np.zeros_like(equity)
+    returns[:, 1:] = equity[:, 1:] / equity[:, :-1] - 1
+
+    # 夏普比率（样本标准差，计算步骤同 pandas 的 mean / std）
+    mean = returns.sum(axis=1) / n
+    std = np.sqrt(((mean[:, None] - returns) ** 2).sum(axis=1) / (n - 1))
+    daily_rf = RISK_FREE_RATE / TRADING_DAYS_PER_YEAR
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(
+            std == 0, 0.0, (mean - daily_rf) / std * (TRADING_DAYS_PER_YEAR ** 0.5)
+        )
+
+    # 最大回撤
+    cum_max = np.maximum.accumulate(equity, axis=1)
+    mdd = ((equity - cum_max) / cum_max).min(axis=1)
+
+    return {"total_return": total_ret, "sharpe_ratio": sharpe, "max_drawdown": mdd}
+
+
 # =====================================================================
 # 综合报告
 # =====================================================================
@@ -325,7 +370,7 @@ def monthly_returns_table(daily_returns: pd.Series) -> pd.DataFrame:
 def format_report(
     equity_curve: pd.Series,
     daily_returns: pd.Series,
-    trades: list[dict],
+    trades: TradeRecords,
     benchmark_returns: pd.Series | None = None,
     symbol: str = "",
     strategy_name: str = "",
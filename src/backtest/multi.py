@@ -0,0 +1,60 @@
+"""
+多策略回测引擎 - 多个策略共享同一条行情流，单次遍历完成全部回测
+
+每个策略保留独立的账户、风控与仓位管理（即各自的 BacktestEngine），
+行情只解码一次，每根 bar 依次推送给所有策略；基准数据也只计算一次。
+结果与逐个调用 BacktestEngine.run() 完全一致。
+"""
+
+import pandas as pd
+
+from src.backtest.engine import BacktestEngine, BacktestResult, benchmark_series, iter_bars
+
+
+class MultiStrategyEngine:
+    """
+    多策略单次遍历回测引擎
+
+    用法:
+        engines = [BacktestEngine(strategy=s, ...) for s in strategies]
+        results = MultiStrategyEngine(engines).run(df)
+    """
+
+    def __init__(self, engines: list[BacktestEngine]):
+        if len({id(e) for e in engines}) != len(engines):
+            raise ValueError("同一个 BacktestEngine 实例不能重复加入")
+        self.engines = engines
+
+    def run(self, data: pd.DataFrame) -> list[BacktestResult]:
+        """
+        运行回测
+
+        Args:
+            data: 包含 open, high, low, close, volume 列的 DataFrame，index 为日期
+
+        Returns:
+            与 engines 一一对应的 BacktestResult 列表
+        """
+        for engine in self.engines:
+            engine._reset(data)
+
+        # 支持批量信号的策略一次性生成信号，其余逐 bar 计算
+        steps = [
+            (engine, engine._step, engine._stage_batch_signals(data)) for engine in self.engines
+        ]
+        can_stop = any(engine.early_stop is not None for engine in self.engines)
+
+        for i, (date, bar) in enumerate(iter_bars(data)):
+            for _, step, signals in steps:
+                step(date, bar, signals[i] if signals is not None else None)
+            # 提前终止的引擎不再推进
+            if can_stop and any(engine._stop_reason for engine, _, _ in steps):
+                steps = [s for s in steps if not s[0]._stop_reason]
+                if not steps:
+                    break
+
+        benchmark = benchmark_series(data, data.index.rename("date"))
+        return [
+            engine._build_result(None if engine._stop_reason else benchmark)
+            for engine in self.engines
+        ]
@@ -0,0 +1,104 @@
+"""
+回测引擎分阶段性能统计
+
+开启 BacktestEngine(profile=True) 后，引擎把热循环中各阶段的调用替换为计时包装，
+记录每个阶段的累计耗时与调用次数，以及整体吞吐 (bars/秒)。
+未开启时引擎直接调用原方法，不产生额外开销。
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import pandas as pd
+
+
+# 阶段名称（按热循环中的执行顺序）
+PROFILE_STAGES = (
+    "batch_signals",    # 策略批量信号 generate_signals()
+    "on_bar",           # 策略接收 bar
+    "risk_check",       # 风控检查
+    "generate_signal",  # 策略生成信号
+    "execute_buy",      # 买入执行
+    "execute_sell",     # 卖出执行
+    "record",           # 记录每日状态
+    "build_result",     # 构建回测结果
+)
+
+
+@dataclass
+class StageStats:
+    """单个阶段的统计"""
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class EngineProfile:
+    """回测引擎分阶段性能统计"""
+    stages: dict[str, StageStats] = field(
+        default_factory=lambda: {name: StageStats() for name in PROFILE_STAGES}
+    )
+    bars: int = 0
+    total_seconds: float = 0.0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def timed(self, stage: str, func: Callable) -> Callable:
+        """返回记录 stage 耗时与调用次数的包装函数"""
+        stats = self.stages[stage]
+        perf_counter = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.seconds += perf_counter() - start
+                stats.calls += 1
+
+        return wrapper
+
+    def finish(self) -> None:
+        """结束计时，汇总总耗时与 bar 数"""
+        self.total_seconds = time.perf_counter() - self._started
+        self.bars = self.stages["record"].calls
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.total_seconds if self.total_seconds > 0 else 0.0
+
+    def to_frame(self) -> pd.DataFrame:
+        """各阶段统计表：调用次数、累计耗时、单次平均耗时、耗时占比"""
+        rows = []
+        for name, stats in self.stages.items():
+            rows.append({
+                "stage": name,
+                "calls": stats.calls,
+                "seconds": stats.seconds,
+                "avg_us": stats.seconds / stats.calls * 1e6 if stats.calls else 0.0,
+                "pct": stats.seconds / self.total_seconds if self.total_seconds > 0 else 0.0,
+            })
+        # 未归入任何阶段的时间（循环本身、bar 构造等）
+        other = self.total_seconds - sum(s.seconds for s in self.stages.values())
+        rows.append({
+            "stage": "other",
+            "calls": 0,
+            "seconds": other,
+            "avg_us": 0.0,
+            "pct": other / self.total_seconds if self.total_seconds > 0 else 0.0,
+        })
+        return pd.DataFrame(rows)
+
+    def format(self) -> str:
+        """格式化为文本表格"""
+        lines = [
+            f"总耗时: {self.total_seconds:.4f}s  |  bars: {self.bars}  |  "
+            f"吞吐: {self.bars_per_second:,.0f} bars/s",
+            f"{'阶段':<16}{'调用次数':>10}{'累计耗时(ms)':>14}{'平均(us)':>10}{'占比':>8}",
+        ]
+        for row in self.to_frame().itertuples(index=False):
+            lines.append(
+                f"{row.stage:<16}{row.calls:>10}{row.seconds * 1e3:>14.2f}"
+                f"{row.avg_us:>10.2f}{row.pct:>8.1%}"
+            )
+        return "\n".join(lines)
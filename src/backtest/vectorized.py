@@ -0,0 +1,402 @@
+"""
+向量化回测引擎 - 输入预计算信号数组，用 NumPy 批量推导持仓、成交与净值
+
+与事件驱动引擎的执行语义保持一致：
+  - BUY 仅在空仓时执行，SELL 仅在持仓时执行
+  - 持仓期间每根 bar 先做止损/止盈检查，再处理当根信号
+  - 成交价含滑点，买卖双边收取手续费
+
+逐 bar 的 Python 调用被替换为数组运算，循环只发生在"每笔交易"层面，
+适合研究扫参等需要大量回测的场景。
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.early_stop import EarlyStop
+from src.backtest.engine import BacktestResult, Trade, TradeLog
+from src.risk.risk_manager import RiskManager
+from src.risk.position_sizer import PositionSizer
+from src.strategy.base import Signal, SIGNAL_CODES, signal_codes
+
+
+def to_signal_codes(signals, length: int) -> np.ndarray:
+    """
+    将信号序列统一转换为 int8 编码数组（1=BUY, 0=HOLD, -1=SELL）
+
+    Args:
+        signals: Signal 枚举序列或数值编码序列（list / ndarray / Series）
+        length: 期望长度（与行情数据行数一致）
+
+    Returns:
+        int8 编码数组
+
+    Raises:
+        ValueError: 长度与行情数据不一致
+    """
+    values = signals.to_numpy() if isinstance(signals, pd.Series) else np.asarray(signals)
+    if len(values) != length:
+        raise ValueError(f"信号长度 {len(values)} 与行情数据长度 {length} 不一致")
+
+    if values.dtype == object:
+        if all(isinstance(s, Signal) for s in values):
+            return signal_codes(values)
+        return np.array(
+            [SIGNAL_CODES[s] if isinstance(s, Signal) else int(s) for s in values],
+            dtype=np.int8,
+        )
+    return values.astype(np.int8)
+
+
+class VectorizedBacktestEngine:
+    """
+    向量化回测引擎
+
+    核心流程：信号数组 → 逐笔交易定位入场/离场 bar → 分段填充现金与持仓 → 净值 = 现金 + 持仓 × 收盘价
+    """
+
+    def __init__(
+        self,
+        risk_manager: RiskManager | None = None,
+        position_sizer: PositionSizer | None = None,
+        initial_capital: float = 100_000.0,
+        slippage: float = 0.0001,       # 0.01%
+        commission_rate: float = 0.0003, # 0.03%
+    ):
+        self.risk_manager = risk_manager or RiskManager()
+        self.position_sizer = position_sizer or PositionSizer()
+        self.initial_capital = initial_capital
+        self.slippage = slippage
+        self.commission_rate = commission_rate
+
+    def run(self, data: pd.DataFrame, signals, strategy_name: str = "") -> BacktestResult:
+        """
+        运行向量化回测
+
+        Args:
+            data: 包含 close 列的 DataFrame，index 为日期
+            signals: 与 data 等长的信号序列（Signal 枚举或 1/0/-1 编码）
+            strategy_name: 写入结果的策略名称
+
+        Returns:
+            BacktestResult，与事件驱动引擎的结果结构一致
+        """
+        n = len(data)
+        if n == 0:
+            return BacktestResult(initial_capital=self.initial_capital, strategy_name=strategy_name)
+
+        codes = to_signal_codes(signals, n)
+        close = data["close"].to_numpy(dtype=np.float64)
+        dates = data.index
+
+        buy_idx = np.flatnonzero(codes == SIGNAL_CODES[Signal.BUY])
+        sell_idx = np.flatnonzero(codes == SIGNAL_CODES[Signal.SELL])
+        if self.risk_manager.max_position <= 0:
+            buy_idx = buy_idx[:0]  # 风控拒绝所有买入
+
+        cash = self.initial_capital
+        # 现金/持仓变化点：bar 下标 -> (现金, 持仓)，同一 bar 以最后一次成交为准
+        changes: dict[int, tuple[float, int]] = {0: (cash, 0)}
+        trades = TradeLog()
+
+        start = 0
+        while True:
+            # 1. 定位下一根可入场的 BUY 信号
+            pos = np.searchsorted(buy_idx, start)
+            if pos >= len(buy_idx):
+                break
+            entry = int(buy_idx[pos])
+
+            fill = self._fill_buy(cash, float(close[entry]))
+            if fill is None:
+                start = entry + 1
+                continue
+            quantity, entry_price, entry_cost = fill
+            cash -= entry_cost
+            changes[entry] = (cash, quantity)
+
+            # 2. 定位离场 bar：止损/止盈（先于信号检查）或下一根 SELL 信号
+            exit_bar, reason = self._find_exit(close, sell_idx, entry, entry_price)
+            if exit_bar is None:
+                break
+
+            exit_date = str(dates[exit_bar])
+            trade, proceeds = self._fill_sell(
+                quantity, entry_price, float(close[exit_bar]), str(dates[entry]), exit_date, reason
+            )
+            trades.append(trade)
+            cash += proceeds
+            changes[exit_bar] = (cash, 0)
+
+            # 止损/止盈离场当根仍可能因 BUY 信号再次入场
+            start = exit_bar
+
+        # 3. 分段填充现金与持仓，批量计算净值
+        points = np.fromiter(changes.keys(), dtype=np.int64, count=len(changes))
+        order = np.argsort(points, kind="stable")
+        points = points[order]
+        states = list(changes.values())
+        cash_values = np.array([states[k][0] for k in order], dtype=np.float64)
+        pos_values = np.array([states[k][1] for k in order], dtype=np.int64)
+        lengths = np.diff(np.append(points, n))
+
+        cash_arr = np.repeat(cash_values, lengths)
+        pos_arr = np.repeat(pos_values, lengths)
+        equity = cash_arr + pos_arr * close
+
+        return self._build_result(data, equity, trades, strategy_name)
+
+    def run_grid(
+        self,
+        data: pd.DataFrame,
+        signal_matrix: np.ndarray,
+        early_stop: EarlyStop | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        对一组信号（参数组合 × 时间）同时回测
+
+        按时间推进、在参数维度上做数组运算，每根 bar 的执行逻辑与事件驱动引擎一致。
+        仓位按 总权益 × risk_fraction 计算（引擎未提供 ATR/胜率时各仓位方法均退化为此）。
+
+        Args:
+            data: 包含 close 列的 DataFrame，index 为日期
+            signal_matrix: int8 编码矩阵，形状 (组合数, len(data))
+            early_stop: 提前终止条件；触发的组合停止交易，所有组合均触发时提前结束
+
+        Returns:
+            (净值矩阵 (组合数, len(data)), 各组合交易次数, 各组合终止 bar 下标（未终止为 -1）)
+            已终止组合在终止 bar 之后的净值列无意义
+        """
+        codes = np.asarray(signal_matrix, dtype=np.int8)
+        n_combos, n = codes.shape
+        close = data["close"].to_numpy(dtype=np.float64).tolist()
+
+        rm = self.risk_manager
+        buy_code = SIGNAL_CODES[Signal.BUY]
+        sell_code = SIGNAL_CODES[Signal.SELL]
+        can_buy = rm.max_position > 0
+
+        cash = np.full(n_combos, float(self.initial_capital))
+        position = np.zeros(n_combos, dtype=np.int64)
+        entry_price = np.zeros(n_combos)
+        trade_count = np.zeros(n_combos, dtype=np.int64)
+        equity = np.empty((n_combos, n))
+        stop_bar = np.full(n_combos, -1, dtype=np.int64)
+        alive = np.ones(n_combos, dtype=bool)   # 未终止的组合
+        peak = np.full(n_combos, -np.inf)
+
+        for t in range(n):
+            price = close[t]
+            column = codes[:, t]
+            holding = np.flatnonzero((position > 0) & alive)
+
+            # 1. 持仓止损/止盈检查
+            if len(holding) > 0 and price:
+                entry = entry_price[holding]
+                pnl_pct = (price - entry) / entry
+                hit = holding[(pnl_pct <= rm.stop_loss) | (pnl_pct >= rm.take_profit)]
+                if len(hit) > 0:
+                    self._sell_grid(hit, price, cash, position, entry_price, trade_count)
+                    holding = np.flatnonzero((position > 0) & alive)
+
+            # 2. 策略卖出信号（仅持仓组合）
+            if len(holding) > 0:
+                exits = holding[column[holding] == sell_code]
+                if len(exits) > 0:
+                    self._sell_grid(exits, price, cash, position, entry_price, trade_count)
+
+            # 3. 策略买入信号（仅空仓组合）
+            if can_buy:
+                entries = np.flatnonzero((column == buy_code) & (position == 0) & alive)
+                if len(entries) > 0:
+                    self._buy_grid(entries, price, cash, position, entry_price)
+
+            equity[:, t] = cash + position * price
+
+            # 4. 提前终止检查
+            if early_stop is not None:
+                peak = np.maximum(peak, equity[:, t])
+                hit = alive & early_stop.triggered(t, equity[:, t], peak, self.initial_capital)
+                if hit.any():
+                    stop_bar[hit] = t
+                    alive &= ~hit
+                    if not alive.any():
+                        equity[:, t + 1 :] = equity[:, t : t + 1]
+                        break
+
+        return equity, trade_count, stop_bar
+
+    def _buy_grid(
+        self,
+        idx: np.ndarray,
+        price: float,
+        cash: np.ndarray,
+        position: np.ndarray,
+        entry_price: np.ndarray,
+    ) -> None:
+        """对选中组合执行买入（与 _fill_buy 的计算逐项一致）"""
+        actual_price = price * (1 + self.slippage)
+        available = cash[idx]
+        if actual_price <= 0:
+            return
+
+        position_value = np.minimum(available * self.position_sizer.risk_fraction, available)
+        quantity = np.trunc(position_value / actual_price).astype(np.int64)
+        quantity[available <= 0] = 0
+
+        trade_value = quantity * actual_price
+        total_cost = trade_value + trade_value * self.commission_rate
+        short = total_cost > available
+        if short.any():
+            # 资金不足，调减数量
+            quantity[short] = np.trunc(
+                (available[short] / (1 + self.commission_rate)) / actual_price
+            ).astype(np.int64)
+            trade_value = quantity * actual_price
+            total_cost = trade_value + trade_value * self.commission_rate
+
+        filled = quantity > 0
+        idx = idx[filled]
+        cash[idx] -= total_cost[filled]
+        position[idx] = quantity[filled]
+        entry_price[idx] = actual_price
+
+    def _sell_grid(
+        self,
+        idx: np.ndarray,
+        price: float,
+        cash: np.ndarray,
+        position: np.ndarray,
+        entry_price: np.ndarray,
+        trade_count: np.ndarray,
+    ) -> None:
+        """对选中组合执行全部卖出（与 _fill_sell 的计算逐项一致）"""
+        actual_price = price * (1 - self.slippage)
+        trade_value = position[idx] * actual_price
+        commission = trade_value * self.commission_rate
+        cash[idx] += trade_value - commission
+        position[idx] = 0
+        entry_price[idx] = 0.0
+        trade_count[idx] += 1
+
+    def _find_exit(
+        self,
+        close: np.ndarray,
+        sell_idx: np.ndarray,
+        entry: int,
+        entry_price: float,
+    ) -> tuple[int | None, str]:
+        """在入场之后查找首个离场 bar，返回 (下标, 原因)，持有到结束返回 (None, "")"""
+        n = len(close)
+        pos = np.searchsorted(sell_idx, entry + 1)
+        signal_bar = int(sell_idx[pos]) if pos < len(sell_idx) else None
+
+        # 止损/止盈只需在 (entry, signal_bar] 区间内搜索
+        stop = n if signal_bar is None else signal_bar + 1
+        window = close[entry + 1 : stop]
+        pnl_pct = (window - entry_price) / entry_price
+        hit = (
+            (pnl_pct <= self.risk_manager.stop_loss)
+            | (pnl_pct >= self.risk_manager.take_profit)
+        ) & (window != 0)
+        hits = np.flatnonzero(hit)
+
+        if len(hits) > 0:
+            exit_bar = entry + 1 + int(hits[0])
+            # 由风控管理器生成与事件驱动引擎一致的原因描述
+            risk_result = self.risk_manager.check(
+                signal=Signal.HOLD,
+                current_position=1,
+                entry_price=entry_price,
+                current_price=float(close[exit_bar]),
+            )
+            return exit_bar, risk_result.reason
+
+        if signal_bar is not None:
+            return signal_bar, "策略卖出信号"
+        return None, ""
+
+    def _fill_buy(self, cash: float, price: float) -> tuple[int, float, float] | None:
+        """计算买入成交，返回 (数量, 成交价, 总成本)，无法成交返回 None"""
+        actual_price = price * (1 + self.slippage)
+
+        quantity = self.position_sizer.calculate(
+            total_equity=cash,
+            available_cash=cash,
+            price=actual_price,
+        )
+        if quantity <= 0:
+            return None
+
+        trade_value = quantity * actual_price
+        commission = trade_value * self.commission_rate
+        total_cost = trade_value + commission
+        if total_cost > cash:
+            # 资金不足，调减数量
+            quantity = int((cash / (1 + self.commission_rate)) / actual_price)
+            if quantity <= 0:
+                return None
+            trade_value = quantity * actual_price
+            commission = trade_value * self.commission_rate
+            total_cost = trade_value + commission
+
+        return quantity, actual_price, total_cost
+
+    def _fill_sell(
+        self,
+        quantity: int,
+        entry_price: float,
+        price: float,
+        date_open: str,
+        date_close: str,
+        reason: str,
+    ) -> tuple[Trade, float]:
+        """计算卖出成交，返回 (交易记录, 回笼资金)"""
+        actual_price = price * (1 - self.slippage)
+
+        trade_value = quantity * actual_price
+        commission = trade_value * self.commission_rate
+
+        pnl = (actual_price - entry_price) * quantity - commission
+        entry_commission = quantity * entry_price * self.commission_rate
+        pnl -= entry_commission
+        pnl_pct = (actual_price - entry_price) / entry_price if entry_price > 0 else 0
+
+        trade = Trade(
+            date_open=date_open,
+            date_close=date_close,
+            side="LONG",
+            quantity=quantity,
+            entry_price=entry_price,
+            exit_price=actual_price,
+            pnl=pnl,
+            pnl_pct=pnl_pct,
+            commission=commission + entry_commission,
+            reason=reason,
+        )
+        return trade, trade_value - commission
+
+    def _build_result(
+        self,
+        data: pd.DataFrame,
+        equity: np.ndarray,
+        trades: TradeLog,
+        strategy_name: str,
+    ) -> BacktestResult:
+        """构建回测结果"""
+        equity_curve = pd.Series(equity, index=data.index.rename("date"), name="equity")
+        daily_returns = equity_curve.pct_change().fillna(0)
+
+        benchmark_curve = data["close"].reindex(equity_curve.index)
+        benchmark_returns = benchmark_curve.pct_change().fillna(0)
+
+        return BacktestResult(
+            equity_curve=equity_curve,
+            daily_returns=daily_returns,
+            benchmark_returns=benchmark_returns,
+            benchmark_curve=benchmark_curve,
+            trades=trades,
+            final_equity=equity_curve.iloc[-1],
+            initial_capital=self.initial_capital,
+            strategy_name=strategy_name,
+        )
@@ -0,0 +1,112 @@
+"""
+基准测试 - 回测引擎每日状态记录方式对比
+
+对比预分配 NumPy 结构化数组与原先"逐 bar 追加字典 + DataFrame 转换"两种实现的
+耗时与内存峰值。使用合成行情，无需本地数据。
+
+用法:
+    python -m src.benchmarks.equity_history
+    python -m src.benchmarks.equity_history --bars 5000 50000 --repeat 5
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import BacktestEngine
+from src.strategy.ma_cross import MACrossStrategy
+
+
+class DictHistoryEngine(BacktestEngine):
+    """原实现：逐 bar 追加 5 键字典，结束时整体转换为 DataFrame"""
+
+    def _reset(self, data: pd.DataFrame) -> None:
+        super()._reset(data)
+        self._dict_history: list[dict] = []
+
+    def _record(self, date, equity: float, price: float) -> None:
+        self._dict_history.append(
+            {
+                "date": date,
+                "equity": equity,
+                "cash": self._cash,
+                "position": self._position,
+                "price": price,
+            }
+        )
+        self._bar_count += 1
+
+    def _equity_curve(self) -> pd.Series:
+        df = pd.DataFrame(self._dict_history)
+        df.set_index("date", inplace=True)
+        return df["equity"]
+
+
+def make_bars(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """生成随机游走的合成分钟行情（分钟频率保证长序列不超出时间戳范围）"""
+    rng = np.random.default_rng(seed)
+    close = 3.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n_bars)))
+    spread = np.abs(rng.normal(0.0, 0.005, n_bars)) * close
+    index = pd.date_range("2000-01-03", periods=n_bars, freq="min", name="date")
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000_000, 10_000_000, n_bars).astype(float),
+        },
+        index=index,
+    )
+
+
+def measure(engine_cls: type[BacktestEngine], data: pd.DataFrame, repeat: int) -> tuple[float, float]:
+    """
+    测量单次回测耗时与内存峰值
+
+    Returns:
+        (最佳耗时 秒, tracemalloc 内存峰值 MB)
+    """
+    engine = engine_cls(MACrossStrategy(short_window=5, long_window=20))
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.run(data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    engine.run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回测引擎状态记录基准测试")
+    parser.add_argument(
+        "--bars", type=int, nargs="+", default=[2_000, 20_000, 200_000], help="合成行情长度"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数 (取最佳)")
+    args = parser.parse_args()
+
+    print(f"{'bars':>10} {'实现':<10} {'耗时(s)':>10} {'内存峰值(MB)':>14}")
+    for n_bars in args.bars:
+        data = make_bars(n_bars)
+        rows = [
+            ("dict", *measure(DictHistoryEngine, data, args.repeat)),
+            ("numpy", *measure(BacktestEngine, data, args.repeat)),
+        ]
+        for impl, seconds, peak_mb in rows:
+            print(f"{n_bars:>10} {impl:<10} {seconds:>10.4f} {peak_mb:>14.2f}")
+        # 两种实现的净值曲线必须一致
+        a = DictHistoryEngine(MACrossStrategy(5, 20)).run(data).equity_curve
+        b = BacktestEngine(MACrossStrategy(5, 20)).run(data).equity_curve
+        assert np.array_equal(a.to_numpy(), b.to_numpy()), "净值曲线不一致"
+
+
+if __name__ == "__main__":
+    main()
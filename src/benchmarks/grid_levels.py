@@ -0,0 +1,102 @@
+"""
+基准测试 - 网格策略层级定位方式对比
+
+对比三种实现在不同网格数下逐段行情生成信号的耗时：
+  - linear: 原实现，线性扫描网格线定位层级
+  - bisect: 二分查找定位层级
+  - batch:  generate_signals() 一次 searchsorted 求出全部层级
+使用合成行情，网格区间取行情的最高/最低价，使每根 bar 都需要定位层级。
+
+用法:
+    python -m src.benchmarks.grid_levels
+    python -m src.benchmarks.grid_levels --grids 10 100 500 --bars 20000 --repeat 5
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.benchmarks.equity_history import make_bars
+from src.strategy.base import Signal
+from src.strategy.grid import GridStrategy
+
+
+class LinearGridStrategy(GridStrategy):
+    """原实现：线性扫描网格线定位层级"""
+
+    def _get_grid_level(self, price: float) -> int:
+        for i in range(len(self._grid_lines) - 1):
+            if price < self._grid_lines[i + 1]:
+                return i
+        return len(self._grid_lines) - 1
+
+
+def stream_signals(strategy: GridStrategy, data: pd.DataFrame) -> list[Signal]:
+    """逐 bar 生成信号（每个信号都视为成交）"""
+    strategy.reset()
+    signals = []
+    for bar in data[["open", "high", "low", "close", "volume"]].to_dict("records"):
+        strategy.on_bar(bar)
+        signal = strategy.generate_signal()
+        if signal != Signal.HOLD:
+            strategy.on_fill(signal)
+        signals.append(signal)
+    return signals
+
+
+def batch_signals(strategy: GridStrategy, data: pd.DataFrame) -> list[Signal]:
+    """批量信号按"空仓才买入、持仓才卖出"折算为实际执行的信号"""
+    in_position = False
+    signals = []
+    for signal in strategy.generate_signals(data).tolist():
+        if signal == Signal.BUY and not in_position:
+            in_position = True
+        elif signal == Signal.SELL and in_position:
+            in_position = False
+        else:
+            signal = Signal.HOLD
+        signals.append(signal)
+    return signals
+
+
+def measure(func, strategy: GridStrategy, data: pd.DataFrame, repeat: int) -> tuple[float, list]:
+    """返回 (最佳耗时 秒, 信号列表)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        signals = func(strategy, data)
+        best = min(best, time.perf_counter() - start)
+    return best, signals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网格层级定位基准测试")
+    parser.add_argument(
+        "--grids", type=int, nargs="+", default=[10, 50, 100, 200, 500], help="网格数"
+    )
+    parser.add_argument("--bars", type=int, default=20_000, help="合成行情长度")
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数 (取最佳)")
+    args = parser.parse_args()
+
+    data = make_bars(args.bars)
+    price_range = {"upper_price": data["close"].max(), "lower_price": data["close"].min()}
+    print(f"{'grid_num':>8} {'linear(s)':>10} {'bisect(s)':>10} {'batch(s)':>10} {'信号数':>8}")
+    for grid_num in args.grids:
+        linear, expected = measure(
+            stream_signals, LinearGridStrategy(grid_num, **price_range), data, args.repeat
+        )
+        bisect, streamed = measure(
+            stream_signals, GridStrategy(grid_num, **price_range), data, args.repeat
+        )
+        batch, batched = measure(
+            batch_signals, GridStrategy(grid_num, **price_range), data, args.repeat
+        )
+        # 三种实现的信号必须一致
+        assert streamed == expected and batched == expected, "信号不一致"
+        n_signals = sum(s != Signal.HOLD for s in expected)
+        print(f"{grid_num:>8} {linear:>10.4f} {bisect:>10.4f} {batch:>10.4f} {n_signals:>8}")
+
+
+if __name__ == "__main__":
+    main()
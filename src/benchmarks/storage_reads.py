@@ -0,0 +1,150 @@
+"""
+基准测试 - DataStorage.load_bars 的谓词与列下推
+
+对比原先"读取整个文件再按日期过滤"与按行组统计跳过 + 列投影两种读取方式，
+在全量、单列、近期窗口等读取场景下的耗时与实际读取字节数，并给出行情缓存命中与
+内存映射 Arrow IPC 镜像（use_mmap=True，镜像已生成）的加载耗时（均以 readonly=True 取零拷贝视图）。
+使用合成行情（列与本地 Parquet 一致）与临时目录，无需本地数据。
+读取字节数取自 /proc/self/io 的 rchar（仅 Linux，其余平台显示 -）。
+
+用法:
+    python -m src.benchmarks.storage_reads
+    python -m src.benchmarks.storage_reads --bars 3000 6000 --row-group 63 250 --repeat 20
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.data import storage as storage_module
+from src.data.storage import DataStorage
+
+
+# 场景：(名称, 近期自然日数 None 为全部, 读取的列 None 为全部)
+SCENARIOS = [
+    ("全量", None, None),
+    ("仅 close", None, ["close"]),
+    ("近 1 年", 365, None),
+    ("近 3 个月", 90, None),
+    ("近 1 个月", 30, None),
+    ("近 1 周", 7, None),
+    ("近 1 个月 close", 30, ["close"]),
+]
+
+
+class FullReadStorage(DataStorage):
+    """原实现：整个文件写为一个行组，读取全部行与列后再按日期过滤"""
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, path: str) -> None:
+        df.to_parquet(path)
+
+    def load_bars(self, symbol, start_date=None, end_date=None, columns=None, readonly=False):
+        df = pd.read_parquet(self._parquet_path(symbol))
+        if start_date:
+            df = df[df.index >= pd.Timestamp(start_date)]
+        if end_date:
+            df = df[df.index <= pd.Timestamp(end_date)]
+        return df if columns is None else df[columns]
+
+
+def make_bars(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """生成随机游走的合成日线（与 DataFetcher 输出的列一致）"""
+    rng = np.random.default_rng(seed)
+    close = 3.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.015, n_bars)))
+    open_ = close * (1 + rng.normal(0, 0.003, n_bars))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n_bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n_bars))
+    volume = rng.lognormal(16, 0.5, n_bars).round()
+    change = np.diff(close, prepend=close[0])
+    index = pd.bdate_range(end="2026-09-30", periods=n_bars, name="date")
+    return pd.DataFrame(
+        {
+            "open": open_, "close": close, "high": high, "low": low, "volume": volume,
+            "成交额": volume * close, "振幅": (high - low) / close * 100,
+            "涨跌幅": change / close * 100, "涨跌额": change, "换手率": rng.uniform(0.1, 5, n_bars),
+        },
+        index=index,
+    )
+
+
+def read_bytes() -> int | None:
+    """当前进程累计读取的字节数（/proc/self/io 的 rchar）"""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def measure(storage: DataStorage, start_date: str | None, columns: list[str] | None, repeat: int):
+    """返回 (最佳耗时 毫秒, 单次读取字节数, 行数)"""
+    best = float("inf")
+    n_bytes = None
+    for _ in range(repeat):
+        before = read_bytes()
+        start = time.perf_counter()
+        df = storage.load_bars("bench", start_date, None, columns, readonly=True)
+        best = min(best, time.perf_counter() - start)
+        after = read_bytes()
+        if before is not None and after is not None:
+            n_bytes = after - before
+    return best * 1000, n_bytes, len(df)
+
+
+def format_bytes(n: int | None) -> str:
+    return "-" if n is None else f"{n / 1024:.1f}K"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load_bars 谓词与列下推基准测试")
+    parser.add_argument("--bars", type=int, nargs="+", default=[3000, 6000], help="行情长度")
+    parser.add_argument(
+        "--row-group", type=int, nargs="+", default=[storage_module.ROW_GROUP_ROWS], help="行组行数"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="计时重复次数 (取最佳)")
+    args = parser.parse_args()
+
+    print(
+        f"{'行数':>6} {'行组':>5} {'场景':<14} {'原耗时(ms)':>10} {'原读取':>9} "
+        f"{'下推耗时(ms)':>12} {'下推读取':>9} {'加速':>6} {'缓存命中(ms)':>12} {'内存映射(ms)':>12}"
+    )
+    for n_bars in args.bars:
+        df = make_bars(n_bars)
+        last = df.index[-1]
+        for row_group in args.row_group:
+            storage_module.ROW_GROUP_ROWS = row_group
+            with tempfile.TemporaryDirectory() as full_dir, tempfile.TemporaryDirectory() as pushdown_dir:
+                full, pushdown = FullReadStorage(full_dir), DataStorage(pushdown_dir, use_cache=False)
+                cached = DataStorage(pushdown_dir)
+                mapped = DataStorage(pushdown_dir, use_mmap=True)
+                full.save_bars("bench", df)
+                pushdown.save_bars("bench", df)
+                cached.load_bars("bench")
+                mapped.load_bars("bench")
+                for name, days, columns in SCENARIOS:
+                    start_date = None if days is None else (last - timedelta(days=days)).strftime("%Y%m%d")
+                    t_full, b_full, rows_full = measure(full, start_date, columns, args.repeat)
+                    t_push, b_push, rows_push = measure(pushdown, start_date, columns, args.repeat)
+                    t_cached, _, rows_cached = measure(cached, start_date, columns, args.repeat)
+                    t_mapped, _, rows_mapped = measure(mapped, start_date, columns, args.repeat)
+                    assert rows_full == rows_push == rows_cached == rows_mapped
+                    print(
+                        f"{n_bars:>6} {row_group:>5} {name:<14} {t_full:>10.2f} {format_bytes(b_full):>9} "
+                        f"{t_push:>12.2f} {format_bytes(b_push):>9} {t_full / t_push:>5.1f}x {t_cached:>12.3f} {t_mapped:>12.3f}"
+                    )
+                full.close()
+                pushdown.close()
+                cached.close()
+                mapped.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -77,9 +77,19 @@ def create_strategy(strategy_cfg: dict) -> Strategy:
     name = strategy_cfg["name"]
     params = strategy_cfg.get("params", {}) or {}
 
+    strategy_class = get_strategy_class(name)
+    return strategy_class(**params)
+
+
+def get_strategy_class(name: str) -> type[Strategy]:
+    """
+    根据名称查找策略类
+
+    Raises:
+        ValueError: 未知的策略名称
+    """
     if name not in STRATEGY_REGISTRY:
         available = ", ".join(STRATEGY_REGISTRY.keys())
         raise ValueError(f"未知策略: '{name}'。可用策略: {available}")
 
-    strategy_class = STRATEGY_REGISTRY[name]
-    return strategy_class(**params)
+    return STRATEGY_REGISTRY[name]
@@ -1,7 +1,12 @@
 from src.data.loader import DataLoader
 from src.data.storage import DataStorage
+from src.data.bar_cache import BarCache, BarCacheStats, get_bar_cache
+from src.data.panel import PanelStore
 from src.data.cleaner import DataCleaner
 from src.data.fetcher import DataFetcher
 from src.data.etf_catalog import ETFCatalog
 
-__all__ = ["DataLoader", "DataStorage", "DataCleaner", "DataFetcher", "ETFCatalog"]
+__all__ = [
+    "DataLoader", "DataStorage", "BarCache", "BarCacheStats", "get_bar_cache", "PanelStore",
+    "DataCleaner", "DataFetcher", "ETFCatalog",
+]
@@ -0,0 +1,147 @@
+"""
+行情缓存 - 进程内共享的已解码行情 LRU
+
+同一进程内的多次回测、批量任务与 Streamlit 页面会反复加载同一品种的行情。
+BarCache 缓存 DataStorage 合并解码后的完整行情（全部日期与列），再次加载时只需一次字典查找加切片：
+  - 键为 (行情目录, 品种)，条目记录主文件与增量文件的 (inode, mtime, 大小)，
+    文件被其他进程改写后版本不符，视为未命中并重新读取
+  - 本进程内 save_bars / compact 写入后主动失效对应条目
+  - 按占用字节数做 LRU 淘汰
+缓存的行情各列为只读数组，调用方不得原地修改（整列赋值不受影响）。
+
+用法:
+    from src.data.bar_cache import get_bar_cache
+    print(get_bar_cache().stats().format())
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+import pandas as pd
+
+
+# 进程内共享缓存的默认容量
+BAR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 文件版本：[(路径, inode, mtime_ns, 大小), ...]
+FileVersion = tuple[tuple[str, int, int, int], ...]
+
+
+@dataclass
+class BarCacheStats:
+    """行情缓存命中与淘汰统计"""
+    hits: int = 0            # 命中
+    misses: int = 0          # 未命中（含文件版本变化）
+    invalidations: int = 0   # 写入后主动失效或版本变化而丢弃的条目数
+    evictions: int = 0       # 容量淘汰次数
+    entries: int = 0         # 当前条目数
+    bytes: int = 0           # 当前内存占用字节数
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def format(self) -> str:
+        return (
+            f"行情缓存: 请求 {self.requests}, 命中率 {self.hit_rate:.1%} "
+            f"(命中 {self.hits} / 未命中 {self.misses}), 失效 {self.invalidations}, "
+            f"淘汰 {self.evictions}, 占用 {self.entries} 项 / {self.bytes / 1024 / 1024:.1f} MB"
+        )
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """按列重建为只读数组，切片得到的视图同样只读，防止调用方改写缓存内容"""
+    columns = {}
+    for column in df.columns:
+        array = df[column].to_numpy()
+        array.flags.writeable = False
+        columns[column] = array
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class BarCache:
+    """
+    已解码行情的内存 LRU（线程安全，Streamlit 的多个会话线程共用）
+
+    一般通过 get_bar_cache() 取得进程内共享的实例，DataStorage 默认使用它。
+    """
+
+    def __init__(self, max_bytes: int = BAR_CACHE_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes 应 > 0，当前为 {max_bytes}")
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[FileVersion, pd.DataFrame, int]] = OrderedDict()
+        self._stats = BarCacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, directory: str, symbol: str, version: FileVersion) -> pd.DataFrame | None:
+        """取出与文件版本一致的缓存行情，不存在或版本不符时返回 None"""
+        key = (directory, symbol)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+                self._stats.invalidations += 1
+            self._stats.misses += 1
+            return None
+
+    def put(self, directory: str, symbol: str, version: FileVersion, df: pd.DataFrame) -> pd.DataFrame:
+        """缓存行情，返回只读化后的 DataFrame（单项超过容量上限时不缓存，原样返回）"""
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_bytes:
+            return df
+        df = _freeze(df)
+        key = (directory, symbol)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, df, size)
+            self._stats.entries += 1
+            self._stats.bytes += size
+            while self._stats.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+        return df
+
+    def invalidate(self, directory: str, symbol: str) -> None:
+        """丢弃某品种的缓存（写入行情后调用）"""
+        with self._lock:
+            if (directory, symbol) in self._entries:
+                self._remove((directory, symbol))
+                self._stats.invalidations += 1
+
+    def stats(self) -> BarCacheStats:
+        """当前统计快照"""
+        with self._lock:
+            return replace(self._stats)
+
+    def clear(self) -> None:
+        """清空缓存（统计清零）"""
+        with self._lock:
+            self._entries.clear()
+            self._stats = BarCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        _, _, size = self._entries.pop(key)
+        self._stats.entries -= 1
+        self._stats.bytes -= size
+
+
+_shared_cache = BarCache()
+
+
+def get_bar_cache() -> BarCache:
+    """进程内共享的行情缓存"""
+    return _shared_cache
@@ -21,12 +21,17 @@ class DataLoader:
     数据不足时自动通过 DataFetcher 增量下载并经 DataCleaner 清洗后入库。
     """
 
-    def __init__(self, storage_dir: str = "data"):
-        self._storage = DataStorage(storage_dir=storage_dir)
+    def __init__(self, storage_dir: str = "data", use_mmap: bool = False):
+        """
+        Args:
+            storage_dir: 数据存储目录
+            use_mmap: 经内存映射的 Arrow IPC 镜像加载（见 DataStorage），多进程并行读取同一品种时共用页缓存
+        """
+        self._storage = DataStorage(storage_dir=storage_dir, use_mmap=use_mmap)
         self._fetcher = DataFetcher()
         self._cleaner = DataCleaner()
 
-    def load(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    def load(self, symbol: str, start_date: str, end_date: str, readonly: bool = False) -> pd.DataFrame:
         """
         加载历史数据
 
@@ -36,19 +41,20 @@ class DataLoader:
             symbol: 标的代码，如 '510300'
             start_date: 起始日期，格式 'YYYYMMDD'
             end_date: 结束日期，格式 'YYYYMMDD'
+            readonly: 返回不复制数据的只读视图（见 DataStorage.load_bars），适合只读取行情的回测
 
         Returns:
             标准化 DataFrame，含 date(index), open, high, low, close, volume
         """
         # 1. 尝试从 Storage 加载
-        df = self._storage.load_bars(symbol, start_date, end_date)
+        df = self._storage.load_bars(symbol, start_date, end_date, readonly=readonly)
 
         # 2. 检查是否需要增量下载
         if self._needs_update(symbol, start_date, end_date):
             try:
                 self._do_incremental_update(symbol, end_date)
                 # 重新加载（现在应该有完整数据了）
-                df = self._storage.load_bars(symbol, start_date, end_date)
+                df = self._storage.load_bars(symbol, start_date, end_date, readonly=readonly)
             except Exception as e:
                 print(f"[DataLoader] 增量下载失败: {e}")
                 if df.empty:
@@ -112,9 +118,9 @@ class DataLoader:
 
     @staticmethod
     def _ensure_types(df: pd.DataFrame) -> pd.DataFrame:
-        """确保所有 OHLCV 列为 float64 类型"""
+        """确保所有 OHLCV 列为 float64 类型（已是 float64 的列保持原数组，不复制）"""
         numeric_cols = ["open", "high", "low", "close", "volume"]
         for col in numeric_cols:
-            if col in df.columns:
+            if col in df.columns and df[col].dtype != "float64":
                 df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
         return df
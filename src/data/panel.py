@@ -0,0 +1,412 @@
+"""
+行情面板 - 全部品种收盘价（及成交量）对齐后的 (日期 × 品种) 宽表
+
+截面计算（动量排名、行情看板的归一化对比、轮动研究）需要同时读取大量品种的收盘价，
+逐个品种打开 Parquet 再在 pandas 中对齐，开销随品种数线性增长。
+PanelStore 在 parquet/ 旁维护由行情派生的面板，全品种读取变为一次列式读取：
+    panel/close.parquet                    宽表：index 为统一交易日历（全部品种日期的并集），列为品种代码
+    panel/volume.parquet
+    panel/versions.json                    宽表对应的各品种文件版本
+    panel/delta/delta-<序号>.parquet       增量文件：每次 save_bars 写入的 (date, symbol, close, volume) 长表，
+                                           另记该品种写入前后的文件版本
+增量文件数达到 PANEL_COMPACT_DELTAS 时合并进宽表。读取时宽表按品种（列）与日期（行组）下推，
+再叠加增量文件中的值（同一日期、品种以最后写入的为准）。
+面板不存在时，首次读取由全部品种的行情一次性构建；此前 save_bars 不写面板增量。
+
+面板记录每个品种的文件版本（主文件与增量文件的 inode、mtime、大小，与 BarCache 相同）。
+读取时与当前文件比对，不经 save_bars 改写、替换、新增或删除的品种视为过期，按当前行情重写其列。
+增量文件以硬链接发布，名称已被占用时顺延序号，多个进程 / 线程同时追加互不覆盖；
+构建、合并与重写宽表时持有面板目录下的锁文件。
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from src.data.storage import DataStorage
+
+
+# 面板包含的行情字段
+PANEL_FIELDS = ("close", "volume")
+
+# 增量文件数达到该值时合并进宽表（全量更新约 1000 只品种时约合并 15 次）
+PANEL_COMPACT_DELTAS = 64
+
+DELTA_PREFIX = "delta-"
+
+VERSIONS_FILE = "versions.json"
+
+# 锁文件超过该秒数仍未释放时视为持有者已异常退出
+PANEL_LOCK_TIMEOUT = 600
+
+
+class PanelStore:
+    """
+    (日期 × 品种) 行情面板
+
+    由 DataStorage 持有（DataStorage.panel），save_bars 写入行情后同步追加面板增量；
+    读取时重写文件版本与面板记录不符的品种。
+
+    用法:
+        storage = DataStorage("data")
+        close = storage.load_panel("close", ["510300", "512800"], start_date="20250101")
+        storage.panel.build()   # 从全部品种的行情重建面板
+    """
+
+    def __init__(self, storage: "DataStorage"):
+        self._storage = storage
+        self.panel_dir = os.path.join(storage.storage_dir, "panel")
+        self.delta_dir = os.path.join(self.panel_dir, "delta")
+
+    def _path(self, field: str) -> str:
+        """字段宽表路径"""
+        return os.path.join(self.panel_dir, f"{field}.parquet")
+
+    def _delta_paths(self) -> list[str]:
+        """按写入顺序列出面板增量文件"""
+        if not os.path.isdir(self.delta_dir):
+            return []
+        return [
+            os.path.join(self.delta_dir, name)
+            for name in sorted(os.listdir(self.delta_dir))
+            if name.startswith(DELTA_PREFIX) and name.endswith(".parquet")
+        ]
+
+    @property
+    def exists(self) -> bool:
+        """面板是否已构建"""
+        return all(os.path.exists(self._path(field)) for field in PANEL_FIELDS)
+
+    def symbol_version(self, symbol: str) -> str | None:
+        """品种当前的文件版本（主文件与增量文件的文件名、inode、mtime、大小），无行情文件时为 None"""
+        storage = self._storage
+        path = storage._parquet_path(symbol)
+        try:
+            _, version = storage._current_version(symbol, [path, *storage._delta_paths(symbol)])
+        except FileNotFoundError:
+            return None
+        return json.dumps([[os.path.basename(p), *rest] for p, *rest in version])
+
+    def append(self, symbol: str, df: pd.DataFrame, previous_version: str | None) -> None:
+        """
+        追加某品种新写入的行情（由 save_bars 调用；面板尚未构建时跳过，构建时会读到这些行情）
+
+        Args:
+            symbol: 品种代码
+            df: 已去重排序的行情（index 为 date）
+            previous_version: 写入前该品种的文件版本（symbol_version），
+                与面板记录一致时面板才随本次增量更新到新版本，否则该品种在读取时重写
+        """
+        if df.empty or not self.exists:
+            return
+        rows = pd.DataFrame(
+            {
+                "symbol": symbol,
+                **{
+                    field: df[field].to_numpy(dtype="float64") if field in df.columns else float("nan")
+                    for field in PANEL_FIELDS
+                },
+                "previous_version": previous_version or "",
+                "version": self.symbol_version(symbol) or "",
+            },
+            index=df.index.rename("date"),
+        )
+        if self._publish_delta(rows) >= PANEL_COMPACT_DELTAS:
+            self.compact()
+
+    def load(
+        self,
+        field: str = "close",
+        symbols: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        读取面板（先重写文件版本与面板记录不符的品种）
+
+        Args:
+            field: 行情字段（见 PANEL_FIELDS）
+            symbols: 品种代码列表，None 为全部品种；无数据的品种不出现在结果中
+            start_date: 起始日期（YYYYMMDD 或 YYYY-MM-DD）
+            end_date: 结束日期
+
+        Returns:
+            DataFrame，index 为日期（统一交易日历），列为品种代码，品种当日无行情处为 NaN
+        """
+        if field not in PANEL_FIELDS:
+            raise ValueError(f"未知面板字段: '{field}'。可用字段: {', '.join(PANEL_FIELDS)}")
+        if not self.exists:
+            self.build()
+
+        long = self._read_delta_files(self._delta_paths())
+        if self._stale_symbols(symbols, self._recorded_versions(long)):
+            self.refresh(symbols)
+            long = self._read_delta_files(self._delta_paths())
+
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) if end_date else None
+        panel = self._storage._read_merged([self._path(field)], symbols, start, end)
+        panel = self._overlay(panel, self._filter_deltas(long, symbols, start, end), field)
+
+        # 日期过滤（行组只做了粗筛）
+        if start is not None:
+            panel = panel[panel.index >= start]
+        if end is not None:
+            panel = panel[panel.index <= end]
+        if symbols is not None:
+            panel = panel[[s for s in dict.fromkeys(symbols) if s in panel.columns]]
+        return panel
+
+    def build(self) -> None:
+        """从全部品种的行情（主文件 + 增量文件）重建面板"""
+        with self._lock():
+            storage = self._storage
+            symbols = self._file_symbols()
+            deltas = self._delta_paths()
+
+            versions: dict[str, str] = {}
+            columns: dict[str, dict[str, pd.Series]] = {field: {} for field in PANEL_FIELDS}
+            for symbol in symbols:
+                # 读取前记录版本：读取期间文件被改写时版本不符，下次读取会重写该品种
+                version = self.symbol_version(symbol)
+                if version is None:
+                    continue
+                versions[symbol] = version
+                bars = storage._read_merged(
+                    [storage._parquet_path(symbol), *storage._delta_paths(symbol)], list(PANEL_FIELDS)
+                )
+                for field in PANEL_FIELDS:
+                    if field in bars.columns:
+                        columns[field][symbol] = bars[field].astype("float64")
+
+            os.makedirs(self.panel_dir, exist_ok=True)
+            n_dates = 0
+            for field in PANEL_FIELDS:
+                panel = self._wide(columns[field])
+                n_dates = max(n_dates, len(panel))
+                storage._write_parquet(panel, self._path(field))
+            self._write_versions(versions)
+            # 行情已包含增量文件中的值，宽表写完后删除
+            self._remove(deltas)
+        print(f"[PanelStore] 已构建行情面板: {len(versions)} 只品种, {n_dates} 个交易日")
+
+    def compact(self) -> None:
+        """把增量文件合并进宽表，然后删除增量文件"""
+        with self._lock():
+            deltas = self._delta_paths()
+            if deltas:
+                long = self._read_delta_files(deltas)
+                self._rewrite(deltas, long, self._recorded_versions(long), [])
+
+    def refresh(self, symbols: list[str] | None = None) -> list[str]:
+        """
+        重写文件版本与面板记录不符的品种（同时合并增量文件）
+
+        Args:
+            symbols: 检查的品种，None 为行情目录与面板中的全部品种
+
+        Returns:
+            重写的品种代码
+        """
+        with self._lock():
+            deltas = self._delta_paths()
+            long = self._read_delta_files(deltas)
+            versions = self._recorded_versions(long)
+            stale = self._stale_symbols(symbols, versions)
+            if stale:
+                self._rewrite(deltas, long, versions, stale)
+        if stale:
+            print(f"[PanelStore] 已按当前行情重写 {len(stale)} 只品种")
+        return stale
+
+    def _file_symbols(self) -> list[str]:
+        """行情目录中的全部品种（有主文件的）"""
+        suffix = ".parquet"
+        return sorted(
+            name[: -len(suffix)] for name in os.listdir(self._storage.parquet_dir) if name.endswith(suffix)
+        )
+
+    def _stale_symbols(self, symbols: list[str] | None, versions: dict[str, str]) -> list[str]:
+        """当前文件版本与面板记录不符的品种（含面板中没有的新品种、文件已删除的品种）"""
+        candidates = list(dict.fromkeys(symbols)) if symbols is not None else sorted(
+            set(self._file_symbols()) | set(versions)
+        )
+        return [s for s in candidates if self.symbol_version(s) != versions.get(s)]
+
+    def _recorded_versions(self, long: pd.DataFrame) -> dict[str, str]:
+        """
+        面板当前反映的各品种文件版本：宽表记录的版本，依次叠加增量文件
+
+        增量文件的写入前版本与已记录的版本一致时才推进到写入后版本，否则（此前已有面板外的改写）
+        该品种版本记为未知，读取时重写。
+        """
+        try:
+            with open(os.path.join(self.panel_dir, VERSIONS_FILE), encoding="utf-8") as f:
+                versions: dict[str, str | None] = json.load(f)
+        except FileNotFoundError:
+            versions = {}
+        if not long.empty and "version" in long.columns:
+            changes = long[["symbol", "previous_version", "version"]].drop_duplicates()
+            for symbol, previous, version in changes.itertuples(index=False):
+                chained = versions.get(symbol) == (previous or None)
+                versions[symbol] = (version or None) if chained else ""
+        elif not long.empty:
+            for symbol in long["symbol"].unique():
+                versions[symbol] = ""
+        return {symbol: version for symbol, version in versions.items() if version is not None}
+
+    def _rewrite(
+        self, deltas: list[str], long: pd.DataFrame, versions: dict[str, str], stale: list[str]
+    ) -> None:
+        """合并增量文件并按当前行情重写 stale 品种的列（须持有锁），然后删除增量文件"""
+        storage = self._storage
+        versions = dict(versions)
+        columns: dict[str, dict[str, pd.Series]] = {field: {} for field in PANEL_FIELDS}
+        for symbol in stale:
+            version = self.symbol_version(symbol)
+            versions.pop(symbol, None)
+            if version is None:
+                continue  # 行情文件已删除：去掉该列
+            versions[symbol] = version
+            bars = storage._read_merged(
+                [storage._parquet_path(symbol), *storage._delta_paths(symbol)], list(PANEL_FIELDS)
+            )
+            for field in PANEL_FIELDS:
+                if field in bars.columns:
+                    columns[field][symbol] = bars[field].astype("float64")
+
+        for field in PANEL_FIELDS:
+            path = self._path(field)
+            panel = self._overlay(storage._read_merged([path]), long, field)
+            if stale:
+                panel = panel.drop(columns=[s for s in stale if s in panel.columns])
+                panel = pd.concat([panel, self._wide(columns[field])], axis=1)
+                panel = panel[sorted(panel.columns)].sort_index().dropna(how="all")
+                panel.index.name = "date"
+            storage._write_parquet(panel, path)
+        self._write_versions(versions)
+        # 宽表全部替换后再删除增量文件：中途中断时增量文件仍在，重复合并结果不变
+        self._remove(deltas)
+
+    def _publish_delta(self, rows: pd.DataFrame) -> int:
+        """
+        写入一个增量文件，返回写入后的增量文件数
+
+        先写入本线程独有的临时文件，再硬链接为不小于当前时间戳、且大于已有最大序号的序号名称；
+        名称已被其他进程 / 线程占用时序号加一重试，已发布的增量文件不会被覆盖。
+        """
+        os.makedirs(self.delta_dir, exist_ok=True)
+        tmp = os.path.join(self.delta_dir, f".{os.getpid()}.{threading.get_ident()}.tmp")
+        rows.to_parquet(tmp)
+        try:
+            deltas = self._delta_paths()
+            last = int(os.path.basename(deltas[-1])[len(DELTA_PREFIX) : -len(".parquet")]) if deltas else 0
+            seq = max(time.time_ns(), last + 1)
+            while True:
+                try:
+                    os.link(tmp, os.path.join(self.delta_dir, f"{DELTA_PREFIX}{seq:020d}.parquet"))
+                    break
+                except FileExistsError:
+                    seq += 1
+        finally:
+            os.remove(tmp)
+        return len(deltas) + 1
+
+    def _write_versions(self, versions: dict[str, str]) -> None:
+        path = os.path.join(self.panel_dir, VERSIONS_FILE)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(versions, f, sort_keys=True)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _remove(paths: list[str]) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @contextmanager
+    def _lock(self):
+        """
+        面板写入锁（跨进程、跨线程）：以 O_EXCL 创建锁文件
+
+        锁文件存在超过 PANEL_LOCK_TIMEOUT 秒视为持有者已异常退出，删除后重新获取。
+        """
+        os.makedirs(self.panel_dir, exist_ok=True)
+        path = os.path.join(self.panel_dir, ".lock")
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(path).st_mtime > PANEL_LOCK_TIMEOUT:
+                        os.remove(path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.remove(path)
+
+    @staticmethod
+    def _filter_deltas(
+        long: pd.DataFrame, symbols: list[str] | None, start: pd.Timestamp | None, end: pd.Timestamp | None
+    ) -> pd.DataFrame:
+        """增量文件中落在日期区间、属于 symbols 的行"""
+        if long.empty:
+            return long
+        mask = pd.Series(True, index=long.index)
+        if symbols is not None:
+            mask &= long["symbol"].isin(symbols)
+        if start is not None:
+            mask &= long.index >= start
+        if end is not None:
+            mask &= long.index <= end
+        return long[mask.to_numpy()]
+
+    @staticmethod
+    def _read_delta_files(paths: list[str]) -> pd.DataFrame:
+        """按写入顺序读取增量文件为长表（index 为 date，含 symbol 与各字段列）"""
+        if not paths:
+            return pd.DataFrame()
+        tables = [pq.ParquetFile(path).read() for path in paths]
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options="permissive")
+        return table.to_pandas()
+
+    @staticmethod
+    def _overlay(panel: pd.DataFrame, long: pd.DataFrame, field: str) -> pd.DataFrame:
+        """把长表中的值写入宽表（同一日期、品种以最后写入的为准），扩展新的日期与品种"""
+        if long.empty:
+            return panel
+        latest = long.reset_index().drop_duplicates(["date", "symbol"], keep="last")
+        index = panel.index.union(pd.DatetimeIndex(latest["date"].unique()))
+        columns = panel.columns.union(pd.Index(latest["symbol"].unique()), sort=False)
+        merged = panel.reindex(index=index, columns=sorted(columns)).astype("float64")
+        # 按位置整体赋值，避免逐品种对齐（combine_first 在上千列的宽表上很慢）
+        values = merged.to_numpy()
+        values[merged.index.get_indexer(latest["date"]), merged.columns.get_indexer(latest["symbol"])] = latest[field]
+        merged = pd.DataFrame(values, index=merged.index, columns=merged.columns)
+        merged.index.name = "date"
+        return merged
+
+    @staticmethod
+    def _wide(columns: dict[str, pd.Series]) -> pd.DataFrame:
+        """各品种序列按日期并集对齐为宽表"""
+        if not columns:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"), dtype="float64")
+        panel = pd.concat(columns, axis=1).sort_index()
+        panel.index.name = "date"
+        return panel
@@ -2,13 +2,56 @@
 数据存储引擎 - SQLite 元数据 + Parquet 行情数据
 
 提供品种元数据管理和行情数据持久化能力。
+
+行情采用"主文件 + 增量文件"布局，增量更新只写入新行：
+    parquet/<symbol>.parquet                      主文件（已去重、按日期排序）
+    parquet/<symbol>.delta/delta-0000000001.parquet   增量文件：每次 save_bars 写入的行
+增量文件数达到 COMPACT_DELTAS 时合并进主文件（compact）。
+读取时合并主文件与增量文件，同一日期以最后写入的为准。
+
+主文件按 ROW_GROUP_ROWS 行分为多个行组，每个行组带有日期的最小/最大值统计。
+load_bars 按日期区间跳过不相交的行组、只解码 columns 指定的列，读取近期或单列数据时无需读取整个文件。
+
+默认启用进程内共享的行情缓存（见 src.data.bar_cache）：首次加载读取完整行情并缓存，
+此后同一品种的加载只需按日期切片；文件变化（本进程写入或其他进程改写）后自动重新读取。
+缓存与镜像中的行情为只读数组：load_bars 默认返回切片的可写副本，readonly=True 时返回零拷贝的只读视图。
+
+use_mmap=True 时改为读取未压缩的 Arrow IPC 镜像（parquet/<symbol>.arrow，Parquet 变化后按需重建），
+以内存映射打开，各列为映射内存上的零拷贝只读视图：多个工作进程加载同一品种时共用一份页缓存，
+进程内不再持有解码后的副本。
+
+全部品种的收盘价与成交量另外维护为 (日期 × 品种) 面板（见 src.data.panel），save_bars 时同步追加，
+截面计算用 load_panel 一次读取。
 """
 
+import json
 import os
 import sqlite3
+import threading
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.bar_cache import BarCache, FileVersion, get_bar_cache
+from src.data.panel import PanelStore
+
+
+# 增量文件数达到该值时合并进主文件（越大追加越省，读取时要合并的小文件越多）
+COMPACT_DELTAS = 8
+
+DELTA_PREFIX = "delta-"
+
+# 主文件每个行组的行数（约一年的交易日）：行组越小按日期跳过得越精确，
+# 但每个行组都有固定的元数据与解码开销（按季度分组时全量读取慢 2~4 倍，见 src.benchmarks.storage_reads）
+ROW_GROUP_ROWS = 250
+
+# Arrow IPC 镜像的后缀与 schema 元数据键（记录生成镜像时 Parquet 文件的版本与索引列名）
+MIRROR_SUFFIX = ".arrow"
+MIRROR_VERSION_KEY = b"source_version"
+MIRROR_INDEX_KEY = b"index_column"
 
 
 class DataStorage:
@@ -19,10 +62,27 @@ class DataStorage:
     使用 Parquet 格式存储行情数据（高压缩率、列式存储）。
     """
 
-    def __init__(self, storage_dir: str = "data"):
+    def __init__(
+        self,
+        storage_dir: str = "data",
+        bar_cache: BarCache | None = None,
+        use_cache: bool = True,
+        use_mmap: bool = False,
+    ):
+        """
+        Args:
+            storage_dir: 数据存储目录
+            bar_cache: 行情缓存，None 为进程内共享的缓存（get_bar_cache()）
+            use_cache: False 时不使用行情缓存，每次加载都从文件读取（按日期与列下推）
+            use_mmap: True 时经内存映射的 Arrow IPC 镜像加载（零拷贝，不经行情缓存），适合多进程并行读取
+        """
         self.storage_dir = storage_dir
         self.parquet_dir = os.path.join(storage_dir, "parquet")
         self.db_path = os.path.join(storage_dir, "market.db")
+        self._bar_cache = (bar_cache if bar_cache is not None else get_bar_cache()) if use_cache else None
+        self._cache_dir = os.path.abspath(self.parquet_dir)  # 不同实例以相对 / 绝对路径指向同一目录时共用缓存
+        self.use_mmap = use_mmap
+        self.panel = PanelStore(self)  # (日期 × 品种) 行情面板
 
         # 确保目录存在
         os.makedirs(self.parquet_dir, exist_ok=True)
@@ -47,15 +107,143 @@ class DataStorage:
     # ===== 行情数据 (Parquet) =====
 
     def _parquet_path(self, symbol: str) -> str:
-        """生成品种 Parquet 文件路径"""
+        """生成品种主文件路径"""
         return os.path.join(self.parquet_dir, f"{symbol}.parquet")
 
+    def _delta_dir(self, symbol: str) -> str:
+        """品种增量文件目录"""
+        return os.path.join(self.parquet_dir, f"{symbol}.delta")
+
+    def _delta_paths(self, symbol: str) -> list[str]:
+        """按写入顺序列出品种的增量文件"""
+        delta_dir = self._delta_dir(symbol)
+        if not os.path.isdir(delta_dir):
+            return []
+        return [
+            os.path.join(delta_dir, name)
+            for name in sorted(os.listdir(delta_dir))
+            if name.startswith(DELTA_PREFIX) and name.endswith(".parquet")
+        ]
+
+    def _mirror_path(self, symbol: str) -> str:
+        """品种 Arrow IPC 镜像路径"""
+        return os.path.join(self.parquet_dir, f"{symbol}{MIRROR_SUFFIX}")
+
+    @staticmethod
+    def _file_version(paths: list[str]) -> FileVersion:
+        """各文件的 (路径, inode, mtime, 大小)，作为行情缓存的版本"""
+        version = []
+        for path in paths:
+            st = os.stat(path)
+            version.append((path, st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(version)
+
+    def _current_version(self, symbol: str, paths: list[str]) -> tuple[list[str], FileVersion]:
+        """当前文件列表及其版本"""
+        try:
+            return paths, self._file_version(paths)
+        except FileNotFoundError:
+            # 列出文件后被并发合并（增量文件已删除），按最新文件重新列出
+            paths = [paths[0], *self._delta_paths(symbol)]
+            return paths, self._file_version(paths)
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, path: str) -> None:
+        """先写临时文件再替换，读取方不会读到写了一半的文件（临时文件名按进程、线程区分）"""
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp, row_group_size=ROW_GROUP_ROWS)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _index_column(pf: pq.ParquetFile) -> int | None:
+        """日期索引在文件中的列号（索引未作为列存储时为 None）"""
+        index_columns = (pf.schema_arrow.pandas_metadata or {}).get("index_columns", [])
+        if not index_columns or not isinstance(index_columns[0], str):
+            return None
+        return pf.schema_arrow.get_field_index(index_columns[0])
+
+    @classmethod
+    def _row_groups(cls, pf: pq.ParquetFile, start: pd.Timestamp | None, end: pd.Timestamp | None) -> list[int]:
+        """按日期索引的行组统计，选出与 [start, end] 相交的行组（无统计信息的行组总会被选中）"""
+        groups = list(range(pf.metadata.num_row_groups))
+        if start is None and end is None:
+            return groups
+        column = cls._index_column(pf)
+        if column is None:
+            return groups
+
+        selected = []
+        for i in groups:
+            stats = pf.metadata.row_group(i).column(column).statistics
+            if stats is not None and stats.has_min_max:
+                if start is not None and pd.Timestamp(stats.max) < start:
+                    continue
+                if end is not None and pd.Timestamp(stats.min) > end:
+                    continue
+            selected.append(i)
+        return selected
+
+    @classmethod
+    def _date_range(cls, paths: list[str]) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        """各文件日期索引的最小、最大值：取行组统计，缺少统计信息的文件只读取日期索引"""
+        lows, highs = [], []
+        for path in paths:
+            pf = pq.ParquetFile(path)
+            column = cls._index_column(pf)
+            stats = [
+                pf.metadata.row_group(i).column(column).statistics
+                for i in range(pf.metadata.num_row_groups)
+            ] if column is not None else []
+            if stats and all(st is not None and st.has_min_max for st in stats):
+                lows.append(min(pd.Timestamp(st.min) for st in stats))
+                highs.append(max(pd.Timestamp(st.max) for st in stats))
+                continue
+            index = pf.read(columns=[], use_pandas_metadata=True).to_pandas().index
+            if len(index):
+                lows.append(index.min())
+                highs.append(index.max())
+        if not lows:
+            return None
+        return min(lows), max(highs)
+
+    @classmethod
+    def _read_merged(
+        cls,
+        paths: list[str],
+        columns: list[str] | None = None,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """
+        按写入顺序读取并合并多个文件，同一日期保留最后写入的行
+
+        各文件先读为 Arrow 表、拼接后一次性转换为 DataFrame（逐个 read_parquet 的固定开销远大于小文件本身）。
+        给定 start / end 时只读取日期区间相交的行组（行组内仍可能含区间外的行，由调用方精确过滤）；
+        给定 columns 时只读取这些列与日期索引。
+        """
+        tables = []
+        for path in paths:
+            pf = pq.ParquetFile(path)
+            names = None
+            if columns is not None:
+                available = set(pf.schema_arrow.names)
+                names = [c for c in columns if c in available]
+            tables.append(pf.read_row_groups(cls._row_groups(pf, start, end), columns=names, use_pandas_metadata=True))
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables, promote_options="permissive")
+        combined = table.to_pandas()
+        if len(tables) == 1 or (np.diff(combined.index.asi8) > 0).all():
+            return combined  # 单个文件或纯追加：日期已严格递增，无需去重排序
+        combined = combined[~combined.index.duplicated(keep="last")]
+        return combined.sort_index()
+
     def save_bars(self, symbol: str, df: pd.DataFrame) -> None:
         """
-        保存行情数据到 Parquet 文件
+        保存行情数据（只写入传入的行）
 
-        如果文件已存在，将新数据与旧数据合并（按日期去重，保留最新）。
-        同时更新 SQLite 元数据。
+        主文件已存在时把新行写成一个增量文件，不读取、不重写历史数据；
+        与已有日期重复的行在读取时覆盖旧值（按日期去重，保留最新）。
+        元数据的起止日期由传入数据与已有元数据得出，无需回读文件；
+        主文件已存在而没有元数据（如重建了数据库、复制来的行情文件）时，改由各文件的日期统计得出。
 
         Args:
             symbol: 品种代码
@@ -64,36 +252,75 @@ class DataStorage:
         if df.empty:
             return
 
+        df = df[~df.index.duplicated(keep="last")].sort_index()
         path = self._parquet_path(symbol)
+        existed = os.path.exists(path)
+        previous_version = self.panel.symbol_version(symbol)
 
-        if os.path.exists(path):
-            # 合并旧数据
-            existing = pd.read_parquet(path)
-            combined = pd.concat([existing, df])
-            # 按日期去重，保留最后出现的
-            combined = combined[~combined.index.duplicated(keep="last")]
-            combined.sort_index(inplace=True)
-            combined.to_parquet(path)
+        if existed:
+            deltas = self._delta_paths(symbol)
+            seq = int(os.path.basename(deltas[-1])[len(DELTA_PREFIX) : -len(".parquet")]) + 1 if deltas else 1
+            os.makedirs(self._delta_dir(symbol), exist_ok=True)
+            self._write_parquet(df, os.path.join(self._delta_dir(symbol), f"{DELTA_PREFIX}{seq:010d}.parquet"))
+            if len(deltas) + 1 >= COMPACT_DELTAS:
+                self.compact(symbol)
         else:
-            df.sort_index(inplace=True)
-            df.to_parquet(path)
+            self._write_parquet(df, path)
+        if self._bar_cache is not None:
+            self._bar_cache.invalidate(self._cache_dir, symbol)
+        self.panel.append(symbol, df, previous_version)
 
         # 更新元数据
-        all_data = pd.read_parquet(path)
-        first_date = str(all_data.index.min().date())
-        last_date = str(all_data.index.max().date())
+        first_date = str(df.index.min().date())
+        last_date = str(df.index.max().date())
+        row = self._conn.execute(
+            "SELECT first_date, last_date FROM symbols WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        if row and row[0] and row[1]:
+            first_date = min(first_date, row[0])
+            last_date = max(last_date, row[1])
+        elif existed:
+            stored = self._date_range([path, *self._delta_paths(symbol)])
+            if stored is not None:
+                first_date = min(first_date, str(stored[0].date()))
+                last_date = max(last_date, str(stored[1].date()))
         self.update_metadata(symbol, first_date, last_date)
 
+    def compact(self, symbol: str) -> None:
+        """把增量文件合并进主文件，然后删除增量文件"""
+        deltas = self._delta_paths(symbol)
+        if not deltas:
+            return
+        path = self._parquet_path(symbol)
+        self._write_parquet(self._read_merged([path, *deltas]), path)
+        # 主文件替换后再删除增量文件：中途中断时增量文件仍在，重复合并结果不变
+        for delta in deltas:
+            os.remove(delta)
+        if self._bar_cache is not None:
+            self._bar_cache.invalidate(self._cache_dir, symbol)
+
     def load_bars(
-        self, symbol: str, start_date: str | None = None, end_date: str | None = None
+        self,
+        symbol: str,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        columns: list[str] | None = None,
+        readonly: bool = False,
     ) -> pd.DataFrame:
         """
-        从 Parquet 文件读取行情数据
+        从 Parquet 文件读取行情数据（合并主文件与增量文件）
+
+        启用行情缓存时从缓存的完整行情按日期切片（未命中时读取完整行情并缓存）；
+        否则日期区间与列在读取时下推：只读取日期区间相交的行组与所需的列。
 
         Args:
             symbol: 品种代码
             start_date: 起始日期（YYYYMMDD 或 YYYY-MM-DD）
             end_date: 结束日期
+            columns: 只读取这些列（日期索引总会读取），如 ['close']；None 为全部列
+            readonly: 经行情缓存或内存映射镜像加载时，直接返回不复制数据的只读视图
+                （df.loc[i, "close"] = x 等原地修改会抛出 ValueError，整列赋值不受影响）；
+                默认复制切片后返回普通的可写 DataFrame
 
         Returns:
             DataFrame，文件不存在则返回空 DataFrame
@@ -102,18 +329,139 @@ class DataStorage:
         if not os.path.exists(path):
             return pd.DataFrame()
 
-        df = pd.read_parquet(path)
+        start = pd.Timestamp(start_date) if start_date else None
+        end = pd.Timestamp(end_date) if end_date else None
+        paths = [path, *self._delta_paths(symbol)]
+        if self.use_mmap or self._bar_cache is not None:
+            if self.use_mmap:
+                df = self._load_mapped(symbol, paths, start, end, columns)
+            else:
+                df = self._slice(self._load_cached(symbol, paths), start, end, columns)
+            return df if readonly else df.copy()
+        df = self._read_merged(paths, columns, start, end)
 
-        # 日期过滤
-        if start_date:
-            start = pd.Timestamp(start_date)
+        # 日期过滤（行组只做了粗筛）
+        if start is not None:
             df = df[df.index >= start]
-        if end_date:
-            end = pd.Timestamp(end_date)
+        if end is not None:
             df = df[df.index <= end]
 
         return df
 
+    def _load_cached(self, symbol: str, paths: list[str]) -> pd.DataFrame:
+        """经行情缓存加载完整行情（未命中时读取并缓存）"""
+        paths, version = self._current_version(symbol, paths)
+        df = self._bar_cache.get(self._cache_dir, symbol, version)
+        if df is None:
+            df = self._bar_cache.put(self._cache_dir, symbol, version, self._read_merged(paths))
+        return df
+
+    def _load_mapped(
+        self,
+        symbol: str,
+        paths: list[str],
+        start: pd.Timestamp | None,
+        end: pd.Timestamp | None,
+        columns: list[str] | None,
+    ) -> pd.DataFrame:
+        """
+        经内存映射的 Arrow IPC 镜像加载（镜像缺失或与 Parquet 版本不符时重建）
+
+        先在映射的 NumPy 视图上按日期切片、按列投影，再组装 DataFrame（组装开销与列数成正比）。
+        """
+        paths, version = self._current_version(symbol, paths)
+        # 版本只记录文件名：不同进程以相对 / 绝对路径打开同一目录时镜像仍然有效
+        source_version = json.dumps([[os.path.basename(p), *rest] for p, *rest in version]).encode()
+        mirror = self._mirror_path(symbol)
+        table = self._open_mirror(mirror, source_version)
+        if table is None:
+            self._write_mirror(self._read_merged(paths), mirror, source_version)
+            table = self._open_mirror(mirror, source_version)
+
+        def view(column: pa.ChunkedArray) -> np.ndarray:
+            # 镜像整表写为一个批次，单块列可零拷贝转为 NumPy（无缺失值的数值列）
+            array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            return array.to_numpy(zero_copy_only=False)
+
+        dates = view(table.column(0))
+        lo = dates.searchsorted(start.to_datetime64(), side="left") if start is not None else 0
+        hi = dates.searchsorted(end.to_datetime64(), side="right") if end is not None else len(dates)
+        names = table.column_names[1:]
+        if columns is not None:
+            names = [c for c in columns if c in names]
+        index_name = table.schema.metadata[MIRROR_INDEX_KEY].decode() or None
+        return pd.DataFrame(
+            {name: view(table.column(name))[lo:hi] for name in names},
+            index=pd.Index(dates[lo:hi], name=index_name, copy=False),
+            copy=False,
+        )
+
+    @staticmethod
+    def _open_mirror(path: str, source_version: bytes) -> pa.Table | None:
+        """以内存映射打开镜像，不存在、已损坏或版本不符时返回 None"""
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        if (reader.schema.metadata or {}).get(MIRROR_VERSION_KEY) != source_version:
+            return None
+        return reader.read_all()
+
+    @staticmethod
+    def _write_mirror(df: pd.DataFrame, path: str, source_version: bytes) -> None:
+        """
+        写入未压缩的 Arrow IPC 镜像（第 0 列为日期索引）
+
+        各列由 NumPy 数组直接构造：浮点 NaN 按原值存放而非转为空值，读取时才能零拷贝。
+        临时文件名带进程号，多个进程同时重建时互不覆盖，最后一次替换生效。
+        """
+        arrays = [pa.array(df.index.to_numpy())] + [pa.array(df[c].to_numpy()) for c in df.columns]
+        names = [df.index.name or "", *map(str, df.columns)]
+        metadata = {MIRROR_VERSION_KEY: source_version, MIRROR_INDEX_KEY: (df.index.name or "").encode()}
+        table = pa.Table.from_arrays(arrays, names=names, metadata=metadata)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _slice(
+        df: pd.DataFrame,
+        start: pd.Timestamp | None,
+        end: pd.Timestamp | None,
+        columns: list[str] | None,
+    ) -> pd.DataFrame:
+        """按日期二分切片、按列投影完整行情"""
+        # 合并后的日期严格递增，二分定位等价于逐行比较
+        lo = df.index.searchsorted(start, side="left") if start is not None else 0
+        hi = df.index.searchsorted(end, side="right") if end is not None else len(df)
+        # 返回不复制数据的只读视图，包装为独立的 DataFrame：调用方整列赋值不会影响缓存或镜像，也不触发 SettingWithCopyWarning
+        if columns is None:
+            return pd.DataFrame(df.iloc[lo:hi], copy=False)
+        names = [c for c in columns if c in df.columns]
+        return pd.DataFrame({c: df[c].to_numpy()[lo:hi] for c in names}, index=df.index[lo:hi], copy=False)
+
+    def load_panel(
+        self,
+        field: str = "close",
+        symbols: list[str] | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        读取 (日期 × 品种) 行情面板（面板不存在时先由全部品种的行情构建）
+
+        Args:
+            field: 'close' 或 'volume'
+            symbols: 品种代码列表，None 为全部品种；无数据的品种不出现在结果中
+            start_date: 起始日期（YYYYMMDD 或 YYYY-MM-DD）
+            end_date: 结束日期
+
+        Returns:
+            DataFrame，index 为统一交易日历，列为品种代码，品种当日无行情处为 NaN
+        """
+        return self.panel.load(field, symbols, start_date, end_date)
+
     # ===== 品种元数据 (SQLite) =====
 
     def update_metadata(
@@ -0,0 +1,41 @@
+"""
+技术指标库 - 流式 O(1) 更新 + 批量数组计算
+
+每个指标提供两种形式：
+  - 流式类：update() 逐 bar 更新，供策略 on_bar() 使用
+  - 批量函数：对整段数组一次计算，供 generate_signals() 使用
+两种形式的结果逐位一致（未就绪位置：流式为 None，批量为 NaN）。
+"""
+
+from src.indicators.rolling import (
+    RollingSum,
+    RollingMean,
+    RollingVariance,
+    RollingMax,
+    RollingMin,
+    rolling_sum,
+    rolling_mean,
+    rolling_variance,
+    rolling_std,
+    rolling_max,
+    rolling_min,
+)
+from src.indicators.trend import EMA, MACD, ema, macd
+from src.indicators.volatility import TrueRange, WilderAverage, ATR, true_range, wilder_average, atr
+from src.indicators.momentum import RSI, ROC, rsi, roc
+from src.indicators.cache import (
+    INDICATOR_FUNCTIONS,
+    CacheStats,
+    IndicatorCache,
+    compute_indicator,
+    fingerprint,
+)
+
+__all__ = [
+    "RollingSum", "RollingMean", "RollingVariance", "RollingMax", "RollingMin",
+    "rolling_sum", "rolling_mean", "rolling_variance", "rolling_std", "rolling_max", "rolling_min",
+    "EMA", "MACD", "ema", "macd",
+    "TrueRange", "WilderAverage", "ATR", "true_range", "wilder_average", "atr",
+    "RSI", "ROC", "rsi", "roc",
+    "INDICATOR_FUNCTIONS", "CacheStats", "IndicatorCache", "compute_indicator", "fingerprint",
+]
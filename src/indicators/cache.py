@@ -0,0 +1,235 @@
+"""
+指标缓存 - 跨回测复用整段指标数组
+
+参数网格与 Walk-forward 中，大量组合在同一份行情上重复计算相同的 EMA / ATR / RSI。
+IndicatorCache 以 (数据指纹, 指标名, 参数) 为键缓存批量指标函数的计算结果：
+  - 内存层：按占用字节数做 LRU 淘汰
+  - 磁盘层（可选）：被淘汰的条目写入 spill_dir 下的 Parquet 文件，再次命中时读回内存
+数据指纹由输入数组内容哈希得到，同一品种的数据更新后指纹随之变化，旧条目自然失效。
+缓存返回的数组为只读，调用方不得原地修改。
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.indicators.momentum import roc, rsi
+from src.indicators.rolling import (
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_std,
+    rolling_sum,
+    rolling_variance,
+)
+from src.indicators.trend import ema, macd
+from src.indicators.volatility import atr, true_range, wilder_average
+
+
+# 可缓存的批量指标函数
+INDICATOR_FUNCTIONS: dict[str, Callable] = {
+    "rolling_sum": rolling_sum,
+    "rolling_mean": rolling_mean,
+    "rolling_variance": rolling_variance,
+    "rolling_std": rolling_std,
+    "rolling_max": rolling_max,
+    "rolling_min": rolling_min,
+    "ema": ema,
+    "macd": macd,
+    "true_range": true_range,
+    "wilder_average": wilder_average,
+    "atr": atr,
+    "rsi": rsi,
+    "roc": roc,
+}
+
+IndicatorValue = np.ndarray | tuple[np.ndarray, ...]
+
+
+def fingerprint(*arrays: np.ndarray) -> str:
+    """输入数组的内容指纹（dtype、形状与数据共同决定）"""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def _check_indicator(name: str) -> None:
+    if name not in INDICATOR_FUNCTIONS:
+        available = ", ".join(INDICATOR_FUNCTIONS)
+        raise ValueError(f"未知指标: '{name}'。可用指标: {available}")
+
+
+def compute_indicator(name: str, *inputs: np.ndarray, **params) -> IndicatorValue:
+    """不经缓存直接计算指标"""
+    _check_indicator(name)
+    return INDICATOR_FUNCTIONS[name](*inputs, **params)
+
+
+@dataclass
+class CacheStats:
+    """缓存命中与淘汰统计"""
+    hits: int = 0          # 内存命中
+    disk_hits: int = 0     # 磁盘命中（读回内存）
+    misses: int = 0        # 未命中（重新计算）
+    evictions: int = 0     # 内存淘汰次数
+    spills: int = 0        # 淘汰时写入磁盘的次数
+    entries: int = 0       # 当前内存条目数
+    bytes: int = 0         # 当前内存占用字节数
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率（内存 + 磁盘）"""
+        return (self.hits + self.disk_hits) / self.requests if self.requests else 0.0
+
+    def format(self) -> str:
+        return (
+            f"指标缓存: 请求 {self.requests}, 命中率 {self.hit_rate:.1%} "
+            f"(内存 {self.hits} / 磁盘 {self.disk_hits} / 未命中 {self.misses}), "
+            f"淘汰 {self.evictions} (落盘 {self.spills}), "
+            f"占用 {self.entries} 项 / {self.bytes / 1024 / 1024:.1f} MB"
+        )
+
+
+def _nbytes(value: IndicatorValue) -> int:
+    if isinstance(value, tuple):
+        return sum(array.nbytes for array in value)
+    return value.nbytes
+
+
+def _freeze(value: IndicatorValue) -> IndicatorValue:
+    """置为只读，防止调用方修改缓存内容"""
+    arrays = value if isinstance(value, tuple) else (value,)
+    for array in arrays:
+        array.flags.writeable = False
+    return value
+
+
+class IndicatorCache:
+    """
+    指标数组缓存（内存 LRU + 可选 Parquet 落盘）
+
+    用法:
+        cache = IndicatorCache(max_bytes=256 * 1024 * 1024, spill_dir="data/indicator_cache")
+        ema20 = cache.get("ema", closes, period=20)
+        dif, dea, hist = cache.get("macd", closes, fast=12, slow=26, signal=9)
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, spill_dir: str | Path | None = None):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes 应 > 0，当前为 {max_bytes}")
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, IndicatorValue] = OrderedDict()
+        self._stats = CacheStats()
+
+    @staticmethod
+    def make_key(name: str, data_fingerprint: str, params: dict) -> str:
+        """缓存键：数据指纹 + 指标名 + 按名称排序的参数"""
+        # numpy 标量（如从结果表取出的参数）按 Python 值参与键计算
+        spec = ",".join(
+            f"{k}={v.item() if isinstance(v, np.generic) else v!r}"
+            for k, v in sorted(params.items())
+        )
+        raw = f"{data_fingerprint}|{name}|{spec}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, name: str, *inputs: np.ndarray, **params) -> IndicatorValue:
+        """
+        获取指标数组，未命中时计算并缓存
+
+        Args:
+            name: 指标名（见 INDICATOR_FUNCTIONS）
+            *inputs: 指标输入数组（如 close，或 high, low, close）
+            **params: 指标参数（如 period=20）
+        """
+        _check_indicator(name)
+        inputs = tuple(np.asarray(x, dtype=np.float64) for x in inputs)
+        key = self.make_key(name, fingerprint(*inputs), params)
+
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+        value = self._load_spilled(key)
+        if value is not None:
+            self._stats.disk_hits += 1
+        else:
+            self._stats.misses += 1
+            value = _freeze(compute_indicator(name, *inputs, **params))
+        self._insert(key, value)
+        return value
+
+    def stats(self) -> CacheStats:
+        """当前统计快照"""
+        return replace(self._stats)
+
+    def clear(self) -> None:
+        """清空内存层（磁盘文件保留，统计清零）"""
+        self._entries.clear()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _insert(self, key: str, value: IndicatorValue) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            # 单项超过容量上限：不进内存，直接落盘
+            self._spill(key, value)
+            return
+        self._entries[key] = value
+        self._stats.entries += 1
+        self._stats.bytes += size
+        while self._stats.bytes > self.max_bytes:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._stats.entries -= 1
+            self._stats.bytes -= _nbytes(old_value)
+            self._stats.evictions += 1
+            self._spill(old_key, old_value)
+
+    def _spill_path(self, key: str) -> Path:
+        return self.spill_dir / f"{key}.parquet"
+
+    def _spill(self, key: str, value: IndicatorValue) -> None:
+        if self.spill_dir is None:
+            return
+        path = self._spill_path(key)
+        if not path.exists():
+            # 单数组存为 value 列，多输出指标（如 MACD）存为 out0, out1, ...
+            if isinstance(value, tuple):
+                frame = pd.DataFrame({f"out{i}": array for i, array in enumerate(value)})
+            else:
+                frame = pd.DataFrame({"value": value})
+            frame.to_parquet(path, index=False)
+        self._stats.spills += 1
+
+    def _load_spilled(self, key: str) -> IndicatorValue | None:
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        if not path.exists():
+            return None
+        frame = pd.read_parquet(path)
+        if "value" in frame.columns:
+            return _freeze(frame["value"].to_numpy(dtype=np.float64))
+        return _freeze(tuple(frame[column].to_numpy(dtype=np.float64) for column in frame.columns))
@@ -0,0 +1,108 @@
+"""
+动量指标 - RSI、ROC
+
+RSI 支持 simple（最近 N 个涨跌幅的简单平均）与 wilder 两种平滑方式，
+平均跌幅为 0 时 RSI 取 100。
+"""
+
+from collections import deque
+
+import numpy as np
+
+from src.indicators.rolling import RollingMean, rolling_mean
+from src.indicators.volatility import WilderAverage, _check_smoothing, wilder_average
+
+
+class RSI:
+    """相对强弱指标（首根 bar 无涨跌幅，需 period + 1 根 bar 才就绪）"""
+
+    def __init__(self, period: int = 14, smoothing: str = "wilder"):
+        _check_smoothing(smoothing)
+        self.period = period
+        self.smoothing = smoothing
+        average = RollingMean if smoothing == "simple" else WilderAverage
+        self._gain = average(period)
+        self._loss = average(period)
+        self._last: float | None = None
+        self.value: float | None = None
+
+    def update(self, value: float) -> float | None:
+        if self._last is not None:
+            change = value - self._last
+            avg_gain = self._gain.update(max(change, 0.0))
+            avg_loss = self._loss.update(max(-change, 0.0))
+            if avg_gain is not None:
+                if avg_loss == 0:
+                    self.value = 100.0
+                else:
+                    self.value = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+        self._last = value
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def reset(self) -> None:
+        self._gain.reset()
+        self._loss.reset()
+        self._last = None
+        self.value = None
+
+
+class ROC:
+    """N 日变化率 (当前 - N 日前) / N 日前，N 日前价格非正时为 0"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._values: deque[float] = deque(maxlen=period + 1)
+        self.value: float | None = None
+
+    def update(self, value: float) -> float | None:
+        self._values.append(value)
+        if len(self._values) > self.period:
+            old = self._values[0]
+            self.value = (value - old) / old if old > 0 else 0.0
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def reset(self) -> None:
+        self._values.clear()
+        self.value = None
+
+
+# =====================================================================
+# 批量版本
+# =====================================================================
+
+def rsi(values: np.ndarray, period: int = 14, smoothing: str = "wilder") -> np.ndarray:
+    """RSI 数组，与 RSI 逐个 update() 的结果一致"""
+    _check_smoothing(smoothing)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) > 1:
+        change = values[1:] - values[:-1]
+        average = rolling_mean if smoothing == "simple" else wilder_average
+        avg_gain = average(np.maximum(change, 0.0), period)
+        avg_loss = average(np.maximum(-change, 0.0), period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[1:] = np.where(
+                avg_loss == 0, 100.0, 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+            )
+    return out
+
+
+def roc(values: np.ndarray, period: int) -> np.ndarray:
+    """ROC 数组，与 ROC 一致；二维输入（日期 × 品种）按列计算"""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full(values.shape, np.nan)
+    if n > period:
+        old = values[: n - period]
+        curr = values[period:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[period:] = np.where(old > 0, (curr - old) / old, 0.0)
+    return out
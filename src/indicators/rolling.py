@@ -0,0 +1,322 @@
+"""
+滚动窗口指标 - 滚动求和/均值/方差（精确滚动和）、单调队列滚动最值
+
+流式版本每根 bar O(1) 更新（最值为均摊 O(1)）；批量版本对整段数组一次计算，
+与逐个 update() 的结果逐位一致（未就绪位置为 NaN）。
+
+滚动求和以无误差展开（Shewchuk partials）维护窗口和，结果等于对窗口 math.fsum
+的正确舍入值，长时间滑动也不会累积舍入漂移。
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+def _grow_partials(partials: list[float], x: float) -> None:
+    """把 x 精确累加进互不重叠的部分和列表（math.fsum 的同一算法）"""
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+class RollingSum:
+    """
+    滚动窗口求和
+
+    移入值与移出值的相反数精确累加进部分和列表，窗口和取其正确舍入值。
+    窗口内含 NaN / inf 时退化为直接求和。
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"window 应 >= 1，当前为 {window}")
+        self.window = window
+        self._values: deque[float] = deque(maxlen=window)
+        self._partials: list[float] = []
+        self._nonfinite = 0
+
+    def update(self, value: float) -> float | None:
+        if len(self._values) == self.window:
+            old = self._values[0]
+            if math.isfinite(old):
+                _grow_partials(self._partials, -old)
+            else:
+                self._nonfinite -= 1
+        if math.isfinite(value):
+            _grow_partials(self._partials, value)
+        else:
+            self._nonfinite += 1
+        self._values.append(value)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) == self.window
+
+    @property
+    def values(self) -> tuple[float, ...]:
+        """当前窗口内的数据（按时间先后）"""
+        return tuple(self._values)
+
+    @property
+    def value(self) -> float | None:
+        if not self.ready:
+            return None
+        if self._nonfinite:
+            return sum(self._values)
+        return math.fsum(self._partials)
+
+    def reset(self) -> None:
+        self._values.clear()
+        self._partials = []
+        self._nonfinite = 0
+
+
+class RollingMean:
+    """滚动窗口均值（窗口和 / 窗口长度）"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self._sum = RollingSum(window)
+
+    def update(self, value: float) -> float | None:
+        self._sum.update(value)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self._sum.ready
+
+    @property
+    def value(self) -> float | None:
+        total = self._sum.value
+        return None if total is None else total / self.window
+
+    def reset(self) -> None:
+        self._sum.reset()
+
+
+class RollingVariance:
+    """
+    滚动窗口总体方差（精确滚动和）
+
+    与 RollingSum 相同，以无误差展开分别维护窗口内 x 与 x * x 之和，每根 bar O(1) 更新：
+    均值 = 窗口和 / 窗口长度（与 sum(recent) / len 逐位一致），
+    方差 = 平方和 / 窗口长度 - 均值²（舍入得到的负值截为 0），标准差 = 方差 ** 0.5。
+    两个窗口和都是正确舍入值，不随滑动累积漂移；与两遍法 sum((x - mean) ** 2) / len 的差异
+    只来自最后一步相减的舍入，不超过 均值² 的 1e-15 量级。
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"window 应 >= 1，当前为 {window}")
+        self.window = window
+        self._sum = RollingSum(window)
+        self._sum_sq = RollingSum(window)
+
+    def update(self, value: float) -> float | None:
+        self._sum.update(value)
+        self._sum_sq.update(value * value)
+        return self.variance
+
+    @property
+    def ready(self) -> bool:
+        return self._sum.ready
+
+    @property
+    def values(self) -> tuple[float, ...]:
+        """当前窗口内的数据（按时间先后）"""
+        return self._sum.values
+
+    @property
+    def mean(self) -> float | None:
+        total = self._sum.value
+        return None if total is None else total / self.window
+
+    @property
+    def variance(self) -> float | None:
+        mean = self.mean
+        if mean is None:
+            return None
+        variance = self._sum_sq.value / self.window - mean * mean
+        return 0.0 if variance < 0 else variance
+
+    @property
+    def std(self) -> float | None:
+        variance = self.variance
+        return None if variance is None else variance ** 0.5
+
+    @property
+    def value(self) -> float | None:
+        return self.variance
+
+    def reset(self) -> None:
+        self._sum.reset()
+        self._sum_sq.reset()
+
+
+class _RollingExtreme(ABC):
+    """单调队列滚动最值（队首始终为窗口内最值）"""
+
+    def __init__(self, window: int, min_periods: int | None = None):
+        if window < 1:
+            raise ValueError(f"window 应 >= 1，当前为 {window}")
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._queue: deque[tuple[int, float]] = deque()
+        self._count = 0
+
+    @abstractmethod
+    def _dominates(self, a: float, b: float) -> bool:
+        """a 是否比 b 更接近最值（队尾不被新值 b 支配时保留）"""
+
+    def update(self, value: float) -> float | None:
+        queue = self._queue
+        while queue and not self._dominates(queue[-1][1], value):
+            queue.pop()
+        queue.append((self._count, value))
+        self._count += 1
+        if queue[0][0] <= self._count - 1 - self.window:
+            queue.popleft()
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return min(self._count, self.window) >= self.min_periods
+
+    @property
+    def value(self) -> float | None:
+        return self._queue[0][1] if self.ready and self._queue else None
+
+    def reset(self) -> None:
+        self._queue.clear()
+        self._count = 0
+
+
+class RollingMax(_RollingExtreme):
+    """滚动窗口最大值（min_periods 为产出结果所需的最少数据量，默认等于窗口）"""
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a > b
+
+
+class RollingMin(_RollingExtreme):
+    """滚动窗口最小值（min_periods 为产出结果所需的最少数据量，默认等于窗口）"""
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a < b
+
+
+# =====================================================================
+# 批量版本
+# =====================================================================
+
+# 整数快速路径把缩放后的数据拆为高低两段，低段位数
+_LIMB_BITS = 32
+
+
+def _scaled_window_sums(values: np.ndarray, window: int) -> np.ndarray | None:
+    """
+    整数快速路径：精确计算全部完整窗口的和（与 math.fsum 逐位一致）
+
+    全部数据均为 2^-scale 的整数倍时，缩放后拆成 高段 × 2^32 + 低段 两个整数，
+    两段分别用 int64 前缀和之差求窗口和（前缀和溢出按补码回绕，不影响窗口和），
+    两段的窗口和都能精确转为 float，最终只在一次浮点加法中舍入。
+    条件不满足（含 NaN / inf、跨度过大）时返回 None。
+    """
+    if not np.isfinite(values).all():
+        return None
+    nonzero = values[values != 0]
+    if len(nonzero) == 0:
+        return np.zeros(len(values) - window + 1)
+    mantissa, exponent = np.frexp(nonzero)
+    digits = np.ldexp(np.abs(mantissa), 53).astype(np.int64)
+    trailing = np.log2(digits & -digits).astype(np.int64)
+    scale = int((53 - exponent - trailing).max())
+    # 高段窗口和须 < 2^53，且结果不落入次正规数范围
+    if scale > 960 or int(exponent.max()) + scale - _LIMB_BITS + window.bit_length() > 52:
+        return None
+
+    scaled = np.ldexp(values, scale)
+    high = np.floor(np.ldexp(scaled, -_LIMB_BITS))
+    low = scaled - np.ldexp(high, _LIMB_BITS)
+
+    def sums(limb: np.ndarray) -> np.ndarray:
+        prefix = np.concatenate(([0], np.cumsum(limb.astype(np.int64))))
+        return (prefix[window:] - prefix[: len(limb) - window + 1]).astype(np.float64)
+
+    return np.ldexp(np.ldexp(sums(high), _LIMB_BITS) + sums(low), -scale)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """滚动求和，与 RollingSum 逐个 update() 的结果逐位一致"""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    sums = _scaled_window_sums(values, window)
+    if sums is not None:
+        out[window - 1 :] = sums
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    finite = np.isfinite(windows).all(axis=1)
+    out[window - 1 :] = [
+        math.fsum(w) if ok else sum(w)
+        for w, ok in zip(windows.tolist(), finite.tolist())
+    ]
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """滚动均值，与 RollingMean 一致"""
+    return rolling_sum(values, window) / window
+
+
+def rolling_variance(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    滚动总体方差，与 RollingVariance 一致
+
+    Returns:
+        (窗口均值, 窗口方差)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    mean = rolling_sum(values, window) / window
+    with np.errstate(over="ignore", invalid="ignore"):
+        variance = rolling_sum(values * values, window) / window - mean * mean
+    variance[variance < 0] = 0.0
+    return mean, variance
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    滚动总体标准差，与 RollingVariance.std 一致
+
+    开方按 Python 的 ** 0.5 逐个计算：np.sqrt / np.power 与 pow() 的舍入在少数输入上不同。
+    """
+    variance = rolling_variance(values, window)[1]
+    return np.array([v ** 0.5 for v in variance.tolist()], dtype=np.float64)
+
+
+def rolling_max(values: np.ndarray, window: int, min_periods: int | None = None) -> np.ndarray:
+    """滚动最大值，与 RollingMax 一致"""
+    series = pd.Series(np.asarray(values, dtype=np.float64))
+    return series.rolling(window, min_periods=min_periods or window).max().to_numpy()
+
+
+def rolling_min(values: np.ndarray, window: int, min_periods: int | None = None) -> np.ndarray:
+    """滚动最小值，与 RollingMin 一致"""
+    series = pd.Series(np.asarray(values, dtype=np.float64))
+    return series.rolling(window, min_periods=min_periods or window).min().to_numpy()
@@ -0,0 +1,109 @@
+"""
+趋势指标 - EMA、MACD
+
+EMA 以首个数据初始化：ema = alpha × x + (1 - alpha) × ema。
+递推本身是顺序依赖的，批量版本在抽取为 Python float 的列表上顺序计算，
+与逐个 update() 的结果逐位一致。
+"""
+
+import numpy as np
+
+
+def ema_alpha(period: int) -> float:
+    """EMA 平滑系数 2 / (N + 1)"""
+    return 2.0 / (period + 1)
+
+
+class EMA:
+    """指数移动平均（首个数据作为初始值）"""
+
+    def __init__(self, period: int | None = None, alpha: float | None = None):
+        if alpha is None:
+            if period is None or period < 1:
+                raise ValueError("需要指定 period (>= 1) 或 alpha")
+            alpha = ema_alpha(period)
+        self.period = period
+        self.alpha = alpha
+        self._value: float | None = None
+
+    def update(self, value: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value = self.alpha * value + (1 - self.alpha) * self._value
+        return self._value
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    @property
+    def value(self) -> float | None:
+        return self._value
+
+    def reset(self) -> None:
+        self._value = None
+
+
+class MACD:
+    """
+    MACD 指标
+
+    DIF = EMA(fast) - EMA(slow)，DEA = EMA(DIF, signal)，HIST = DIF - DEA。
+    首根 bar 时 DIF / DEA / HIST 均为 0。
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+        self.dif: float | None = None
+        self.dea: float | None = None
+        self.hist: float | None = None
+
+    def update(self, value: float) -> tuple[float, float, float]:
+        self.dif = self._fast.update(value) - self._slow.update(value)
+        self.dea = self._signal.update(self.dif)
+        self.hist = self.dif - self.dea
+        return self.dif, self.dea, self.hist
+
+    @property
+    def ready(self) -> bool:
+        return self.dif is not None
+
+    def reset(self) -> None:
+        self._fast.reset()
+        self._slow.reset()
+        self._signal.reset()
+        self.dif = None
+        self.dea = None
+        self.hist = None
+
+
+# =====================================================================
+# 批量版本
+# =====================================================================
+
+def ema(values: np.ndarray, period: int | None = None, alpha: float | None = None) -> np.ndarray:
+    """指数移动平均，与 EMA 逐个 update() 的结果一致"""
+    alpha = EMA(period, alpha).alpha
+    beta = 1 - alpha
+    out = np.asarray(values, dtype=np.float64).tolist()
+    # 递推顺序依赖，在 Python float 列表上原地计算（运算与 EMA.update 相同）
+    for i in range(1, len(out)):
+        out[i] = alpha * out[i] + beta * out[i - 1]
+    return np.array(out, dtype=np.float64)
+
+
+def macd(
+    values: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD，与 MACD 逐个 update() 的结果一致
+
+    Returns:
+        (DIF, DEA, HIST)
+    """
+    dif = ema(values, fast) - ema(values, slow)
+    dea = ema(dif, signal)
+    return dif, dea, dif - dea
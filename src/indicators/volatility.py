@@ -0,0 +1,144 @@
+"""
+波动率指标 - True Range、ATR
+
+ATR 支持两种平滑方式：
+  - simple: 最近 N 个 TR 的简单平均
+  - wilder: Wilder 平滑，atr = (前值 × (N - 1) + TR) / N，以前 N 个 TR 的简单平均为初值
+"""
+
+import numpy as np
+
+from src.indicators.rolling import RollingMean, rolling_mean
+
+
+SMOOTHING_METHODS = ("simple", "wilder")
+
+
+def _check_smoothing(smoothing: str) -> None:
+    if smoothing not in SMOOTHING_METHODS:
+        available = ", ".join(SMOOTHING_METHODS)
+        raise ValueError(f"未知平滑方式: '{smoothing}'。可用方式: {available}")
+
+
+class TrueRange:
+    """True Range = max(高 - 低, |高 - 昨收|, |低 - 昨收|)，首根 bar 无昨收时为 None"""
+
+    def __init__(self):
+        self._prev_close: float | None = None
+        self.value: float | None = None
+
+    def update(self, high: float, low: float, close: float) -> float | None:
+        if self._prev_close is None:
+            self.value = None
+        else:
+            prev_close = self._prev_close
+            self.value = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self._prev_close = close
+        return self.value
+
+    def reset(self) -> None:
+        self._prev_close = None
+        self.value = None
+
+
+class WilderAverage:
+    """Wilder 平滑均值：前 N 个数据取简单平均作为初值，之后 (前值 × (N - 1) + x) / N"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._seed = RollingMean(period)
+        self._value: float | None = None
+
+    def update(self, value: float) -> float | None:
+        if self._value is None:
+            self._value = self._seed.update(value)
+        else:
+            self._value = (self._value * (self.period - 1) + value) / self.period
+        return self._value
+
+    @property
+    def value(self) -> float | None:
+        return self._value
+
+    def reset(self) -> None:
+        self._seed.reset()
+        self._value = None
+
+
+class ATR:
+    """平均真实波幅（首根 bar 不产生 TR，需 period + 1 根 bar 才就绪）"""
+
+    def __init__(self, period: int = 14, smoothing: str = "wilder"):
+        _check_smoothing(smoothing)
+        self.period = period
+        self.smoothing = smoothing
+        self._tr = TrueRange()
+        self._avg = RollingMean(period) if smoothing == "simple" else WilderAverage(period)
+
+    def update(self, high: float, low: float, close: float) -> float | None:
+        tr = self._tr.update(high, low, close)
+        if tr is not None:
+            self._avg.update(tr)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self._avg.value is not None
+
+    @property
+    def value(self) -> float | None:
+        return self._avg.value
+
+    def reset(self) -> None:
+        self._tr.reset()
+        self._avg.reset()
+
+
+# =====================================================================
+# 批量版本
+# =====================================================================
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range 数组（首位为 NaN），与 TrueRange 一致"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    tr = np.full(len(close), np.nan)
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(
+            np.maximum(high[1:] - low[1:], np.abs(high[1:] - prev_close)),
+            np.abs(low[1:] - prev_close),
+        )
+    return tr
+
+
+def wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder 平滑均值，与 WilderAverage 一致（初值之后的递推为顺序计算）"""
+    values = np.asarray(values, dtype=np.float64)
+    out = rolling_mean(values, period)
+    if len(values) > period:
+        prev = float(out[period - 1])
+        tail = []
+        for value in values[period:].tolist():
+            prev = (prev * (period - 1) + value) / period
+            tail.append(prev)
+        out[period:] = tail
+    return out
+
+
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    smoothing: str = "wilder",
+) -> np.ndarray:
+    """ATR 数组，与 ATR 逐个 update() 的结果一致"""
+    _check_smoothing(smoothing)
+    tr = true_range(high, low, close)
+    out = np.full(len(tr), np.nan)
+    if len(tr) > 1:
+        average = rolling_mean if smoothing == "simple" else wilder_average
+        out[1:] = average(tr[1:], period)
+    return out
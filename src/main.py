@@ -23,6 +23,9 @@ def main():
     parser.add_argument(
         "--config", default="config.yaml", help="配置文件路径 (默认: config.yaml)"
     )
+    parser.add_argument(
+        "--profile", action="store_true", help="输出回测引擎分阶段耗时统计"
+    )
     args = parser.parse_args()
 
     # ===== 加载配置 =====
@@ -70,11 +73,14 @@ def main():
         initial_capital=engine_cfg["initial_capital"],
         slippage=engine_cfg["slippage"],
         commission_rate=engine_cfg["commission_rate"],
+        profile=args.profile,
     )
 
     # ===== 5. 运行回测 =====
     print(f"\n运行回测: {strategy.name}")
     result = engine.run(df)
+    if result.profile is not None:
+        print(f"\n===== 分阶段耗时 =====\n{result.profile.format()}")
 
     # ===== 6. 生成报告字符串 =====
     save_dir = output_cfg.get("save_dir", "results")
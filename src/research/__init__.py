@@ -2,5 +2,23 @@
 
 from src.research.batch_runner import BatchRunner
 from src.research.optimizer import ParameterOptimizer
+from src.research.parallel import SharedBars, SharedBarsSpec, attach_bars
+from src.research.result_cache import CachedResult, ResultCache, ResultCacheStats
+from src.research.search import ParamSpace, TPESampler
+from src.research.rotation import RotationBacktester, RotationResult, load_close_panel
 
-__all__ = ["BatchRunner", "ParameterOptimizer"]
+__all__ = [
+    "BatchRunner",
+    "ParameterOptimizer",
+    "SharedBars",
+    "SharedBarsSpec",
+    "attach_bars",
+    "CachedResult",
+    "ResultCache",
+    "ResultCacheStats",
+    "ParamSpace",
+    "TPESampler",
+    "RotationBacktester",
+    "RotationResult",
+    "load_close_panel",
+]
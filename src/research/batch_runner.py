@@ -3,24 +3,79 @@
 
 支持同时运行多个品种和多个策略组合的回测，
 汇总结果并按指标排序对比。
+设置 n_workers > 1 时按 (品种, 策略组) 拆分任务，分发到进程池并行执行。
+设置 result_cache 后，行情、策略参数与设置均未变的任务直接取回上次的指标，只回测有变化的组合。
+设置 capture_errors=True 后，出错的任务记为错误行（BatchRunner.errors），其余任务照常完成。
 """
 
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 from tqdm import tqdm
 
-from src.backtest.engine import BacktestEngine
+from src.backtest.engine import BacktestEngine, BacktestResult
+from src.backtest.multi import MultiStrategyEngine
 from src.backtest.metrics import total_return, sharpe_ratio, max_drawdown
 from src.config import create_strategy
 from src.data.loader import DataLoader
+from src.research.result_cache import ResultCache, backtest_settings, bars_fingerprint
 from src.risk.risk_manager import RiskManager
 from src.risk.position_sizer import PositionSizer, SizingMethod
 
 
+# 批量任务：(品种代码, [(策略序号, 策略配置), ...])
+BatchTask = tuple[str, list[tuple[int, dict]]]
+
+ERROR_COLUMNS = ["symbol", "strategy", "params", "error"]
+
+# 工作进程内的行情缓存容量（按品种数计）：同一进程先后处理同一品种的多个策略组时只加载一次
+WORKER_BARS_CACHE_SIZE = 4
+
+_worker_loader: DataLoader | None = None
+_worker_bars: OrderedDict[tuple[str, str, str], pd.DataFrame] = OrderedDict()
+
+
+def _init_worker(storage_dir: str) -> None:
+    """
+    工作进程初始化：每个进程持有自己的 DataLoader（SQLite 连接不跨进程共享）
+
+    行情经内存映射的 Arrow IPC 镜像加载，各进程处理同一品种时共用一份页缓存。
+    """
+    global _worker_loader
+    _worker_loader = DataLoader(storage_dir=storage_dir, use_mmap=True)
+    _worker_bars.clear()
+
+
+def _worker_run(runner: "BatchRunner", task: BatchTask, start_date: str, end_date: str) -> list[dict]:
+    """工作进程入口：行情经进程内 LRU 缓存加载后运行任务"""
+    symbol, indexed = task
+    key = (symbol, start_date, end_date)
+    df = _worker_bars.get(key)
+    if df is None:
+        try:
+            df = _worker_loader.load(symbol, start_date, end_date, readonly=True)
+        except Exception as e:
+            if not runner.capture_errors:
+                raise
+            return [BatchRunner._error_row(symbol, cfg, e) for _, cfg in indexed]
+        _worker_bars[key] = df
+        if len(_worker_bars) > WORKER_BARS_CACHE_SIZE:
+            _worker_bars.popitem(last=False)
+    else:
+        _worker_bars.move_to_end(key)
+    return runner._run_task(symbol, df, indexed)
+
+
 class BatchRunner:
     """
     批量回测器
 
     对 品种列表 × 策略列表 运行矩阵化回测，返回汇总 DataFrame。
+    默认任一任务出错（行情加载、策略构造或回测）即抛出异常；
+    设置 capture_errors=True 时出错的 (品种, 策略) 任务不中断整批回测，错误记录在 errors 中。
     """
 
     def __init__(
@@ -33,7 +88,12 @@ class BatchRunner:
         sizing_method: str = "fixed_fraction",
         risk_fraction: float = 0.95,
         storage_dir: str = "data",
+        n_workers: int | None = 1,
+        result_cache: ResultCache | None = None,
+        capture_errors: bool = False,
     ):
+        if n_workers is not None and n_workers < 1:
+            raise ValueError(f"n_workers 应 >= 1，当前为 {n_workers}")
         self.initial_capital = initial_capital
         self.slippage = slippage
         self.commission_rate = commission_rate
@@ -42,6 +102,11 @@ class BatchRunner:
         self.sizing_method = sizing_method
         self.risk_fraction = risk_fraction
         self.storage_dir = storage_dir
+        self.n_workers = n_workers  # 并行进程数：1 为单进程串行，None 为 CPU 核数
+        self.result_cache = result_cache  # 回测结果缓存（工作进程各自连接同一缓存目录）
+        self.capture_errors = capture_errors  # 出错的任务记为错误行而不抛出异常
+        # 最近一次 run() 中失败的任务：symbol, strategy, params, error（仅 capture_errors=True 时记录）
+        self.errors = pd.DataFrame(columns=ERROR_COLUMNS)
 
     def run(
         self,
@@ -63,54 +128,60 @@ class BatchRunner:
 
         Returns:
             汇总 DataFrame，含 symbol, strategy, total_return, sharpe_ratio, max_drawdown, trade_count
+            （行顺序与并行进程数无关）；capture_errors=True 时出错的任务不在其中，见 self.errors
+
+        Raises:
+            Exception: capture_errors=False（默认）时，任一任务的行情加载、策略构造或回测异常原样抛出
+                （并行模式下在主进程抛出，尚未开始的任务取消）
         """
-        loader = DataLoader(storage_dir=self.storage_dir)
-        results = []
-        total = len(symbols) * len(strategies)
-
-        with tqdm(total=total, desc="批量回测") as pbar:
-            for symbol in symbols:
-                df = loader.load(symbol, start_date, end_date)
-                if df.empty:
-                    pbar.update(len(strategies))
-                    continue
-
-                for strat_cfg in strategies:
-                    strategy = create_strategy(strat_cfg)
-
-                    risk_manager = RiskManager(
-                        stop_loss=self.stop_loss,
-                        take_profit=self.take_profit,
-                    )
-                    position_sizer = PositionSizer(
-                        method=SizingMethod(self.sizing_method),
-                        risk_fraction=self.risk_fraction,
-                    )
-
-                    engine = BacktestEngine(
-                        strategy=strategy,
-                        risk_manager=risk_manager,
-                        position_sizer=position_sizer,
-                        initial_capital=self.initial_capital,
-                        slippage=self.slippage,
-                        commission_rate=self.commission_rate,
-                    )
-
-                    result = engine.run(df)
-
-                    ret = total_return(result.equity_curve)
-                    sr = sharpe_ratio(result.daily_returns)
-                    mdd = max_drawdown(result.equity_curve)
-
-                    results.append({
-                        "symbol": symbol,
-                        "strategy": result.strategy_name,
-                        "total_return": round(ret, 4),
-                        "sharpe_ratio": round(sr, 4) if sr else 0.0,
-                        "max_drawdown": round(mdd, 4),
-                        "trade_count": len(result.trades),
-                    })
-                    pbar.update(1)
+        n_workers = self.n_workers or os.cpu_count() or 1
+        tasks = self._make_tasks(symbols, strategies, n_workers)
+        outputs: list[list[dict]] = [[] for _ in tasks]
+
+        with tqdm(total=len(symbols) * len(strategies), desc="批量回测") as pbar:
+            if n_workers == 1:
+                loader = DataLoader(storage_dir=self.storage_dir)
+                for i, (symbol, indexed) in enumerate(tasks):
+                    try:
+                        df = loader.load(symbol, start_date, end_date, readonly=True)
+                    except Exception as e:
+                        if not self.capture_errors:
+                            raise
+                        outputs[i] = [self._error_row(symbol, cfg, e) for _, cfg in indexed]
+                    else:
+                        outputs[i] = self._run_task(symbol, df, indexed)
+                    pbar.update(len(indexed))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=n_workers, initializer=_init_worker, initargs=(self.storage_dir,)
+                ) as executor:
+                    futures = {
+                        executor.submit(_worker_run, self, task, start_date, end_date): i
+                        for i, task in enumerate(tasks)
+                    }
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        symbol, indexed = tasks[i]
+                        try:
+                            outputs[i] = future.result()
+                        except Exception as e:
+                            if not self.capture_errors:
+                                for pending in futures:
+                                    pending.cancel()
+                                raise
+                            # 工作进程异常退出等无法在任务内捕获的错误
+                            outputs[i] = [self._error_row(symbol, cfg, e) for _, cfg in indexed]
+                        pbar.update(len(indexed))
+
+        # 按任务顺序（品种 → 策略）汇总，与执行完成的先后无关
+        rows = [row for output in outputs for row in output]
+        n_cached = sum(row.pop("cached", False) for row in rows)
+        if self.result_cache is not None:
+            print(f"[BatchRunner] 结果缓存命中 {n_cached}/{len(rows)}")
+        results = [row for row in rows if "error" not in row]
+        self.errors = pd.DataFrame([row for row in rows if "error" in row], columns=ERROR_COLUMNS)
+        if not self.errors.empty:
+            print(f"[BatchRunner] {len(self.errors)} 个任务失败，详见 BatchRunner.errors")
 
         if not results:
             return pd.DataFrame()
@@ -121,3 +192,155 @@ class BatchRunner:
         df_results.reset_index(drop=True, inplace=True)
 
         return df_results
+
+    @staticmethod
+    def _make_tasks(symbols: list[str], strategies: list[dict], n_workers: int) -> list[BatchTask]:
+        """
+        拆分任务：同一品种的策略默认归为一组，共享一次行情加载与遍历；
+        品种数不足以占满进程池时，再把每个品种的策略拆成多组
+        """
+        indexed = list(enumerate(strategies))
+        if not symbols or not indexed:
+            return []
+        groups = 1
+        if n_workers > 1:
+            groups = min(len(indexed), math.ceil(2 * n_workers / len(symbols)))
+        size = math.ceil(len(indexed) / groups)
+        return [
+            (symbol, indexed[k : k + size])
+            for symbol in symbols
+            for k in range(0, len(indexed), size)
+        ]
+
+    def _run_task(self, symbol: str, df: pd.DataFrame, indexed: list[tuple[int, dict]]) -> list[dict]:
+        """运行一个品种上的一组策略，返回按策略顺序排列的结果行（capture_errors=True 时出错的为错误行）"""
+        if df.empty:
+            return []
+
+        rows: list[dict | None] = [None] * len(indexed)
+        keys: list[str] = []
+        cached = [None] * len(indexed)
+        if self.result_cache is not None:
+            keys = self.result_keys(df, [cfg for _, cfg in indexed])
+            cached = self.result_cache.get_many(keys)
+
+        engines: list[tuple[int, BacktestEngine]] = []
+        for k, (_, strat_cfg) in enumerate(indexed):
+            try:
+                if cached[k] is not None:
+                    # 命中缓存：只需策略名称，无需回测
+                    name = create_strategy(strat_cfg).name
+                    rows[k] = {**self._metrics_row(symbol, name, cached[k].metrics), "cached": True}
+                else:
+                    engines.append((k, self._make_engine(strat_cfg)))
+            except Exception as e:
+                if not self.capture_errors:
+                    raise
+                rows[k] = self._error_row(symbol, strat_cfg, e)
+
+        # 同一品种的所有策略共享一次行情遍历（全部命中缓存时无需遍历）
+        results: list[BacktestResult | Exception] = []
+        try:
+            if engines:
+                results = MultiStrategyEngine([engine for _, engine in engines]).run(df)
+        except Exception:
+            if not self.capture_errors:
+                raise
+            # 共同遍历中途出错时逐个策略重跑，定位出错的任务
+            results = []
+            for _, engine in engines:
+                try:
+                    results.append(engine.run(df))
+                except Exception as e:
+                    results.append(e)
+
+        entries = []
+        for (k, _), result in zip(engines, results):
+            strat_cfg = indexed[k][1]
+            if isinstance(result, Exception):
+                rows[k] = self._error_row(symbol, strat_cfg, result)
+                continue
+            metrics = self._metrics(result)
+            rows[k] = self._metrics_row(symbol, result.strategy_name, metrics)
+            if self.result_cache is not None:
+                entries.append((
+                    keys[k], strat_cfg.get("name", ""), strat_cfg.get("params", {}) or {},
+                    metrics, result.equity_curve,
+                ))
+        if entries:
+            self.result_cache.put_many(entries)
+        return rows
+
+    def result_keys(self, df: pd.DataFrame, strategies: list[dict]) -> list[str]:
+        """
+        各策略配置在该行情上的结果缓存键
+
+        可用于 result_cache.get(key, with_equity=True) 取回净值曲线；
+        设置与 ParameterOptimizer 相同时，两者的缓存结果可以互相复用。
+        """
+        data_fingerprint = bars_fingerprint(df)
+        settings = backtest_settings(
+            self.initial_capital, self.slippage, self.commission_rate,
+            self.stop_loss, self.take_profit, self.sizing_method, self.risk_fraction,
+        )
+        return [
+            ResultCache.make_key(
+                data_fingerprint, strat_cfg.get("name", ""), strat_cfg.get("params", {}) or {}, settings
+            )
+            for strat_cfg in strategies
+        ]
+
+    def _make_engine(self, strat_cfg: dict) -> BacktestEngine:
+        strategy = create_strategy(strat_cfg)
+
+        risk_manager = RiskManager(
+            stop_loss=self.stop_loss,
+            take_profit=self.take_profit,
+        )
+        position_sizer = PositionSizer(
+            method=SizingMethod(self.sizing_method),
+            risk_fraction=self.risk_fraction,
+        )
+
+        return BacktestEngine(
+            strategy=strategy,
+            risk_manager=risk_manager,
+            position_sizer=position_sizer,
+            initial_capital=self.initial_capital,
+            slippage=self.slippage,
+            commission_rate=self.commission_rate,
+        )
+
+    @staticmethod
+    def _metrics(result: BacktestResult) -> dict:
+        """回测指标（与 ParameterOptimizer 的指标口径一致，可共享结果缓存）"""
+        ret = total_return(result.equity_curve)
+        sr = sharpe_ratio(result.daily_returns)
+        mdd = max_drawdown(result.equity_curve)
+
+        return {
+            "total_return": round(ret, 4),
+            "sharpe_ratio": round(sr, 4) if sr else 0.0,
+            "max_drawdown": round(mdd, 4),
+            "trade_count": len(result.trades),
+        }
+
+    @staticmethod
+    def _metrics_row(symbol: str, strategy_name: str, metrics: dict) -> dict:
+        return {
+            "symbol": symbol,
+            "strategy": strategy_name,
+            "total_return": metrics["total_return"],
+            "sharpe_ratio": metrics["sharpe_ratio"],
+            "max_drawdown": metrics["max_drawdown"],
+            "trade_count": metrics["trade_count"],
+        }
+
+    @staticmethod
+    def _error_row(symbol: str, strat_cfg: dict, error: Exception) -> dict:
+        return {
+            "symbol": symbol,
+            "strategy": strat_cfg.get("name", ""),
+            "params": str(strat_cfg.get("params", {}) or {}),
+            "error": f"{type(error).__name__}: {error}",
+        }
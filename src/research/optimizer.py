@@ -1,27 +1,100 @@
 """
 参数优化器 - Grid Search + Walk-forward 交叉验证
 
-支持对策略参数进行穷举搜索，并通过 Walk-forward 验证防止过拟合。
+支持对策略参数进行穷举搜索（或按预算随机 / 逐次减半 / TPE 采样），并通过 Walk-forward 验证防止过拟合。
+设置 n_workers > 1 时 Grid Search 将参数组合分块分发到进程池，行情经共享内存只发布一次。
 """
 
+import copy
 import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
 
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+from src.backtest.early_stop import EarlyStop
 from src.backtest.engine import BacktestEngine
-from src.backtest.metrics import total_return, sharpe_ratio, max_drawdown
-from src.config import create_strategy
+from src.backtest.vectorized import VectorizedBacktestEngine
+from src.backtest.metrics import total_return, sharpe_ratio, max_drawdown, grid_metrics
+from src.config import create_strategy, get_strategy_class
+from src.indicators import IndicatorCache
 from src.risk.risk_manager import RiskManager
+from src.research.parallel import SharedBars, SharedBarsSpec, attach_bars
+from src.research.result_cache import ResultCache, backtest_settings, bars_fingerprint
+from src.research.search import ParamSpace, TPESampler, default_budget, halving_rounds
 from src.risk.position_sizer import PositionSizer, SizingMethod
 
 
+# Grid Search 计算后端：
+#   event  - 逐组合运行事件驱动引擎
+#   tensor - 参数组合 × 时间 的整体数组计算（不支持批量信号的组合自动回退 event）
+GRID_BACKENDS = ("event", "tensor")
+
+# 参数搜索方式：grid 为全网格，其余见 src.research.search
+SEARCH_METHODS = ("grid", "random", "halving", "tpe")
+
+# TPE 开始建模前随机评估的组合数（占预算的比例与下限）
+TPE_STARTUP_FRACTION = 0.25
+TPE_MIN_STARTUP = 10
+
+# tensor 后端每批计算的组合数（控制净值矩阵内存占用）
+TENSOR_CHUNK_SIZE = 256
+
+# 并行 Grid Search 自动分块时每个进程平均分到的任务数（越多负载越均衡，调度开销越大）
+TASKS_PER_WORKER = 8
+
+# Grid Search 进度回调：(已完成组合数, 组合总数)
+ProgressCallback = Callable[[int, int], None]
+
+# 工作进程状态：共享内存行情、优化器副本与搜索配置，由进程池初始化函数设置
+_worker_state: dict = {}
+
+
+def _init_grid_worker(
+    spec: SharedBarsSpec, optimizer: "ParameterOptimizer", strategy_name: str, backend: str
+) -> None:
+    """工作进程初始化：挂载共享内存行情，建立进程内的指标缓存"""
+    shm, df = attach_bars(spec)
+    optimizer.indicator_cache = IndicatorCache()
+    _worker_state.update(shm=shm, df=df, optimizer=optimizer, strategy_name=strategy_name, backend=backend)
+
+
+def _walk_forward_fold(
+    optimizer: "ParameterOptimizer",
+    strategy_name: str,
+    param_space: dict[str, list],
+    fold: int,
+    train_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    backend: str,
+) -> dict | None:
+    """工作进程任务：运行 Walk-forward 的一折（折内 Grid Search 按分到的进程数并行）"""
+    optimizer.indicator_cache = IndicatorCache()
+    return optimizer._run_fold(strategy_name, param_space, fold, train_df, test_df, backend)
+
+
+def _grid_worker_run(param_sets: list[dict]) -> list[dict]:
+    """工作进程任务：计算一块参数组合的指标"""
+    optimizer = _worker_state["optimizer"]
+    return optimizer._run_chunk(
+        _worker_state["strategy_name"], param_sets, _worker_state["df"], _worker_state["backend"]
+    )
+
+
 class ParameterOptimizer:
     """
     参数优化器
 
     Grid Search：对参数空间做笛卡尔积遍历。
     Walk-forward：数据分段训练+测试，防止过拟合。
+    设置 early_stop 后，Grid Search 中触发终止条件的组合提前结束并排在结果末尾。
+    所有回测共用一个指标缓存，相同数据上的相同指标只计算一次（见 indicator_cache.stats()）；
+    并行时每个工作进程各自持有一个仅内存的指标缓存。
+    设置 result_cache 后，输入（行情、参数、设置、代码版本）未变的组合直接从磁盘取回指标。
     """
 
     def __init__(
@@ -35,7 +108,16 @@ class ParameterOptimizer:
         commission_rate: float = 0.0003,
         stop_loss: float = -0.05,
         take_profit: float = 0.10,
+        early_stop: EarlyStop | None = None,
+        indicator_cache: IndicatorCache | None = None,
+        n_workers: int | None = 1,
+        chunk_size: int | None = None,
+        result_cache: ResultCache | None = None,
     ):
+        if n_workers is not None and n_workers < 1:
+            raise ValueError(f"n_workers 应 >= 1，当前为 {n_workers}")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size 应 >= 1，当前为 {chunk_size}")
         self.n_splits = n_splits
         self.train_ratio = train_ratio
         self.target_metric = target_metric
@@ -45,12 +127,22 @@ class ParameterOptimizer:
         self.commission_rate = commission_rate
         self.stop_loss = stop_loss
         self.take_profit = take_profit
+        self.early_stop = early_stop  # Grid Search 剪枝条件（测试期回测不使用）
+        # 未指定时使用仅内存的缓存；需要落盘或跨优化器共享时传入自建的 IndicatorCache
+        self.indicator_cache = indicator_cache if indicator_cache is not None else IndicatorCache()
+        # 并行进程预算（Grid Search 组合并行与 Walk-forward 折并行共用）：1 为串行，None 为 CPU 核数
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size  # 并行时每个任务的组合数，None 为自动
+        # 回测结果缓存：输入未变的组合直接取回指标，不再回测
+        self.result_cache = result_cache
 
     def grid_search(
         self,
         strategy_name: str,
         param_space: dict[str, list],
         df: pd.DataFrame,
+        backend: str = "event",
+        progress: ProgressCallback | None = None,
     ) -> pd.DataFrame:
         """
         网格搜索参数优化
@@ -59,10 +151,16 @@ class ParameterOptimizer:
             strategy_name: 策略名称（如 "turtle"）
             param_space: 参数空间，如 {"entry_period": [10, 20, 30], "exit_period": [5, 10]}
             df: 行情 DataFrame
+            backend: 计算后端 "event" / "tensor"，两者结果一致
+            progress: 进度回调 progress(已完成组合数, 组合总数)
 
         Returns:
             按目标指标排序的参数组合结果 DataFrame
         """
+        if backend not in GRID_BACKENDS:
+            available = ", ".join(GRID_BACKENDS)
+            raise ValueError(f"未知计算后端: '{backend}'。可用后端: {available}")
+
         keys = list(param_space.keys())
         values = list(param_space.values())
         combinations = list(itertools.product(*values))
@@ -70,14 +168,91 @@ class ParameterOptimizer:
         if len(combinations) > self.max_combinations:
             print(
                 f"[Optimizer] 警告: 参数组合数 {len(combinations)} "
-                f"超过上限 {self.max_combinations}，仍将执行"
+                f"超过上限 {self.max_combinations}，仍将执行（可改用 search() 按预算采样）"
             )
 
+        param_sets = [dict(zip(keys, combo)) for combo in combinations]
+        all_metrics = self._with_result_cache(
+            strategy_name, param_sets, df, self.early_stop,
+            lambda pending: self._compute_metrics(strategy_name, pending, df, backend, progress),
+        )
+        return self._build_results(param_sets, all_metrics)
+
+    def search(
+        self,
+        strategy_name: str,
+        param_space: dict[str, list],
+        df: pd.DataFrame,
+        method: str = "random",
+        budget: int | None = None,
+        backend: str = "event",
+        seed: int | None = None,
+        eta: int = 3,
+        progress: ProgressCallback | None = None,
+    ) -> pd.DataFrame:
+        """
+        按预算采样的参数搜索，用少量回测逼近 Grid Search 的最优目标值
+
+        Args:
+            strategy_name: 策略名称
+            param_space: 参数空间（与 grid_search 相同）
+            df: 行情 DataFrame
+            method: 搜索方式 "grid" / "random" / "halving" / "tpe"
+            budget: 采样的参数组合数（halving 为首轮候选数），None 为全网格的 10%（至少 20 个）
+            backend: 计算后端（见 grid_search）
+            seed: 随机种子
+            eta: halving 每轮保留前 1/eta 的候选，行情长度乘以 eta
+            progress: 进度回调 progress(已回测次数, 计划回测次数)
+
+        Returns:
+            与 grid_search 结构相同、按目标指标排序的结果 DataFrame（halving 只含完整行情上回测的组合）；
+            attrs 记录 method、evaluations（回测次数）、full_evaluations（折合完整行情的回测次数）与 grid_size
+        """
+        if method not in SEARCH_METHODS:
+            available = ", ".join(SEARCH_METHODS)
+            raise ValueError(f"未知搜索方式: '{method}'。可用方式: {available}")
+        if backend not in GRID_BACKENDS:
+            available = ", ".join(GRID_BACKENDS)
+            raise ValueError(f"未知计算后端: '{backend}'。可用后端: {available}")
+
+        space = ParamSpace(param_space)
+        if method == "grid":
+            results = self.grid_search(strategy_name, param_space, df, backend, progress)
+            evaluations = full_evaluations = len(results)
+        else:
+            budget = min(budget or default_budget(space.size), space.size)
+            rng = np.random.default_rng(seed)
+            if method == "random":
+                flats = space.sample(budget, rng)
+                all_metrics = self._evaluate(strategy_name, space, flats, df, backend)
+                evaluations = full_evaluations = len(flats)
+                if progress is not None:
+                    progress(evaluations, budget)
+            elif method == "halving":
+                flats, all_metrics, evaluations, full_evaluations = self._successive_halving(
+                    strategy_name, space, df, backend, budget, eta, rng, progress
+                )
+            else:
+                flats, all_metrics = self._tpe(strategy_name, space, df, backend, budget, rng, progress)
+                evaluations = full_evaluations = len(flats)
+            results = self._build_results([space.decode(f) for f in flats], all_metrics)
+
+        results.attrs.update(
+            method=method,
+            evaluations=evaluations,
+            full_evaluations=full_evaluations,
+            grid_size=space.size,
+        )
+        print(
+            f"[Optimizer] {method} 搜索: 回测 {evaluations} 次 (折合完整行情 {full_evaluations:.1f} 次), "
+            f"全网格 {space.size} 个组合, 占 {full_evaluations / space.size:.1%}"
+        )
+        return results
+
+    def _build_results(self, param_sets: list[dict], all_metrics: list[dict]) -> pd.DataFrame:
+        """组装参数组合与指标，按目标指标排序"""
         results = []
-        for combo in tqdm(combinations, desc="Grid Search"):
-            params = dict(zip(keys, combo))
-            strat_cfg = {"name": strategy_name, "params": params}
-            metrics = self._run_single(strat_cfg, df)
+        for params, metrics in zip(param_sets, all_metrics):
             metrics["params"] = str(params)
             for k, v in params.items():
                 metrics[k] = v
@@ -85,9 +260,15 @@ class ParameterOptimizer:
 
         df_results = pd.DataFrame(results)
         ascending = self.target_metric == "max_drawdown"
-        df_results.sort_values(
-            self.target_metric, ascending=ascending, inplace=True
-        )
+        if self.early_stop is not None:
+            # 提前终止（被剪枝）的组合排在末尾
+            df_results.sort_values(
+                ["terminated", self.target_metric], ascending=[True, ascending], inplace=True
+            )
+        else:
+            df_results.sort_values(
+                self.target_metric, ascending=ascending, inplace=True
+            )
         df_results.reset_index(drop=True, inplace=True)
 
         return df_results
@@ -97,24 +278,62 @@ class ParameterOptimizer:
         strategy_name: str,
         param_space: dict[str, list],
         df: pd.DataFrame,
+        backend: str = "event",
     ) -> dict:
         """
         Walk-forward 交叉验证
 
+        各折相互独立，n_workers > 1 时并发执行：折数与进程预算中较小者作为折并发数，
+        每折再以 n_workers // 折并发数 个进程并行 Grid Search，总进程数不超过预算。
+
         Args:
             strategy_name: 策略名称
             param_space: 参数空间
             df: 完整行情 DataFrame
+            backend: 训练期 Grid Search 的计算后端（见 grid_search）
 
         Returns:
             包含各段训练/测试结果和过拟合评估的字典
         """
+        folds = self._fold_windows(df)
+        budget = self.n_workers or os.cpu_count() or 1
+        fold_workers = min(budget, len(folds))
+
+        if fold_workers <= 1:
+            fold_results = [
+                self._run_fold(strategy_name, param_space, fold, train_df, test_df, backend)
+                for fold, train_df, test_df in folds
+            ]
+        else:
+            # 各折并发执行，进程预算在折之间均分，余下的交给折内 Grid Search 并行
+            fold_optimizer = copy.copy(self)
+            fold_optimizer.indicator_cache = None
+            fold_optimizer.n_workers = max(1, budget // fold_workers)
+            with ProcessPoolExecutor(max_workers=fold_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _walk_forward_fold, fold_optimizer, strategy_name, param_space,
+                        fold, train_df, test_df, backend,
+                    )
+                    for fold, train_df, test_df in folds
+                ]
+                fold_results = [future.result() for future in futures]
+        fold_results = [row for row in fold_results if row is not None]
+
+        # 汇总
+        df_folds = pd.DataFrame(fold_results) if fold_results else pd.DataFrame()
+        summary = self._evaluate_overfitting(df_folds)
+        summary["folds"] = df_folds
+
+        return summary
+
+    def _fold_windows(self, df: pd.DataFrame) -> list[tuple[int, pd.DataFrame, pd.DataFrame]]:
+        """切分 Walk-forward 各折的 (折序号, 训练期, 测试期)，数据过少的折跳过"""
         n = len(df)
         split_size = n // self.n_splits
         train_size = int(split_size * self.train_ratio)
 
-        fold_results = []
-
+        folds = []
         for i in range(self.n_splits):
             start = i * split_size
             end = min(start + split_size, n)
@@ -126,43 +345,238 @@ class ParameterOptimizer:
 
             if len(train_df) < 20 or len(test_df) < 10:
                 continue
+            folds.append((i + 1, train_df, test_df))
+        return folds
 
-            # 训练期：Grid Search 找最优参数
-            print(f"\n[Walk-forward] Fold {i + 1}/{self.n_splits}")
-            train_results = self.grid_search(strategy_name, param_space, train_df)
+    def _run_fold(
+        self,
+        strategy_name: str,
+        param_space: dict[str, list],
+        fold: int,
+        train_df: pd.DataFrame,
+        test_df: pd.DataFrame,
+        backend: str,
+    ) -> dict | None:
+        """运行单折：训练期 Grid Search 选出最优参数，再在测试期验证"""
+        # 训练期：Grid Search 找最优参数
+        print(f"\n[Walk-forward] Fold {fold}/{self.n_splits}")
+        train_results = self.grid_search(strategy_name, param_space, train_df, backend)
+
+        if train_results.empty:
+            return None
+
+        best_row = train_results.iloc[0]
+
+        # 提取最优参数（按列取值，保留整数参数的类型；整行取值会被提升为浮点）
+        keys = list(param_space.keys())
+        best_params = train_results[keys].iloc[:1].to_dict("records")[0]
 
-            if train_results.empty:
-                continue
+        # 测试期：用最优参数验证
+        test_metrics = self._with_result_cache(
+            strategy_name, [best_params], test_df, None,
+            lambda pending: [self._run_single({"name": strategy_name, "params": pending[0]}, test_df)],
+        )[0]
+
+        return {
+            "fold": fold,
+            "best_params": str(best_params),
+            "train_return": best_row.get("total_return", 0),
+            "train_sharpe": best_row.get("sharpe_ratio", 0),
+            "test_return": test_metrics.get("total_return", 0),
+            "test_sharpe": test_metrics.get("sharpe_ratio", 0),
+        }
 
-            best_row = train_results.iloc[0]
+    def _evaluate(
+        self,
+        strategy_name: str,
+        space: ParamSpace,
+        flats: list[int],
+        df: pd.DataFrame,
+        backend: str,
+    ) -> list[dict]:
+        """回测一批组合（经结果缓存，按 n_workers 并行）"""
+        param_sets = [space.decode(f) for f in flats]
+        return self._with_result_cache(
+            strategy_name, param_sets, df, self.early_stop,
+            lambda pending: self._compute_metrics(strategy_name, pending, df, backend, None),
+        )
+
+    def _score(self, metrics: dict) -> float:
+        """搜索用的得分（越高越好，与 grid_search 的排序方向一致）；被剪枝或指标无效的为 -inf"""
+        value = metrics.get(self.target_metric, np.nan)
+        if metrics.get("terminated") or value is None or np.isnan(value):
+            return -np.inf
+        return -value if self.target_metric == "max_drawdown" else value
+
+    def _successive_halving(
+        self,
+        strategy_name: str,
+        space: ParamSpace,
+        df: pd.DataFrame,
+        backend: str,
+        budget: int,
+        eta: int,
+        rng: np.random.Generator,
+        progress: ProgressCallback | None,
+    ) -> tuple[list[int], list[dict], int, float]:
+        """
+        逐次减半：各轮在行情前段回测候选，保留得分前 1/eta 进入下一轮
 
-            # 提取最优参数
-            keys = list(param_space.keys())
-            best_params = {k: best_row[k] for k in keys}
+        Returns:
+            (末轮组合, 末轮指标, 回测次数, 折合完整行情的回测次数)
+        """
+        flats = space.sample(budget, rng)
+        schedule = halving_rounds(len(flats), len(df), eta)
+        total = sum(n_keep for n_keep, _ in schedule)
+        evaluations, full_evaluations = 0, 0.0
+        all_metrics: list[dict] = []
+        for n_keep, bars in schedule:
+            flats = flats[:n_keep]
+            all_metrics = self._evaluate(strategy_name, space, flats, df.iloc[:bars], backend)
+            evaluations += len(flats)
+            full_evaluations += len(flats) * bars / len(df)
+            order = sorted(range(len(flats)), key=lambda i: -self._score(all_metrics[i]))
+            flats = [flats[i] for i in order]
+            all_metrics = [all_metrics[i] for i in order]
+            if progress is not None:
+                progress(evaluations, total)
+        return flats, all_metrics, evaluations, full_evaluations
+
+    def _tpe(
+        self,
+        strategy_name: str,
+        space: ParamSpace,
+        df: pd.DataFrame,
+        backend: str,
+        budget: int,
+        rng: np.random.Generator,
+        progress: ProgressCallback | None,
+    ) -> tuple[list[int], list[dict]]:
+        """
+        TPE：先随机评估一批组合，之后每轮按已有结果提出一批新组合
 
-            # 测试期：用最优参数验证
-            strat_cfg = {"name": strategy_name, "params": best_params}
-            test_metrics = self._run_single(strat_cfg, test_df)
+        每轮组合数等于并行进程数，使各进程同时有任务可做。
+        """
+        sampler = TPESampler(space)
+        batch_size = self.n_workers or os.cpu_count() or 1
+        n_startup = min(budget, max(TPE_MIN_STARTUP, math.ceil(budget * TPE_STARTUP_FRACTION)))
+
+        flats = space.sample(n_startup, rng)
+        all_metrics = self._evaluate(strategy_name, space, flats, df, backend)
+        observed = {f: self._score(m) for f, m in zip(flats, all_metrics)}
+        if progress is not None:
+            progress(len(flats), budget)
+
+        while len(flats) < budget:
+            batch = sampler.suggest(observed, min(batch_size, budget - len(flats)), rng)
+            if not batch:
+                break
+            batch_metrics = self._evaluate(strategy_name, space, batch, df, backend)
+            flats.extend(batch)
+            all_metrics.extend(batch_metrics)
+            observed.update((f, self._score(m)) for f, m in zip(batch, batch_metrics))
+            if progress is not None:
+                progress(len(flats), budget)
+        return flats, all_metrics
+
+    def result_key(
+        self,
+        strategy_name: str,
+        params: dict,
+        df: pd.DataFrame,
+        early_stop: EarlyStop | None = None,
+    ) -> str:
+        """
+        组合在结果缓存中的键
 
-            fold_results.append({
-                "fold": i + 1,
-                "best_params": str(best_params),
-                "train_return": best_row.get("total_return", 0),
-                "train_sharpe": best_row.get("sharpe_ratio", 0),
-                "test_return": test_metrics.get("total_return", 0),
-                "test_sharpe": test_metrics.get("sharpe_ratio", 0),
-            })
+        可用于 result_cache.get(key, with_equity=True) 取回该组合的净值曲线；
+        Grid Search 的键使用 self.early_stop，Walk-forward 测试期不使用提前终止。
+        """
+        return self._result_keys(strategy_name, [params], df, early_stop)[0]
 
-        # 汇总
-        df_folds = pd.DataFrame(fold_results) if fold_results else pd.DataFrame()
-        summary = self._evaluate_overfitting(df_folds)
-        summary["folds"] = df_folds
+    def _result_keys(
+        self,
+        strategy_name: str,
+        param_sets: list[dict],
+        df: pd.DataFrame,
+        early_stop: EarlyStop | None,
+    ) -> list[str]:
+        data_fingerprint = bars_fingerprint(df)
+        settings = backtest_settings(
+            self.initial_capital, self.slippage, self.commission_rate,
+            self.stop_loss, self.take_profit, early_stop=early_stop,
+        )
+        return [
+            ResultCache.make_key(data_fingerprint, strategy_name, params, settings)
+            for params in param_sets
+        ]
 
-        return summary
+    def _with_result_cache(
+        self,
+        strategy_name: str,
+        param_sets: list[dict],
+        df: pd.DataFrame,
+        early_stop: EarlyStop | None,
+        compute: Callable[[list[dict]], list[dict]],
+    ) -> list[dict]:
+        """
+        经结果缓存计算各组合指标：命中的直接取回，未命中的交给 compute 计算后写入缓存
 
-    def _run_single(self, strat_cfg: dict, df: pd.DataFrame) -> dict:
+        compute 接收未命中的参数组合列表，返回等长的指标列表。
+        """
+        if self.result_cache is None:
+            return compute(param_sets)
+
+        keys = self._result_keys(strategy_name, param_sets, df, early_stop)
+        cached = self.result_cache.get_many(keys)
+        misses = [i for i, hit in enumerate(cached) if hit is None]
+        all_metrics = [hit.metrics if hit is not None else None for hit in cached]
+        if misses:
+            computed = compute([param_sets[i] for i in misses])
+            entries = []
+            for i, metrics in zip(misses, computed):
+                equity = metrics.pop("equity", None)
+                entries.append((keys[i], strategy_name, param_sets[i], metrics, equity))
+                all_metrics[i] = metrics
+            self.result_cache.put_many(entries)
+        if len(param_sets) > 1:
+            print(f"[Optimizer] 结果缓存命中 {len(param_sets) - len(misses)}/{len(param_sets)}")
+        return all_metrics
+
+    def _compute_metrics(
+        self,
+        strategy_name: str,
+        param_sets: list[dict],
+        df: pd.DataFrame,
+        backend: str,
+        progress: ProgressCallback | None,
+    ) -> list[dict]:
+        """按计算后端与进程数计算各组合指标"""
+        n_workers = self.n_workers or os.cpu_count() or 1
+        if n_workers > 1 and len(param_sets) > 1:
+            return self._run_parallel(strategy_name, param_sets, df, backend, n_workers, progress)
+        if backend == "tensor":
+            return self._run_tensor(strategy_name, param_sets, df, progress)
+
+        all_metrics = []
+        for params in tqdm(param_sets, desc="Grid Search"):
+            strat_cfg = {"name": strategy_name, "params": params}
+            all_metrics.append(self._run_single(strat_cfg, df, self.early_stop))
+            if progress is not None:
+                progress(len(all_metrics), len(param_sets))
+        return all_metrics
+
+    @property
+    def _keep_equity(self) -> bool:
+        """结果缓存需要净值曲线时，指标中附带 equity 供写入缓存"""
+        return self.result_cache is not None and self.result_cache.store_equity
+
+    def _run_single(
+        self, strat_cfg: dict, df: pd.DataFrame, early_stop: EarlyStop | None = None
+    ) -> dict:
         """运行单次回测并返回指标"""
         strategy = create_strategy(strat_cfg)
+        strategy.indicator_cache = self.indicator_cache
         risk_manager = RiskManager(
             stop_loss=self.stop_loss,
             take_profit=self.take_profit,
@@ -179,6 +593,7 @@ class ParameterOptimizer:
             initial_capital=self.initial_capital,
             slippage=self.slippage,
             commission_rate=self.commission_rate,
+            early_stop=early_stop,
         )
 
         result = engine.run(df)
@@ -186,12 +601,170 @@ class ParameterOptimizer:
         sr = sharpe_ratio(result.daily_returns)
         mdd = max_drawdown(result.equity_curve)
 
-        return {
+        row = self._metrics_row(
+            ret, sr, mdd, len(result.trades), result.terminated if early_stop else None
+        )
+        if self._keep_equity:
+            row["equity"] = result.equity_curve
+        return row
+
+    @staticmethod
+    def _metrics_row(ret, sr, mdd, trade_count: int, terminated: bool | None) -> dict:
+        """组装单个组合的指标（terminated 为 None 表示未启用提前终止）"""
+        row = {
             "total_return": round(ret, 4),
             "sharpe_ratio": round(sr, 4) if sr else 0.0,
             "max_drawdown": round(mdd, 4),
-            "trade_count": len(result.trades),
+            "trade_count": trade_count,
         }
+        if terminated is not None:
+            row["terminated"] = terminated
+        return row
+
+    def _run_parallel(
+        self,
+        strategy_name: str,
+        param_sets: list[dict],
+        df: pd.DataFrame,
+        backend: str,
+        n_workers: int,
+        progress: ProgressCallback | None,
+    ) -> list[dict]:
+        """
+        并行计算：参数组合分块提交到进程池，按块完成顺序汇报进度、按原顺序汇总结果
+
+        行情只写入共享内存一次，工作进程启动时挂载，任务只传递参数组合与指标。
+        """
+        total = len(param_sets)
+        if backend == "tensor":
+            # tensor 批次的耗时主要在逐 bar 推进，与批内组合数关系不大：批次尽量宽，够每个进程分到即可
+            size = min(self.chunk_size or math.ceil(total / n_workers), TENSOR_CHUNK_SIZE)
+        else:
+            size = self.chunk_size or max(1, math.ceil(total / (n_workers * TASKS_PER_WORKER)))
+        chunks = [param_sets[start : start + size] for start in range(0, total, size)]
+
+        # 工作进程使用不带缓存内容的优化器副本（各进程自建指标缓存）
+        worker_optimizer = copy.copy(self)
+        worker_optimizer.indicator_cache = None
+        worker_optimizer.n_workers = 1
+
+        chunk_metrics: list[list[dict]] = [[] for _ in chunks]
+        done = 0
+        with (
+            SharedBars(df) as shared,
+            ProcessPoolExecutor(
+                max_workers=min(n_workers, len(chunks)),
+                initializer=_init_grid_worker,
+                initargs=(shared.spec, worker_optimizer, strategy_name, backend),
+            ) as executor,
+            tqdm(total=total, desc=f"Grid Search ({backend} × {n_workers})") as pbar,
+        ):
+            futures = {executor.submit(_grid_worker_run, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                i = futures[future]
+                chunk_metrics[i] = future.result()
+                done += len(chunks[i])
+                pbar.update(len(chunks[i]))
+                if progress is not None:
+                    progress(done, total)
+
+        return [metrics for chunk in chunk_metrics for metrics in chunk]
+
+    def _run_chunk(
+        self, strategy_name: str, param_sets: list[dict], df: pd.DataFrame, backend: str
+    ) -> list[dict]:
+        """计算一块参数组合的指标（并行工作进程内调用）"""
+        if backend == "tensor":
+            return self._tensor_chunk(strategy_name, self._vectorized_engine(), param_sets, df)
+        return [
+            self._run_single({"name": strategy_name, "params": params}, df, self.early_stop)
+            for params in param_sets
+        ]
+
+    def _vectorized_engine(self) -> VectorizedBacktestEngine:
+        return VectorizedBacktestEngine(
+            risk_manager=RiskManager(
+                stop_loss=self.stop_loss,
+                take_profit=self.take_profit,
+            ),
+            position_sizer=PositionSizer(
+                method=SizingMethod("fixed_fraction"),
+                risk_fraction=0.95,
+            ),
+            initial_capital=self.initial_capital,
+            slippage=self.slippage,
+            commission_rate=self.commission_rate,
+        )
+
+    def _run_tensor(
+        self,
+        strategy_name: str,
+        param_sets: list[dict],
+        df: pd.DataFrame,
+        progress: ProgressCallback | None = None,
+    ) -> list[dict]:
+        """
+        tensor 后端：按批生成信号矩阵，整体回测并计算指标
+
+        策略不支持批量信号（或信号依赖成交回报）的组合回退到 _run_single。
+        """
+        engine = self._vectorized_engine()
+
+        all_metrics: list[dict] = []
+        with tqdm(total=len(param_sets), desc="Grid Search (tensor)") as pbar:
+            for start in range(0, len(param_sets), TENSOR_CHUNK_SIZE):
+                chunk = param_sets[start : start + TENSOR_CHUNK_SIZE]
+                all_metrics.extend(self._tensor_chunk(strategy_name, engine, chunk, df))
+                pbar.update(len(chunk))
+                if progress is not None:
+                    progress(len(all_metrics), len(param_sets))
+
+        return all_metrics
+
+    def _tensor_chunk(
+        self,
+        strategy_name: str,
+        engine: VectorizedBacktestEngine,
+        chunk: list[dict],
+        df: pd.DataFrame,
+    ) -> list[dict]:
+        """tensor 后端计算一批组合（不超过 TENSOR_CHUNK_SIZE）"""
+        strategy_class = get_strategy_class(strategy_name)
+        signal_grid = strategy_class.generate_signal_grid(df, chunk, self.indicator_cache)
+
+        rows = [i for i, codes in enumerate(signal_grid) if codes is not None]
+        chunk_metrics: list[dict | None] = [None] * len(chunk)
+        if rows and len(df) > 0:
+            matrix = np.stack([signal_grid[i] for i in rows])
+            equity, trade_count, stop_bar = engine.run_grid(df, matrix, self.early_stop)
+            metrics = grid_metrics(equity)
+            for j, i in enumerate(rows):
+                if stop_bar[j] >= 0:
+                    # 提前终止：只对已处理的 bar 计算指标
+                    curve = pd.Series(equity[j, : stop_bar[j] + 1])
+                    ret = total_return(curve)
+                    sr = sharpe_ratio(curve.pct_change().fillna(0))
+                    mdd = max_drawdown(curve)
+                else:
+                    # 逐项取 np.float64 再 round，与 _run_single 的取整方式一致
+                    ret = metrics["total_return"][j]
+                    sr = metrics["sharpe_ratio"][j]
+                    mdd = metrics["max_drawdown"][j]
+                chunk_metrics[i] = self._metrics_row(
+                    ret, sr, mdd, int(trade_count[j]),
+                    bool(stop_bar[j] >= 0) if self.early_stop else None,
+                )
+                if self._keep_equity:
+                    end = stop_bar[j] + 1 if stop_bar[j] >= 0 else len(df)
+                    chunk_metrics[i]["equity"] = pd.Series(
+                        equity[j, :end], index=df.index[:end], name="equity"
+                    )
+
+        for i, params in enumerate(chunk):
+            if chunk_metrics[i] is None:
+                strat_cfg = {"name": strategy_name, "params": params}
+                chunk_metrics[i] = self._run_single(strat_cfg, df, self.early_stop)
+        return chunk_metrics
 
     @staticmethod
     def _evaluate_overfitting(df_folds: pd.DataFrame) -> dict:
@@ -0,0 +1,97 @@
+"""
+并行计算辅助 - 共享内存行情
+
+SharedBars 将 OHLCV 数组与日期索引一次性写入 multiprocessing.shared_memory，
+工作进程按名称挂载后以零拷贝视图重建 DataFrame，任务之间不再重复序列化行情。
+
+用法:
+    with SharedBars(df) as shared:
+        with ProcessPoolExecutor(initializer=init, initargs=(shared.spec,)) as executor:
+            ...
+    # 工作进程内
+    shm, df = attach_bars(spec)   # 使用期间须持有 shm 引用
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+# 发布到共享内存的行情列（回测引擎与策略只读取这些列）
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class SharedBarsSpec:
+    """共享内存行情的描述信息（可 pickle，传给工作进程）"""
+    name: str                  # 共享内存块名称
+    n_rows: int
+    columns: tuple[str, ...]
+    index_dtype: str           # 日期索引的 dtype（按 8 字节原样存放）
+    index_name: str | None
+
+
+class SharedBars:
+    """
+    共享内存行情发布者
+
+    内存布局为 (1 + 列数) × 行数 的 float64 矩阵：第 0 行为按位存放的索引，其后各行依次为行情列。
+    由创建方负责释放（close() 或 with 语句退出时）。
+    """
+
+    def __init__(self, data: pd.DataFrame, columns: tuple[str, ...] = BAR_COLUMNS):
+        missing = [c for c in columns if c not in data.columns]
+        if missing:
+            raise ValueError(f"行情缺少列: {', '.join(missing)}")
+        index = data.index.to_numpy()
+        if index.dtype.itemsize != 8 or index.dtype.kind not in "iufM":
+            raise ValueError(f"不支持的索引类型: {index.dtype}（需为 8 字节数值或日期）")
+
+        n = len(data)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(8 * n * (len(columns) + 1), 1))
+        block = np.ndarray((len(columns) + 1, n), dtype=np.float64, buffer=self._shm.buf)
+        block[0] = index.view(np.float64)
+        for k, column in enumerate(columns, start=1):
+            block[k] = data[column].to_numpy(dtype=np.float64)
+
+        self.spec = SharedBarsSpec(
+            name=self._shm.name,
+            n_rows=n,
+            columns=tuple(columns),
+            index_dtype=index.dtype.str,
+            index_name=data.index.name,
+        )
+
+    def close(self) -> None:
+        """关闭并释放共享内存块"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "SharedBars":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_bars(spec: SharedBarsSpec) -> tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """
+    在工作进程中挂载共享内存行情
+
+    返回的 DataFrame 各列为共享内存上的只读视图，调用方须持有返回的 SharedMemory
+    直到不再使用 DataFrame。
+    """
+    shm = shared_memory.SharedMemory(name=spec.name)
+    block = np.ndarray((len(spec.columns) + 1, spec.n_rows), dtype=np.float64, buffer=shm.buf)
+    block.flags.writeable = False
+    index = pd.Index(block[0].view(np.dtype(spec.index_dtype)), name=spec.index_name)
+    data = pd.DataFrame(
+        {column: block[k] for k, column in enumerate(spec.columns, start=1)},
+        index=index,
+        copy=False,
+    )
+    return shm, data
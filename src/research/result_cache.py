@@ -0,0 +1,401 @@
+"""
+回测结果缓存 - 按输入内容寻址的磁盘缓存
+
+参数扫描与夜间批量回测重跑时，绝大部分组合的输入与上次完全相同。
+ResultCache 以输入内容的哈希为键持久化回测指标（可选连同净值曲线），命中时无需重新回测：
+  - 键 = 行情指纹 + 策略名 + 参数 + 风控/仓位/成本设置 + 代码版本
+  - 代码版本为回测相关源码的内容哈希，引擎、策略、指标等代码改动后旧结果自然失效
+  - SQLite 记录索引与指标，净值曲线存为 Parquet；总占用超过 max_bytes 时按最近访问时间淘汰
+  - 多个进程可同时读写同一缓存目录（各进程各自打开 SQLite 连接）
+
+命令行管理见 src.research.result_cache_cli。
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, is_dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.early_stop import EarlyStop
+from src.research.parallel import BAR_COLUMNS
+
+
+# 缓存格式或指标口径变化时递增，使旧结果全部失效
+RESULT_CACHE_VERSION = 1
+
+# 参与代码版本计算的源码（相对 src/）：改动其中任一文件，缓存键随之变化
+CODE_VERSION_SOURCES = ("config.py", "backtest", "strategy", "risk", "indicators", "research")
+
+# 单次 SQL 查询携带的键数上限（SQLite 变量个数限制）
+_QUERY_BATCH = 500
+
+
+@functools.cache
+def code_version() -> str:
+    """回测相关源码的内容哈希（进程内只计算一次）"""
+    src_dir = Path(__file__).resolve().parent.parent
+    paths = []
+    for name in CODE_VERSION_SOURCES:
+        path = src_dir / name
+        paths.extend(sorted(path.rglob("*.py")) if path.is_dir() else [path])
+
+    digest = hashlib.blake2b(f"v{RESULT_CACHE_VERSION}".encode(), digest_size=8)
+    for path in paths:
+        digest.update(path.relative_to(src_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def bars_fingerprint(data: pd.DataFrame) -> str:
+    """行情内容指纹：日期索引与 OHLCV 列共同决定"""
+    columns = [c for c in BAR_COLUMNS if c in data.columns]
+    digest = hashlib.blake2b(",".join(columns).encode(), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(data.index, index=False).to_numpy().data)
+    for column in columns:
+        digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=np.float64)).data)
+    return digest.hexdigest()
+
+
+def backtest_settings(
+    initial_capital: float,
+    slippage: float,
+    commission_rate: float,
+    stop_loss: float,
+    take_profit: float,
+    sizing_method: str = "fixed_fraction",
+    risk_fraction: float = 0.95,
+    early_stop: EarlyStop | None = None,
+) -> dict:
+    """
+    影响回测结果的设置（参与缓存键计算）
+
+    ParameterOptimizer 与 BatchRunner 使用同一口径，设置相同时两者可共享缓存结果。
+    """
+    return {
+        "initial_capital": initial_capital,
+        "slippage": slippage,
+        "commission_rate": commission_rate,
+        "stop_loss": stop_loss,
+        "take_profit": take_profit,
+        "sizing_method": sizing_method,
+        "risk_fraction": risk_fraction,
+        "early_stop": early_stop,
+    }
+
+
+def _to_json(value):
+    """json.dumps 的 default：numpy 标量转为 Python 值，dataclass 转为字典"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
+def _dumps(value, sort_keys: bool = True) -> str:
+    return json.dumps(value, sort_keys=sort_keys, ensure_ascii=False, default=_to_json)
+
+
+@dataclass
+class CachedResult:
+    """缓存命中的回测结果"""
+    metrics: dict
+    equity: pd.Series | None = None   # 仅在写入时保存了净值曲线且读取时要求时提供
+
+
+@dataclass
+class ResultCacheStats:
+    """结果缓存命中统计"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def format(self) -> str:
+        return (
+            f"结果缓存: 请求 {self.requests}, 命中率 {self.hit_rate:.1%} "
+            f"(命中 {self.hits} / 未命中 {self.misses}), "
+            f"写入 {self.writes}, 淘汰 {self.evictions}"
+        )
+
+
+class ResultCache:
+    """
+    回测结果磁盘缓存
+
+    用法:
+        cache = ResultCache("data/result_cache", max_bytes=512 * 1024 * 1024)
+        ParameterOptimizer(result_cache=cache).grid_search("turtle", param_space, df)
+        BatchRunner(result_cache=cache).run(symbols, strategies, start, end)
+        print(cache.stats().format())
+
+    stats() 为本进程内的统计；跨进程、跨运行的累计命中率见 summary() 或命令行 stats。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = "data/result_cache",
+        max_bytes: int = 1024 * 1024 * 1024,
+        store_equity: bool = False,
+    ):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes 应 > 0，当前为 {max_bytes}")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.store_equity = store_equity  # 是否连同净值曲线一起缓存
+        self.equity_dir = self.cache_dir / "equity"
+        self.db_path = self.cache_dir / "results.db"
+        self.equity_dir.mkdir(parents=True, exist_ok=True)
+        self._conn: sqlite3.Connection | None = None
+        self._stats = ResultCacheStats()
+
+    @staticmethod
+    def make_key(data_fingerprint: str, strategy_name: str, params: dict, settings: dict) -> str:
+        """缓存键：行情指纹 + 策略名 + 参数 + 回测设置 + 代码版本"""
+        raw = _dumps([data_fingerprint, strategy_name, params, settings, code_version()])
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str, with_equity: bool = False) -> CachedResult | None:
+        """读取单个结果，未命中返回 None"""
+        return self.get_many([key], with_equity)[0]
+
+    def get_many(self, keys: list[str], with_equity: bool = False) -> list[CachedResult | None]:
+        """批量读取结果（与 keys 一一对应，未命中为 None），命中的条目刷新访问时间"""
+        found: dict[str, tuple[str, int]] = {}
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start : start + _QUERY_BATCH]
+            rows = self._connection.execute(
+                f"SELECT key, metrics, has_equity FROM results WHERE key IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            found.update((key, (metrics, has_equity)) for key, metrics, has_equity in rows)
+
+        hits = sum(key in found for key in keys)
+        with self._connection as conn:
+            conn.executemany(
+                "UPDATE results SET accessed_at = ?, hits = hits + 1 WHERE key = ?",
+                [(time.time(), key) for key in found],
+            )
+            self._count(conn, hits=hits, misses=len(keys) - hits)
+        self._stats.hits += hits
+        self._stats.misses += len(keys) - hits
+
+        results: list[CachedResult | None] = []
+        for key in keys:
+            if key not in found:
+                results.append(None)
+                continue
+            metrics, has_equity = found[key]
+            equity = self._load_equity(key) if with_equity and has_equity else None
+            results.append(CachedResult(json.loads(metrics), equity))
+        return results
+
+    def put(
+        self,
+        key: str,
+        metrics: dict,
+        strategy_name: str = "",
+        params: dict | None = None,
+        equity: pd.Series | None = None,
+    ) -> None:
+        """写入单个结果"""
+        self.put_many([(key, strategy_name, params or {}, metrics, equity)])
+
+    def put_many(self, entries: list[tuple[str, str, dict, dict, pd.Series | None]]) -> None:
+        """
+        批量写入结果，写入后超出容量上限时淘汰最久未访问的条目
+
+        Args:
+            entries: [(键, 策略名, 参数, 指标, 净值曲线或 None), ...]；
+                     store_equity 为 False 时净值曲线被忽略
+        """
+        if not entries:
+            return
+        now = time.time()
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for key, strategy_name, params, metrics, equity in entries:
+            metrics_json = _dumps(metrics, sort_keys=False)  # 保持指标列顺序
+            size = len(metrics_json)
+            has_equity = self.store_equity and equity is not None
+            if has_equity:
+                size += self._save_equity(key, equity)
+            rows.append((key, strategy_name, _dumps(params), metrics_json, size, int(has_equity), created_at, now))
+
+        with self._connection as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO results
+                    (key, strategy, params, metrics, size, has_equity, created_at, accessed_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                rows,
+            )
+            self._count(conn, writes=len(rows))
+        self._stats.writes += len(rows)
+        self._evict()
+
+    def stats(self) -> ResultCacheStats:
+        """本进程内的统计快照"""
+        return replace(self._stats)
+
+    def summary(self) -> dict:
+        """缓存整体概况：条目数、占用字节数与累计命中统计（跨进程、跨运行）"""
+        entries, total = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        counters = dict(self._connection.execute("SELECT name, value FROM counters").fetchall())
+        lifetime = ResultCacheStats(
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            writes=counters.get("writes", 0),
+            evictions=counters.get("evictions", 0),
+        )
+        return {"entries": entries, "bytes": total, "max_bytes": self.max_bytes, "lifetime": lifetime}
+
+    def entries(self, strategy_name: str | None = None, limit: int | None = None) -> pd.DataFrame:
+        """按最近访问时间倒序列出缓存条目（不含净值曲线）"""
+        query = "SELECT key, strategy, params, metrics, size, has_equity, hits, created_at, accessed_at FROM results"
+        args: list = []
+        if strategy_name is not None:
+            query += " WHERE strategy = ?"
+            args.append(strategy_name)
+        query += " ORDER BY accessed_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+        df = pd.read_sql_query(query, self._connection, params=args)
+        df["accessed_at"] = pd.to_datetime(df["accessed_at"], unit="s").dt.strftime("%Y-%m-%d %H:%M:%S")
+        df["has_equity"] = df["has_equity"].astype(bool)
+        return df
+
+    def clear(self, strategy_name: str | None = None) -> int:
+        """删除全部（或指定策略的）条目，返回删除条数"""
+        query = "SELECT key, has_equity FROM results"
+        args: tuple = ()
+        if strategy_name is not None:
+            query += " WHERE strategy = ?"
+            args = (strategy_name,)
+        rows = self._connection.execute(query, args).fetchall()
+        self._delete(rows)
+        if strategy_name is None:
+            with self._connection as conn:
+                conn.execute("DELETE FROM counters")
+        return len(rows)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __getstate__(self) -> dict:
+        # 传给工作进程时不携带 SQLite 连接与本进程统计，进程内首次使用时重新连接
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_stats"] = ResultCacheStats()
+        return state
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, timeout=60)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._init_db()
+        return self._conn
+
+    def _init_db(self) -> None:
+        """创建结果表与计数表（如不存在）"""
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key         TEXT PRIMARY KEY,
+                strategy    TEXT,
+                params      TEXT,
+                metrics     TEXT,
+                size        INTEGER,
+                has_equity  INTEGER,
+                created_at  TEXT,
+                accessed_at REAL,
+                hits        INTEGER DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                name  TEXT PRIMARY KEY,
+                value INTEGER
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, **deltas: int) -> None:
+        """累加持久化计数（在调用方的事务内执行）"""
+        conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [(name, delta) for name, delta in deltas.items() if delta],
+        )
+
+    def _equity_path(self, key: str) -> Path:
+        return self.equity_dir / f"{key}.parquet"
+
+    def _save_equity(self, key: str, equity: pd.Series) -> int:
+        """写入净值曲线（先写临时文件再替换，避免并发读到半截文件），返回文件字节数"""
+        path = self._equity_path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        equity.rename("equity").to_frame().to_parquet(tmp)
+        os.replace(tmp, path)
+        return path.stat().st_size
+
+    def _load_equity(self, key: str) -> pd.Series | None:
+        path = self._equity_path(key)
+        if not path.exists():
+            return None
+        return pd.read_parquet(path)["equity"]
+
+    def _evict(self) -> None:
+        """总占用超过 max_bytes 时，按最近访问时间从旧到新淘汰"""
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size, has_equity in self._connection.execute(
+            "SELECT key, size, has_equity FROM results ORDER BY accessed_at"
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append((key, has_equity))
+            total -= size
+        self._delete(victims)
+        with self._connection as conn:
+            self._count(conn, evictions=len(victims))
+        self._stats.evictions += len(victims)
+
+    def _delete(self, rows: list[tuple[str, int]]) -> None:
+        with self._connection as conn:
+            conn.executemany("DELETE FROM results WHERE key = ?", [(key,) for key, _ in rows])
+        for key, has_equity in rows:
+            if has_equity:
+                self._equity_path(key).unlink(missing_ok=True)
+
@@ -0,0 +1,54 @@
+"""
+回测结果缓存命令行 - 查看占用与命中率、列出或清空缓存条目
+
+用法:
+    python -m src.research.result_cache_cli stats
+    python -m src.research.result_cache_cli list --strategy turtle --limit 20
+    python -m src.research.result_cache_cli clear [--strategy turtle]
+    python -m src.research.result_cache_cli --dir data/result_cache stats
+"""
+
+import argparse
+
+from src.research.result_cache import ResultCache, code_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回测结果缓存管理")
+    parser.add_argument("--dir", default="data/result_cache", help="缓存目录 (默认: data/result_cache)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="缓存占用与累计命中率")
+    list_parser = commands.add_parser("list", help="按最近访问时间列出条目")
+    list_parser.add_argument("--strategy", help="只列出指定策略")
+    list_parser.add_argument("--limit", type=int, default=20, help="最多列出条数")
+    clear_parser = commands.add_parser("clear", help="清空缓存")
+    clear_parser.add_argument("--strategy", help="只删除指定策略的条目")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.dir)
+    if args.command == "stats":
+        summary = cache.summary()
+        print(f"缓存目录: {cache.cache_dir}")
+        print(f"条目数:   {summary['entries']}")
+        print(f"占用:     {summary['bytes'] / 1024 / 1024:.1f} MB")
+        print(f"代码版本: {code_version()}")
+        print(f"累计 {summary['lifetime'].format()}")
+        by_strategy = cache.entries().groupby("strategy").agg(
+            entries=("key", "size"), size=("size", "sum"), hits=("hits", "sum")
+        )
+        if not by_strategy.empty:
+            print(f"\n{by_strategy.to_string()}")
+    elif args.command == "list":
+        df = cache.entries(args.strategy, args.limit)
+        if df.empty:
+            print("缓存为空")
+        else:
+            print(df[["strategy", "params", "metrics", "hits", "accessed_at"]].to_string(index=False))
+    else:
+        removed = cache.clear(args.strategy)
+        print(f"已删除 {removed} 条缓存结果")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
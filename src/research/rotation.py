@@ -0,0 +1,283 @@
+"""
+截面动量轮动回测 - 多品种 Top-K 轮动
+
+MomentumStrategy 只处理单品种，多品种轮动在此实现：
+  - 将 N 只 ETF 的收盘价按日期对齐为 (日期 × 品种) 二维面板
+  - 一次性计算全部品种、全部日期的 N 日 ROC 动量得分，并对全部调仓日整体筛选入围品种
+  - 每 rebalance_period 根 bar 调仓一次，持有得分最高且高于 min_momentum 的 top_k 只品种
+
+调仓规则：
+  - 跌出前 top_k 的持仓全部卖出，仍在前 top_k 的持仓保持不动
+  - 新入选品种各按 总权益 / top_k 买入（现金不足时均分剩余现金），数量取整
+  - 以当根收盘价成交，成交价含滑点，买卖双边收取手续费
+  - 当日无行情（未上市/停牌）的品种不参与排名；停牌中的持仓无法卖出，继续占用仓位，
+    已退市（此后再无行情）的持仓按最后收盘价卖出
+净值 = 现金 + Σ 持仓 × 收盘价（无行情日沿用最近收盘价）。
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import BacktestResult, Trade, TradeLog
+from src.data.etf_catalog import ETFCatalog
+from src.data.storage import DataStorage
+from src.indicators import roc
+
+
+@dataclass
+class RotationResult(BacktestResult):
+    """轮动回测结果：在 BacktestResult 基础上记录各调仓日调仓后的持仓品种"""
+    holdings: pd.Series = field(default_factory=pd.Series)
+
+
+def load_close_panel(
+    symbols: list[str] | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    storage_dir: str = "data",
+) -> pd.DataFrame:
+    """
+    从本地 Parquet 加载多品种收盘价，按日期对齐为 (日期 × 品种) 面板
+
+    Args:
+        symbols: 品种代码列表；None 表示 ETFCatalog 中的全部场内 ETF
+        start_date: 起始日期（YYYYMMDD 或 YYYY-MM-DD）
+        end_date: 结束日期
+        storage_dir: 数据存储目录
+
+    Returns:
+        DataFrame，index 为日期，列为品种代码，缺失处为 NaN；无本地数据的品种被跳过
+    """
+    if symbols is None:
+        symbols = ETFCatalog(storage_dir).load()["code"].tolist()
+
+    # 一次读取 (日期 × 品种) 收盘价面板；面板日历为全部品种日期的并集，只保留所选品种有数据的列与日期
+    storage = DataStorage(storage_dir=storage_dir)
+    panel = storage.load_panel("close", symbols, start_date, end_date)
+    panel = panel.dropna(axis=1, how="all").dropna(how="all")
+    if panel.empty:
+        return pd.DataFrame()
+    print(f"[RotationBacktester] 已加载 {panel.shape[1]}/{len(symbols)} 只品种, {len(panel)} 个交易日")
+    return panel
+
+
+class RotationBacktester:
+    """
+    截面动量轮动回测器
+
+    用法:
+        panel = load_close_panel(start_date="20200101")   # 全量 ETF 目录
+        result = RotationBacktester(lookback_period=20, top_k=5, rebalance_period=5).run(panel)
+    """
+
+    def __init__(
+        self,
+        lookback_period: int = 20,
+        top_k: int = 5,
+        rebalance_period: int = 5,
+        min_momentum: float = 0.0,
+        initial_capital: float = 100_000.0,
+        slippage: float = 0.0001,       # 0.01%
+        commission_rate: float = 0.0003, # 0.03%
+    ):
+        if lookback_period < 1:
+            raise ValueError(f"lookback_period 应 >= 1，当前为 {lookback_period}")
+        if top_k < 1:
+            raise ValueError(f"top_k 应 >= 1，当前为 {top_k}")
+        if rebalance_period < 1:
+            raise ValueError(f"rebalance_period 应 >= 1，当前为 {rebalance_period}")
+        self.lookback_period = lookback_period
+        self.top_k = top_k
+        self.rebalance_period = rebalance_period
+        self.min_momentum = min_momentum
+        self.initial_capital = initial_capital
+        self.slippage = slippage
+        self.commission_rate = commission_rate
+
+    @property
+    def name(self) -> str:
+        return f"Rotation(ROC{self.lookback_period},Top{self.top_k},{self.rebalance_period}d)"
+
+    def scores(self, panel: pd.DataFrame) -> np.ndarray:
+        """
+        全部品种、全部日期的动量得分矩阵 (日期 × 品种)
+
+        当日无行情或 lookback_period 根之前尚未上市的位置为 NaN。
+        """
+        raw = panel.to_numpy(dtype=np.float64)
+        return self._scores(raw, panel.ffill().to_numpy(dtype=np.float64))
+
+    def run(self, panel: pd.DataFrame) -> RotationResult:
+        """
+        运行轮动回测
+
+        Args:
+            panel: 收盘价面板，index 为日期，列为品种代码（见 load_close_panel）
+
+        Returns:
+            RotationResult，基准为全体品种等权日收益
+        """
+        n, n_symbols = panel.shape
+        if n == 0 or n_symbols == 0:
+            return RotationResult(initial_capital=self.initial_capital, strategy_name=self.name)
+
+        raw = panel.to_numpy(dtype=np.float64)
+        prices = panel.ffill().to_numpy(dtype=np.float64)
+        tradable = ~np.isnan(raw)
+        # 各品种最后一根有行情的 bar，此后视为退市
+        last_bar = n - 1 - np.argmax(tradable[::-1], axis=0)
+
+        # 1. 全部调仓日整体求第 top_k 高得分，入围者（含并列）为不低于该得分的有效品种
+        rebalance_bars = np.arange(self.lookback_period, n, self.rebalance_period)
+        rank_scores = self._scores(raw, prices)[rebalance_bars]
+        rank_scores[~(rank_scores > self.min_momentum)] = -np.inf
+        if n_symbols > self.top_k:
+            kth = -np.partition(-rank_scores, self.top_k - 1, axis=1)[:, self.top_k - 1]
+            shortlist = (rank_scores >= kth[:, None]) & (rank_scores > -np.inf)
+        else:
+            shortlist = rank_scores > -np.inf
+
+        # 2. 逐调仓日更新持仓，区间内净值按持仓批量计算
+        dates = [str(d) for d in panel.index]
+        symbols = panel.columns.tolist()
+        cash = float(self.initial_capital)
+        quantity = np.zeros(n_symbols, dtype=np.int64)
+        entry_price = np.zeros(n_symbols)
+        entry_bar = np.zeros(n_symbols, dtype=np.int64)
+        equity = np.full(n, cash)
+        trades = TradeLog()
+        holdings = []
+        bounds = np.append(rebalance_bars, n)
+
+        for j, t in enumerate(rebalance_bars.tolist()):
+            price = prices[t]
+            # 入围者按得分降序（同分按列顺序）取前 top_k
+            shortlisted = np.flatnonzero(shortlist[j])
+            order = np.argsort(-rank_scores[j, shortlisted], kind="stable")
+            selected = shortlisted[order[: self.top_k]]
+            in_target = np.zeros(n_symbols, dtype=bool)
+            in_target[selected] = True
+
+            # 卖出跌出前 top_k 的持仓（停牌中的无法卖出）
+            held = np.flatnonzero(quantity)
+            exits = held[~in_target[held] & (tradable[t, held] | (last_bar[held] < t))]
+            for s in exits.tolist():
+                trade, proceeds = self._fill_sell(
+                    int(quantity[s]), entry_price[s], price[s],
+                    dates[entry_bar[s]], dates[t], f"轮动调出 {symbols[s]}",
+                )
+                trades.append(trade)
+                cash += proceeds
+                quantity[s] = 0
+
+            # 买入新入选品种，填满空余仓位
+            held = np.flatnonzero(quantity)
+            slots = self.top_k - len(held)
+            entrants = selected[quantity[selected] == 0][: max(slots, 0)]
+            if len(entrants) > 0:
+                total_equity = cash + price[held] @ quantity[held]
+                budget = min(total_equity / self.top_k, cash / len(entrants))
+                actual_price = price[entrants] * (1 + self.slippage)
+                qty = np.floor(budget / (actual_price * (1 + self.commission_rate))).astype(np.int64)
+                trade_value = qty * actual_price
+                cash -= float(np.sum(trade_value + trade_value * self.commission_rate))
+                filled = qty > 0
+                entrants = entrants[filled]
+                quantity[entrants] = qty[filled]
+                entry_price[entrants] = actual_price[filled]
+                entry_bar[entrants] = t
+
+            held = np.flatnonzero(quantity)
+            holdings.append(tuple(symbols[s] for s in held.tolist()))
+            end = bounds[j + 1]
+            equity[t:end] = cash + prices[t:end, held] @ quantity[held]
+
+        holdings = pd.Series(holdings, index=panel.index[rebalance_bars], dtype=object, name="holdings")
+        return self._build_result(panel, raw, prices, equity, trades, holdings)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+
+    def _scores(self, raw: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """ROC 得分；当日无行情或回看起点尚未上市的位置置为 NaN"""
+        period = self.lookback_period
+        scores = roc(prices, period)
+        valid = ~np.isnan(raw)
+        valid[:period] = False
+        valid[period:] &= ~np.isnan(prices[:-period])
+        scores[~valid] = np.nan
+        return scores
+
+    def _fill_sell(
+        self,
+        quantity: int,
+        entry_price: float,
+        price: float,
+        date_open: str,
+        date_close: str,
+        reason: str,
+    ) -> tuple[Trade, float]:
+        """计算卖出成交，返回 (交易记录, 回笼资金)，与向量化引擎的计算一致"""
+        actual_price = price * (1 - self.slippage)
+
+        trade_value = quantity * actual_price
+        commission = trade_value * self.commission_rate
+
+        pnl = (actual_price - entry_price) * quantity - commission
+        entry_commission = quantity * entry_price * self.commission_rate
+        pnl -= entry_commission
+        pnl_pct = (actual_price - entry_price) / entry_price if entry_price > 0 else 0
+
+        trade = Trade(
+            date_open=date_open,
+            date_close=date_close,
+            side="LONG",
+            quantity=quantity,
+            entry_price=float(entry_price),
+            exit_price=float(actual_price),
+            pnl=float(pnl),
+            pnl_pct=float(pnl_pct),
+            commission=float(commission + entry_commission),
+            reason=reason,
+        )
+        return trade, float(trade_value - commission)
+
+    def _build_result(
+        self,
+        panel: pd.DataFrame,
+        raw: np.ndarray,
+        prices: np.ndarray,
+        equity: np.ndarray,
+        trades: TradeLog,
+        holdings: pd.Series,
+    ) -> RotationResult:
+        """构建回测结果，基准为当日有行情品种的等权日收益"""
+        index = panel.index.rename("date")
+        equity_curve = pd.Series(equity, index=index, name="equity")
+        daily_returns = equity_curve.pct_change().fillna(0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = raw[1:] / prices[:-1] - 1
+        valid = np.isfinite(returns)
+        counts = valid.sum(axis=1)
+        bench = np.zeros(len(panel))
+        bench[1:] = np.where(
+            counts > 0, np.where(valid, returns, 0.0).sum(axis=1) / np.maximum(counts, 1), 0.0
+        )
+        benchmark_returns = pd.Series(bench, index=index, name="benchmark")
+        benchmark_curve = (1 + benchmark_returns).cumprod()
+
+        return RotationResult(
+            equity_curve=equity_curve,
+            daily_returns=daily_returns,
+            benchmark_returns=benchmark_returns,
+            benchmark_curve=benchmark_curve,
+            trades=trades,
+            final_equity=float(equity[-1]),
+            initial_capital=self.initial_capital,
+            strategy_name=self.name,
+            holdings=holdings,
+        )
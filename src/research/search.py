@@ -0,0 +1,180 @@
+"""
+参数搜索采样器 - 随机搜索 / 逐次减半 / TPE
+
+全网格（笛卡尔积）之外的搜索方式，在离散参数空间上用少量回测逼近最优目标值：
+  - random:  无放回随机抽取 budget 个组合
+  - halving: 逐次减半（Successive Halving），先在较短行情上回测全部候选，
+             每轮只保留前 1/eta，行情随之加长，最后一轮在完整行情上回测
+  - tpe:     Tree-structured Parzen Estimator，把已评估组合按得分分为好/坏两组，
+             分别估计各参数的分布 l(x) / g(x)，优先评估 l(x) / g(x) 最大的候选
+采样器只负责提出参数组合（以全网格中的扁平序号表示），回测由 ParameterOptimizer 完成。
+"""
+
+import math
+
+import numpy as np
+
+
+# 未指定预算时的默认采样比例（占全网格）与下限
+DEFAULT_BUDGET_FRACTION = 0.1
+MIN_DEFAULT_BUDGET = 20
+
+# 逐次减半最短一轮的行情长度下限（约一年交易日，更短的行情不足以区分参数优劣）
+HALVING_MIN_BARS = 250
+
+
+def default_budget(grid_size: int) -> int:
+    """未指定预算时的采样组合数"""
+    return min(grid_size, max(MIN_DEFAULT_BUDGET, math.ceil(grid_size * DEFAULT_BUDGET_FRACTION)))
+
+
+class ParamSpace:
+    """
+    离散参数空间
+
+    每个组合对应全网格（与 grid_search 的笛卡尔积顺序一致）中的一个扁平序号。
+    """
+
+    def __init__(self, param_space: dict[str, list]):
+        self.keys = list(param_space.keys())
+        self.values = [list(values) for values in param_space.values()]
+        empty = [k for k, values in zip(self.keys, self.values) if not values]
+        if empty:
+            raise ValueError(f"参数取值列表为空: {', '.join(empty)}")
+        self.sizes = tuple(len(values) for values in self.values)
+        self.size = math.prod(self.sizes)
+        # 数值型参数按取值顺序做核密度估计，其余按类别计数
+        self.numeric = [
+            all(isinstance(v, (int, float, np.number)) and not isinstance(v, bool) for v in values)
+            for values in self.values
+        ]
+
+    def indices(self, flat: int) -> tuple[int, ...]:
+        """扁平序号 → 各参数取值下标"""
+        return tuple(int(i) for i in np.unravel_index(flat, self.sizes))
+
+    def decode(self, flat: int) -> dict:
+        """扁平序号 → 参数字典"""
+        return {k: values[i] for k, values, i in zip(self.keys, self.values, self.indices(flat))}
+
+    def encode(self, indices) -> int:
+        """各参数取值下标 → 扁平序号"""
+        return int(np.ravel_multi_index(tuple(indices), self.sizes))
+
+    def sample(self, n: int, rng: np.random.Generator, exclude: set[int] = frozenset()) -> list[int]:
+        """无放回随机抽取 n 个不在 exclude 中的组合（不足时返回全部剩余组合）"""
+        remaining = self.size - len(exclude)
+        n = min(n, remaining)
+        if n <= 0:
+            return []
+        if n > remaining // 2:
+            # 抽取比例高时直接在剩余组合中抽取
+            pool = np.setdiff1d(np.arange(self.size), np.fromiter(exclude, dtype=np.int64, count=len(exclude)))
+            return rng.choice(pool, n, replace=False).tolist()
+        # 抽取比例低时拒绝采样，无需枚举全网格
+        chosen: list[int] = []
+        seen = set(exclude)
+        while len(chosen) < n:
+            for flat in rng.integers(0, self.size, n - len(chosen)).tolist():
+                if flat not in seen:
+                    seen.add(flat)
+                    chosen.append(flat)
+        return chosen
+
+
+def halving_rounds(n_candidates: int, n_bars: int, eta: int = 3) -> list[tuple[int, int]]:
+    """
+    逐次减半的各轮安排
+
+    Returns:
+        [(本轮候选数, 本轮行情长度), ...]，行情长度逐轮乘以 eta，最后一轮为完整行情
+    """
+    if eta < 2:
+        raise ValueError(f"eta 应 >= 2，当前为 {eta}")
+    rounds = int(math.log(n_candidates, eta) + 1e-9) if n_candidates > 1 else 0
+    # 最短一轮的行情不得短于 HALVING_MIN_BARS（完整行情本身更短时只跑一轮）
+    while rounds > 0 and n_bars / eta**rounds < HALVING_MIN_BARS:
+        rounds -= 1
+
+    schedule = []
+    n = n_candidates
+    for r in range(rounds + 1):
+        bars = n_bars if r == rounds else int(n_bars / eta ** (rounds - r))
+        schedule.append((n, bars))
+        n = max(1, n // eta)
+    return schedule
+
+
+class TPESampler:
+    """
+    TPE 采样器（离散参数空间）
+
+    用法:
+        sampler = TPESampler(space)
+        flats = sampler.suggest(observed, n=4, rng=rng)   # observed: {扁平序号: 得分}，得分越高越好
+    """
+
+    def __init__(self, space: ParamSpace, gamma: float = 0.25, n_candidates: int = 64):
+        if not 0 < gamma < 1:
+            raise ValueError(f"gamma 应在 (0, 1) 之间，当前为 {gamma}")
+        self.space = space
+        self.gamma = gamma                # 得分前 gamma 比例的组合视为"好"组
+        self.n_candidates = n_candidates  # 每次从 l(x) 抽取的候选数
+
+    def suggest(self, observed: dict[int, float], n: int, rng: np.random.Generator) -> list[int]:
+        """提出 n 个未评估的组合（按期望提升从高到低）"""
+        flats = list(observed)
+        if len(flats) < 2:
+            return self.space.sample(n, rng, set(flats))
+
+        scores = np.array([observed[f] for f in flats], dtype=np.float64)
+        order = np.argsort(-scores, kind="stable")
+        n_good = max(1, math.ceil(self.gamma * len(flats)))
+        points = np.array([self.space.indices(f) for f in flats])
+        good, bad = points[order[:n_good]], points[order[n_good:]]
+
+        # 各参数的 l(x) 与 g(x)：log_ratio[d][j] = log l_d(j) - log g_d(j)
+        log_ratio = []
+        l_dists = []
+        for d, size in enumerate(self.space.sizes):
+            l_d = self._density(good[:, d], size, self.space.numeric[d])
+            g_d = self._density(bad[:, d], size, self.space.numeric[d])
+            l_dists.append(l_d)
+            log_ratio.append(np.log(l_d) - np.log(g_d))
+
+        # 从 l(x) 独立抽取各参数，组成候选并按 Σ log l/g 排序
+        draws = np.stack([
+            rng.choice(size, self.n_candidates * n, p=l_d)
+            for size, l_d in zip(self.space.sizes, l_dists)
+        ], axis=1)
+        gains = sum(log_ratio[d][draws[:, d]] for d in range(len(self.space.sizes)))
+
+        chosen: list[int] = []
+        seen = set(flats)
+        for row in np.argsort(-gains, kind="stable").tolist():
+            flat = self.space.encode(draws[row])
+            if flat not in seen:
+                seen.add(flat)
+                chosen.append(flat)
+                if len(chosen) == n:
+                    return chosen
+        # 候选全部已评估（l(x) 过于集中）时以随机组合补足
+        return chosen + self.space.sample(n - len(chosen), rng, seen)
+
+    @staticmethod
+    def _density(points: np.ndarray, size: int, numeric: bool) -> np.ndarray:
+        """
+        单个参数在各取值下标上的概率分布
+
+        数值型参数用带宽 1 个下标的高斯核（相邻取值相互借力），类别型参数按计数；
+        叠加一份均匀先验，保证未观测到的取值仍有被抽到的概率。
+        """
+        weights = np.full(size, 1.0 / size)
+        if len(points):
+            if numeric:
+                grid = np.arange(size)[:, None]
+                kernel = np.exp(-0.5 * (grid - points[None, :]) ** 2)
+                weights += (kernel / kernel.sum(axis=0)).sum(axis=1)
+            else:
+                weights += np.bincount(points, minlength=size)
+        return weights / weights.sum()
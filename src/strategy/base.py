@@ -4,6 +4,12 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import Generator
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import IndicatorCache, compute_indicator
 
 
 class Signal(Enum):
@@ -13,16 +19,28 @@ class Signal(Enum):
     HOLD = "HOLD"
 
 
+# 信号数值编码（用于信号数组的向量化计算）
+SIGNAL_CODES: dict[Signal, int] = {Signal.BUY: 1, Signal.HOLD: 0, Signal.SELL: -1}
+
+
 class Strategy(ABC):
     """
     策略抽象基类
 
     所有策略必须继承此类并实现 on_bar() 和 generate_signal() 方法。
     策略在 on_bar() 中只能访问当前及历史 bar 数据，严禁使用未来函数。
+    可选实现 generate_signals()，一次性返回整段行情的批量信号。
     """
 
+    # 批量信号是否依赖成交回报（如以入场价计算的止损）。
+    # 为 True 时批量信号仅在"信号即成交"的假设下成立，回测引擎不会自动采用，
+    # 而是优先使用 signal_stepper() 按实际成交推进信号。
+    fill_dependent_signals: bool = False
+
     def __init__(self, name: str = "BaseStrategy"):
         self.name = name
+        # 批量指标缓存（由优化器等调用方注入，跨参数组合复用指标数组）
+        self.indicator_cache: IndicatorCache | None = None
 
     @abstractmethod
     def on_bar(self, bar: dict) -> None:
@@ -44,6 +62,83 @@ class Strategy(ABC):
         """
         pass
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series | None:
+        """
+        批量生成整段行情的信号序列（可选实现）
+
+        信号与持仓无关：BUY 表示当根入场条件成立，SELL 表示当根离场条件成立，
+        由引擎决定是否执行（空仓才买入、持仓才卖出）。
+        经引擎执行后必须与逐 bar 的 on_bar() + generate_signal() 结果逐根一致，同样严禁未来函数。
+        fill_dependent_signals 为 True 的策略例外：其批量信号按"每个信号都成交"推演持仓
+        （通常由 filled_signals(self.signal_stepper(data), len(data)) 得到）。
+
+        Args:
+            data: 包含 open, high, low, close, volume 列的 DataFrame，index 为日期
+
+        Returns:
+            与 data 等长、index 相同的 Signal 序列；返回 None 表示不支持批量模式
+        """
+        return None
+
+    def signal_stepper(self, data: pd.DataFrame) -> Generator[Signal, tuple, None] | None:
+        """
+        按实际成交逐 bar 推进的信号生成器（可选实现，供 fill_dependent_signals 策略使用）
+
+        指标预先整段批量计算，生成器内只推进策略自身的状态机。
+        调用方先 next() 启动，之后每根 bar 调用
+        send((上一根信号之后的成交, 当根信号之前的成交)) 得到当根信号；
+        成交为 Signal 列表，与逐 bar 运行时 on_fill() 的调用一一对应。
+        结果必须与 on_bar() + generate_signal() + on_fill() 逐根一致。
+
+        Returns:
+            生成器；返回 None 表示不支持
+        """
+        return None
+
+    def indicator(self, name: str, *inputs: np.ndarray, **params):
+        """
+        获取整段指标数组（供 generate_signals() 使用）
+
+        设置了 indicator_cache 时经缓存获取，否则直接计算。
+        参数须以关键字传入，保证相同指标规格得到相同的缓存键。
+        """
+        if self.indicator_cache is None:
+            return compute_indicator(name, *inputs, **params)
+        return self.indicator_cache.get(name, *inputs, **params)
+
+    @classmethod
+    def generate_signal_grid(
+        cls,
+        data: pd.DataFrame,
+        param_sets: list[dict],
+        indicator_cache: IndicatorCache | None = None,
+    ) -> list[np.ndarray | None]:
+        """
+        批量生成一组参数组合的信号编码（用于参数网格的整体计算）
+
+        默认逐组合实例化策略并调用 generate_signals()；
+        子类可重写以在组合之间共享指标计算（如相同周期的均线）。
+
+        Args:
+            data: 行情 DataFrame
+            param_sets: 参数组合列表，如 [{"short_window": 5, "long_window": 20}, ...]
+            indicator_cache: 各组合共用的指标缓存
+
+        Returns:
+            与 param_sets 一一对应的 int8 信号编码数组（见 SIGNAL_CODES），
+            不支持批量信号的组合为 None
+        """
+        if cls.fill_dependent_signals:
+            return [None] * len(param_sets)
+
+        grid = []
+        for params in param_sets:
+            strategy = cls(**params)
+            strategy.indicator_cache = indicator_cache
+            signals = strategy.generate_signals(data)
+            grid.append(None if signals is None else signal_codes(signals))
+        return grid
+
     def reset(self) -> None:
         """重置策略状态（用于新一轮回测）"""
         pass
@@ -59,3 +154,32 @@ class Strategy(ABC):
             signal: 已成交的信号类型 (BUY / SELL)
         """
         pass
+
+
+# =====================================================================
+# 批量信号辅助函数
+# =====================================================================
+
+def signal_codes(signals) -> np.ndarray:
+    """将 Signal 序列转换为 int8 编码数组（见 SIGNAL_CODES）"""
+    return np.fromiter((SIGNAL_CODES[s] for s in signals), dtype=np.int8, count=len(signals))
+
+
+def filled_signals(stepper: Generator[Signal, tuple, None], n: int) -> list[Signal]:
+    """驱动 signal_stepper()，按"每个非 HOLD 信号都在当根成交"推演 n 根 bar 的信号"""
+    next(stepper)
+    signals = []
+    filled: list[Signal] = []
+    for _ in range(n):
+        signal = stepper.send((filled, ()))
+        signals.append(signal)
+        filled = [] if signal == Signal.HOLD else [signal]
+    return signals
+
+
+def signal_series(index: pd.Index, buy: np.ndarray, sell: np.ndarray) -> pd.Series:
+    """由买入/卖出条件布尔数组构造 Signal 序列（两者同时成立时以 BUY 为准）"""
+    values = np.full(len(index), Signal.HOLD, dtype=object)
+    values[sell] = Signal.SELL
+    values[buy] = Signal.BUY
+    return pd.Series(values, index=index, name="signal")
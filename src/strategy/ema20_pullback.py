@@ -12,10 +12,17 @@ EMA20 回踩双支撑策略 - 继承 Strategy 基类
 
 持仓状态同步：
   - 策略不内部追踪持仓，通过引擎 on_fill 回调同步成交状态
+  - 批量信号按"每个信号都成交"推演持仓，属于依赖成交回报的批量信号；
+    回测引擎改用 signal_stepper()，按实际成交推进同一状态机
 """
 
-from collections import deque
-from src.strategy.base import Strategy, Signal
+from typing import Generator
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import EMA, MACD, RollingMean
+from src.strategy.base import Strategy, Signal, filled_signals
 
 
 class EMA20PullbackStrategy(Strategy):
@@ -27,6 +34,8 @@ class EMA20PullbackStrategy(Strategy):
     内部逐 bar 递推计算所有技术指标，杜绝未来函数。
     """
 
+    fill_dependent_signals = True
+
     def __init__(
         self,
         ema_period: int = 20,
@@ -46,11 +55,9 @@ class EMA20PullbackStrategy(Strategy):
         self.pullback_tolerance = pullback_tolerance
         self.pullback_lookback = pullback_lookback
 
-        # EMA 平滑系数
-        self._ema_alpha = 2.0 / (ema_period + 1)
-        self._macd_fast_alpha = 2.0 / (macd_fast + 1)
-        self._macd_slow_alpha = 2.0 / (macd_slow + 1)
-        self._macd_signal_alpha = 2.0 / (macd_signal + 1)
+        # 指标（首根 bar 用收盘价初始化）
+        self._ema = EMA(ema_period)
+        self._macd = MACD(macd_fast, macd_slow, macd_signal)
 
         # 初始化所有内部状态
         self._bar_count: int = 0
@@ -58,14 +65,13 @@ class EMA20PullbackStrategy(Strategy):
         self._ema20: float | None = None
 
         # MACD 组件
-        self._ema_fast_val: float | None = None
-        self._ema_slow_val: float | None = None
         self._dif: float | None = None
         self._dea: float | None = None
         self._macd_hist: float | None = None
 
-        # 成交量窗口（多留一根用于排除当天）
-        self._volumes: deque[float] = deque(maxlen=volume_period + 1)
+        # 成交量均量（只喂入前一根的成交量，从而排除当天）
+        self._volume_ma = RollingMean(volume_period)
+        self._last_volume: float | None = None
 
         # 策略状态
         self._pullback_bar: int = -999  # 最近一次回踩 EMA20 的 bar 序号
@@ -80,36 +86,15 @@ class EMA20PullbackStrategy(Strategy):
         self._last_close = close
 
         # === 1. 更新 EMA20 ===
-        if self._ema20 is None:
-            self._ema20 = close  # 首根 bar 用收盘价初始化
-        else:
-            self._ema20 = self._ema_alpha * close + (1 - self._ema_alpha) * self._ema20
+        self._ema20 = self._ema.update(close)
 
         # === 2. 更新 MACD ===
-        if self._ema_fast_val is None:
-            self._ema_fast_val = close
-            self._ema_slow_val = close
-            self._dif = 0.0
-            self._dea = 0.0
-            self._macd_hist = 0.0
-        else:
-            self._ema_fast_val = (
-                self._macd_fast_alpha * close
-                + (1 - self._macd_fast_alpha) * self._ema_fast_val
-            )
-            self._ema_slow_val = (
-                self._macd_slow_alpha * close
-                + (1 - self._macd_slow_alpha) * self._ema_slow_val
-            )
-            self._dif = self._ema_fast_val - self._ema_slow_val
-            self._dea = (
-                self._macd_signal_alpha * self._dif
-                + (1 - self._macd_signal_alpha) * self._dea
-            )
-            self._macd_hist = self._dif - self._dea
-
-        # === 3. 更新成交量窗口 ===
-        self._volumes.append(volume)
+        self._dif, self._dea, self._macd_hist = self._macd.update(close)
+
+        # === 3. 更新成交量均量 ===
+        if self._last_volume is not None:
+            self._volume_ma.update(self._last_volume)
+        self._last_volume = volume
 
         # === 4. 更新回踩状态（仅在空仓时追踪） ===
         if not self._in_position:
@@ -137,7 +122,7 @@ class EMA20PullbackStrategy(Strategy):
     def _check_entry(self) -> Signal:
         """检查三条件入场信号"""
         # 需要足够的成交量数据（至少 volume_period + 1 根，才能排除当天）
-        if len(self._volumes) < self.volume_period + 1:
+        if not self._volume_ma.ready:
             return Signal.HOLD
 
         # 条件 1：最近 N 天内曾回踩 EMA20，且当前收盘价已重返上方
@@ -153,9 +138,7 @@ class EMA20PullbackStrategy(Strategy):
             return Signal.HOLD
 
         # 条件 3：缩量（当前量 < 过去 N 天均量，不含当天）
-        past_volumes = list(self._volumes)[:-1]  # 排除当天
-        avg_volume = sum(past_volumes) / len(past_volumes)
-        if self._volumes[-1] >= avg_volume:
+        if self._last_volume >= self._volume_ma.value:
             return Signal.HOLD
 
         # 三条件同时满足 → 发出买入信号
@@ -177,6 +160,78 @@ class EMA20PullbackStrategy(Strategy):
             self._break_count = 0
             return Signal.HOLD
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        """批量信号：按"每个信号都成交"驱动 signal_stepper() 推演持仓"""
+        signals = filled_signals(self.signal_stepper(data), len(data))
+        return pd.Series(signals, index=data.index, name="signal", dtype=object)
+
+    def signal_stepper(self, data: pd.DataFrame) -> Generator[Signal, tuple, None]:
+        """
+        批量计算 EMA20 / MACD / 均量数组，回踩-入场-两日跌破状态机按成交回报顺序推进
+
+        指标与各入场条件均为数组运算；状态机只读取预先抽取的布尔列表，
+        不构造 bar 字典、不调用策略方法。
+        """
+        closes = data["close"].to_numpy(dtype=np.float64)
+        volumes = data["volume"].to_numpy(dtype=np.float64)
+        n = len(closes)
+
+        ema20 = self.indicator("ema", closes, period=self.ema_period)
+        dif, _, _ = self.indicator(
+            "macd", closes, fast=self.macd_fast, slow=self.macd_slow, signal=self.macd_signal
+        )
+        # 均量不含当天：第 i 根使用截至第 i - 1 根的均量
+        volume_ma = np.full(n, np.nan)
+        volume_ma[1:] = self.indicator("rolling_mean", volumes, window=self.volume_period)[:-1]
+
+        # 各条件按逐 bar 判断的写法取反，NaN 的处理与之一致
+        touch = (closes <= ema20 * (1 + self.pullback_tolerance)).tolist()
+        entry_ready = (
+            (np.arange(n) >= self.volume_period)
+            & ~(closes <= ema20)
+            & ~(dif <= 0)
+            & ~(volumes >= volume_ma)
+        ).tolist()
+        below = (closes < ema20).tolist()
+
+        lookback = self.pullback_lookback
+        in_position = False
+        pullback_bar = -999
+        break_count = 0
+        fills_after, fills_before = yield
+        for i in range(n):
+            # 上一根信号之后的成交（on_fill）
+            for fill in fills_after:
+                in_position = fill == Signal.BUY
+                break_count = 0
+                if in_position:
+                    pullback_bar = -999
+
+            # on_bar：空仓时追踪回踩
+            if not in_position and touch[i]:
+                pullback_bar = i + 1
+
+            # 当根信号之前的成交（如风控平仓）
+            for fill in fills_before:
+                in_position = fill == Signal.BUY
+                break_count = 0
+                if in_position:
+                    pullback_bar = -999
+
+            # generate_signal：入场三条件 / 两日跌破
+            signal = Signal.HOLD
+            if not in_position:
+                if entry_ready[i] and i + 1 - pullback_bar <= lookback:
+                    signal = Signal.BUY
+            elif below[i]:
+                break_count += 1
+                if break_count >= 2:
+                    signal = Signal.SELL
+            else:
+                break_count = 0
+
+            fills_after, fills_before = yield signal
+
     def on_fill(self, signal: Signal) -> None:
         """
         引擎通知：订单已成交，同步持仓状态
@@ -197,12 +252,13 @@ class EMA20PullbackStrategy(Strategy):
         self._bar_count = 0
         self._last_close = None
         self._ema20 = None
-        self._ema_fast_val = None
-        self._ema_slow_val = None
+        self._ema.reset()
+        self._macd.reset()
         self._dif = None
         self._dea = None
         self._macd_hist = None
-        self._volumes.clear()
+        self._volume_ma.reset()
+        self._last_volume = None
         self._pullback_bar = -999
         self._break_count = 0
         self._in_position = False
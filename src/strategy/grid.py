@@ -3,11 +3,16 @@
 
 在指定价格区间内等分 N 条网格线，
 价格下穿网格线买入，上穿网格线卖出。
+网格线有序，价格所在层级以二分查找定位，细网格（数百层）下每根 bar 仍为 O(log N)。
 """
 
-from collections import deque
+from bisect import bisect_right
 
-from src.strategy.base import Strategy, Signal
+import numpy as np
+import pandas as pd
+
+from src.indicators import RollingMax, RollingMin
+from src.strategy.base import Strategy, Signal, signal_series
 
 
 class GridStrategy(Strategy):
@@ -32,7 +37,8 @@ class GridStrategy(Strategy):
         self.lower_price = lower_price
         self.lookback_period = lookback_period
 
-        self._prices: deque[float] = deque(maxlen=lookback_period)
+        self._high = RollingMax(lookback_period)
+        self._low = RollingMin(lookback_period)
         self._grid_lines: list[float] = []
         self._last_close: float | None = None
         self._prev_close: float | None = None
@@ -44,33 +50,36 @@ class GridStrategy(Strategy):
         if self.upper_price and self.lower_price:
             upper = self.upper_price
             lower = self.lower_price
-        elif len(self._prices) >= self.lookback_period:
-            upper = max(self._prices)
-            lower = min(self._prices)
+        elif self._high.ready:
+            upper = self._high.value
+            lower = self._low.value
         else:
             return
 
         if upper <= lower:
             return
 
-        step = (upper - lower) / self.grid_num
-        self._grid_lines = [lower + i * step for i in range(self.grid_num + 1)]
+        self._grid_lines = self._make_grid_lines(upper, lower)
         self._grid_initialized = True
 
+    def _make_grid_lines(self, upper: float, lower: float) -> list[float]:
+        """在 [lower, upper] 区间等分 grid_num 格，返回从低到高的网格线"""
+        step = (upper - lower) / self.grid_num
+        return [lower + i * step for i in range(self.grid_num + 1)]
+
     def _get_grid_level(self, price: float) -> int:
-        """获取价格所在的网格层级（0 = 最低，grid_num = 最高）"""
-        for i in range(len(self._grid_lines) - 1):
-            if price < self._grid_lines[i + 1]:
-                return i
-        return len(self._grid_lines) - 1
+        """获取价格所在的网格层级（0 = 最低，grid_num = 最高；区间外取最近一层）"""
+        level = bisect_right(self._grid_lines, price) - 1
+        return min(max(level, 0), len(self._grid_lines) - 1)
 
     def on_bar(self, bar: dict) -> None:
         close = bar["close"]
         self._prev_close = self._last_close
         self._last_close = close
-        self._prices.append(close)
 
         if not self._grid_initialized:
+            self._high.update(close)
+            self._low.update(close)
             self._init_grid()
 
     def generate_signal(self) -> Signal:
@@ -94,6 +103,57 @@ class GridStrategy(Strategy):
 
         return Signal.HOLD
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        """
+        批量计算网格穿越信号
+
+        先确定网格初始化的 bar（固定区间为首根，自动区间为首个最高价 > 最低价的
+        完整 lookback 窗口），再用 searchsorted 一次求出所有 bar 的层级。
+        """
+        closes = data["close"].to_numpy(dtype=np.float64)
+        n = len(closes)
+        buy = np.zeros(n, dtype=bool)
+        sell = np.zeros(n, dtype=bool)
+
+        start, grid_lines = self._batch_grid(closes)
+        if start is None:
+            return signal_series(data.index, buy, sell)
+
+        lines = np.asarray(grid_lines)
+        levels = np.clip(np.searchsorted(lines, closes, side="right") - 1, 0, len(lines) - 1)
+        prev_levels = np.empty_like(levels)
+        prev_levels[1:] = levels[:-1]
+
+        active = np.zeros(n, dtype=bool)
+        active[max(start, 1) :] = True
+        # 与逐 bar 判断写法一致：仅"低于下沿或高于上沿"时视为超出区间
+        active &= ~((closes < lines[0]) | (closes > lines[-1]))
+
+        buy = active & (levels < prev_levels)
+        sell = active & (levels > prev_levels)
+        return signal_series(data.index, buy, sell)
+
+    def _batch_grid(self, closes: np.ndarray) -> tuple[int | None, list[float]]:
+        """
+        批量确定网格初始化位置与网格线
+
+        Returns:
+            (初始化所在 bar 序号, 网格线)；整段行情都无法初始化时为 (None, [])
+        """
+        if self.upper_price and self.lower_price:
+            if self.upper_price <= self.lower_price or len(closes) == 0:
+                return None, []
+            return 0, self._make_grid_lines(self.upper_price, self.lower_price)
+
+        window = self.lookback_period
+        upper = self.indicator("rolling_max", closes, window=window)
+        lower = self.indicator("rolling_min", closes, window=window)
+        candidates = np.flatnonzero(upper > lower)
+        if len(candidates) == 0:
+            return None, []
+        start = int(candidates[0])
+        return start, self._make_grid_lines(float(upper[start]), float(lower[start]))
+
     def on_fill(self, signal: Signal) -> None:
         if signal == Signal.BUY:
             self._in_position = True
@@ -101,7 +161,8 @@ class GridStrategy(Strategy):
             self._in_position = False
 
     def reset(self) -> None:
-        self._prices.clear()
+        self._high.reset()
+        self._low.reset()
         self._grid_lines = []
         self._last_close = None
         self._prev_close = None
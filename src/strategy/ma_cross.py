@@ -2,8 +2,11 @@
 双均线交叉策略 - 继承 Strategy 基类
 """
 
-from collections import deque
-from src.strategy.base import Strategy, Signal
+import numpy as np
+import pandas as pd
+
+from src.indicators import IndicatorCache, RollingMean
+from src.strategy.base import Strategy, Signal, SIGNAL_CODES, signal_series
 
 
 class MACrossStrategy(Strategy):
@@ -11,7 +14,7 @@ class MACrossStrategy(Strategy):
     双均线交叉策略
 
     短期均线上穿长期均线时买入，下穿时卖出。
-    内部维护 rolling window，逐 bar 计算均线，杜绝未来函数。
+    均线由滚动均值指标 O(1) 递推，杜绝未来函数。
     """
 
     def __init__(self, short_window: int = 5, long_window: int = 20):
@@ -19,8 +22,8 @@ class MACrossStrategy(Strategy):
         self.short_window = short_window
         self.long_window = long_window
 
-        # 使用 deque 维护价格窗口，最大长度为长期均线周期
-        self._prices: deque[float] = deque(maxlen=long_window)
+        self._short = RollingMean(short_window)
+        self._long = RollingMean(long_window)
         self._prev_short_ma: float | None = None
         self._prev_long_ma: float | None = None
         self._curr_short_ma: float | None = None
@@ -29,23 +32,15 @@ class MACrossStrategy(Strategy):
     def on_bar(self, bar: dict) -> None:
         """接收一根 bar 数据，更新均线状态"""
         close = bar["close"]
-        self._prices.append(close)
 
         # 保存上一次的均线值（用于判断交叉）
         self._prev_short_ma = self._curr_short_ma
         self._prev_long_ma = self._curr_long_ma
 
-        # 计算当前均线
-        prices_list = list(self._prices)
-        if len(prices_list) >= self.short_window:
-            self._curr_short_ma = sum(prices_list[-self.short_window :]) / self.short_window
-        else:
-            self._curr_short_ma = None
-
-        if len(prices_list) >= self.long_window:
-            self._curr_long_ma = sum(prices_list[-self.long_window :]) / self.long_window
-        else:
-            self._curr_long_ma = None
+        # 计算当前均线（价格窗口最长为 long_window，短均线周期更长时不计算）
+        short_ma = self._short.update(close)
+        self._curr_short_ma = short_ma if self.short_window <= self.long_window else None
+        self._curr_long_ma = self._long.update(close)
 
     def generate_signal(self) -> Signal:
         """
@@ -78,9 +73,61 @@ class MACrossStrategy(Strategy):
 
         return Signal.HOLD
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        """批量计算整段行情的均线交叉信号"""
+        closes = data["close"].to_numpy(dtype=np.float64)
+        short_ma, long_ma = self._moving_averages(closes)
+        buy, sell = self._cross(short_ma, long_ma)
+        return signal_series(data.index, buy, sell)
+
+    @classmethod
+    def generate_signal_grid(
+        cls,
+        data: pd.DataFrame,
+        param_sets: list[dict],
+        indicator_cache: IndicatorCache | None = None,
+    ) -> list[np.ndarray | None]:
+        """整体计算参数网格的交叉信号，相同周期的均线在组合之间只计算一次"""
+        closes = data["close"].to_numpy(dtype=np.float64)
+        if indicator_cache is None:
+            indicator_cache = IndicatorCache()
+        grid = []
+        for params in param_sets:
+            strategy = cls(**params)
+            strategy.indicator_cache = indicator_cache
+            short_ma, long_ma = strategy._moving_averages(closes)
+            buy, sell = cls._cross(short_ma, long_ma)
+            codes = np.zeros(len(closes), dtype=np.int8)
+            codes[sell] = SIGNAL_CODES[Signal.SELL]
+            codes[buy] = SIGNAL_CODES[Signal.BUY]
+            grid.append(codes)
+        return grid
+
+    def _moving_averages(self, closes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """计算短/长均线数组（经指标缓存，相同周期的均线只计算一次）"""
+        long_ma = self.indicator("rolling_mean", closes, window=self.long_window)
+        # 价格窗口最长为 long_window，短均线周期更长时永远无法计算
+        if self.short_window <= self.long_window:
+            short_ma = self.indicator("rolling_mean", closes, window=self.short_window)
+        else:
+            short_ma = np.full(len(closes), np.nan)
+        return short_ma, long_ma
+
+    @staticmethod
+    def _cross(short_ma: np.ndarray, long_ma: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """由均线数组得到上穿（买入）/下穿（卖出）布尔数组"""
+        curr_diff = short_ma - long_ma
+        prev_diff = np.full(len(curr_diff), np.nan)
+        prev_diff[1:] = curr_diff[:-1]
+
+        buy = (prev_diff <= 0) & (curr_diff > 0)
+        sell = (prev_diff >= 0) & (curr_diff < 0)
+        return buy, sell
+
     def reset(self) -> None:
         """重置策略状态"""
-        self._prices.clear()
+        self._short.reset()
+        self._long.reset()
         self._prev_short_ma = None
         self._prev_long_ma = None
         self._curr_short_ma = None
@@ -5,9 +5,11 @@
 出场：收盘价触及布林带上轨 + RSI > 超买阈值，或回归中轨止盈
 """
 
-from collections import deque
+import numpy as np
+import pandas as pd
 
-from src.strategy.base import Strategy, Signal
+from src.indicators import RSI, RollingVariance
+from src.strategy.base import Strategy, Signal, signal_series
 
 
 class MeanReversionStrategy(Strategy):
@@ -33,17 +35,16 @@ class MeanReversionStrategy(Strategy):
         self.rsi_oversold = rsi_oversold
         self.rsi_overbought = rsi_overbought
 
-        self._closes: deque[float] = deque(maxlen=max(bb_period, rsi_period + 1))
         self._last_close: float | None = None
 
         # 布林带
+        self._bb_var = RollingVariance(bb_period)
         self._bb_mid: float | None = None
         self._bb_upper: float | None = None
         self._bb_lower: float | None = None
 
-        # RSI
-        self._gains: deque[float] = deque(maxlen=rsi_period)
-        self._losses: deque[float] = deque(maxlen=rsi_period)
+        # RSI（简单平均涨跌幅）
+        self._rsi_ind = RSI(rsi_period, smoothing="simple")
         self._rsi: float | None = None
 
         self._in_position: bool = False
@@ -52,29 +53,13 @@ class MeanReversionStrategy(Strategy):
         close = bar["close"]
 
         # RSI 计算
-        if self._last_close is not None:
-            change = close - self._last_close
-            self._gains.append(max(change, 0.0))
-            self._losses.append(max(-change, 0.0))
-
-            if len(self._gains) >= self.rsi_period:
-                avg_gain = sum(self._gains) / len(self._gains)
-                avg_loss = sum(self._losses) / len(self._losses)
-                if avg_loss == 0:
-                    self._rsi = 100.0
-                else:
-                    rs = avg_gain / avg_loss
-                    self._rsi = 100.0 - (100.0 / (1.0 + rs))
-
-        self._closes.append(close)
+        self._rsi = self._rsi_ind.update(close)
         self._last_close = close
 
-        # 布林带计算
-        if len(self._closes) >= self.bb_period:
-            recent = list(self._closes)[-self.bb_period:]
-            mean = sum(recent) / len(recent)
-            variance = sum((x - mean) ** 2 for x in recent) / len(recent)
-            std = variance ** 0.5
+        # 布林带计算（总体标准差）
+        if self._bb_var.update(close) is not None:
+            mean = self._bb_var.mean
+            std = self._bb_var.std
 
             self._bb_mid = mean
             self._bb_upper = mean + self.bb_std * std
@@ -98,6 +83,29 @@ class MeanReversionStrategy(Strategy):
 
         return Signal.HOLD
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series | None:
+        """批量计算布林带 + RSI 信号"""
+        closes = data["close"].to_numpy(dtype=np.float64)
+
+        # RSI：最近 rsi_period 个涨跌幅的简单平均
+        rsi_values = self.indicator("rsi", closes, period=self.rsi_period, smoothing="simple")
+
+        # 布林带：总体标准差
+        mid, _ = self.indicator("rolling_variance", closes, window=self.bb_period)
+        std = self.indicator("rolling_std", closes, window=self.bb_period)
+        upper = mid + self.bb_std * std
+        lower = mid - self.bb_std * std
+
+        buy = (closes <= lower) & (rsi_values < self.rsi_oversold)
+        sell = ((closes >= upper) & (rsi_values > self.rsi_overbought)) | (
+            (closes >= mid) & ~np.isnan(rsi_values)
+        )
+
+        # 入场与离场条件同时成立时结果取决于持仓，无法用持仓无关的信号表达
+        if (buy & sell).any():
+            return None
+        return signal_series(data.index, buy, sell)
+
     def on_fill(self, signal: Signal) -> None:
         if signal == Signal.BUY:
             self._in_position = True
@@ -105,12 +113,11 @@ class MeanReversionStrategy(Strategy):
             self._in_position = False
 
     def reset(self) -> None:
-        self._closes.clear()
         self._last_close = None
+        self._bb_var.reset()
         self._bb_mid = None
         self._bb_upper = None
         self._bb_lower = None
-        self._gains.clear()
-        self._losses.clear()
+        self._rsi_ind.reset()
         self._rsi = None
         self._in_position = False
@@ -5,12 +5,13 @@
   - 正动量 → 买入（看多）
   - 负动量 → 卖出（看空/离场）
 
-适用于单品种模式，多品种轮动在 batch_runner 层面实现。
+适用于单品种模式，多品种截面轮动见 src/research/rotation.py (RotationBacktester)。
 """
 
-from collections import deque
+import pandas as pd
 
-from src.strategy.base import Strategy, Signal
+from src.indicators import ROC
+from src.strategy.base import Strategy, Signal, signal_series
 
 
 class MomentumStrategy(Strategy):
@@ -24,23 +25,17 @@ class MomentumStrategy(Strategy):
         super().__init__(name=f"Momentum({lookback_period})")
         self.lookback_period = lookback_period
 
-        self._closes: deque[float] = deque(maxlen=lookback_period + 1)
+        self._roc = ROC(lookback_period)
         self._last_close: float | None = None
         self._momentum: float | None = None
         self._in_position: bool = False
 
     def on_bar(self, bar: dict) -> None:
         close = bar["close"]
-        self._closes.append(close)
         self._last_close = close
 
         # 计算 N 日 ROC
-        if len(self._closes) > self.lookback_period:
-            old_close = self._closes[0]
-            if old_close > 0:
-                self._momentum = (close - old_close) / old_close
-            else:
-                self._momentum = 0.0
+        self._momentum = self._roc.update(close)
 
     def generate_signal(self) -> Signal:
         if self._momentum is None:
@@ -54,6 +49,11 @@ class MomentumStrategy(Strategy):
 
         return Signal.HOLD
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        """批量计算 N 日 ROC：正动量为入场信号，非正动量为离场信号"""
+        momentum = self.indicator("roc", data["close"].to_numpy(), period=self.lookback_period)
+        return signal_series(data.index, momentum > 0, momentum <= 0)
+
     def on_fill(self, signal: Signal) -> None:
         if signal == Signal.BUY:
             self._in_position = True
@@ -61,7 +61,7 @@ class MomentumStrategy(Strategy):
             self._in_position = False
 
     def reset(self) -> None:
-        self._closes.clear()
+        self._roc.reset()
         self._last_close = None
         self._momentum = None
         self._in_position = False
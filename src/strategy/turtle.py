@@ -5,9 +5,13 @@
 出场：收盘价跌破 M 日最低价（唐奇安通道下轨）或 ATR 倍数止损
 """
 
-from collections import deque
+from typing import Generator
 
-from src.strategy.base import Strategy, Signal
+import numpy as np
+import pandas as pd
+
+from src.indicators import ATR, RollingMax, RollingMin
+from src.strategy.base import Strategy, Signal, filled_signals
 
 
 class TurtleStrategy(Strategy):
@@ -15,8 +19,12 @@ class TurtleStrategy(Strategy):
     海龟策略
 
     基于唐奇安通道突破入场，ATR 倍数止损或通道下轨出场。
+    ATR 止损以实际入场 bar 的收盘价为基准，批量信号依赖成交回报，
+    回测引擎改用 signal_stepper() 按实际成交推进。
     """
 
+    fill_dependent_signals = True
+
     def __init__(
         self,
         entry_period: int = 20,
@@ -31,11 +39,14 @@ class TurtleStrategy(Strategy):
         self.atr_period = atr_period
         self.atr_multiplier = atr_multiplier
 
-        self._highs: deque[float] = deque(maxlen=entry_period)
-        self._lows: deque[float] = deque(maxlen=exit_period)
-        self._closes: deque[float] = deque(maxlen=atr_period + 1)
-        self._tr_values: deque[float] = deque(maxlen=atr_period)
+        # 入场通道上轨不含当根，由前 entry_period - 1 根最高价维护
+        self._prev_highs = RollingMax(entry_period - 1) if entry_period > 1 else None
+        self._lows = RollingMin(exit_period, min_periods=1)
+        self._atr_ind = ATR(atr_period, smoothing="simple")
 
+        self._bar_count: int = 0
+        self._channel_high: float | None = None
+        self._channel_low: float | None = None
         self._last_close: float | None = None
         self._atr: float | None = None
         self._entry_price: float | None = None
@@ -46,37 +57,32 @@ class TurtleStrategy(Strategy):
         low = bar["low"]
         close = bar["close"]
 
-        # 计算 True Range
-        if self._closes:
-            prev_close = self._closes[-1]
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            self._tr_values.append(tr)
-
-        self._highs.append(high)
-        self._lows.append(low)
-        self._closes.append(close)
+        self._bar_count += 1
+        if self._prev_highs is None:
+            self._channel_high = high
+        else:
+            self._channel_high = self._prev_highs.value
+            self._prev_highs.update(high)
+        self._channel_low = self._lows.update(low)
         self._last_close = close
 
-        # 计算 ATR
-        if len(self._tr_values) >= self.atr_period:
-            self._atr = sum(self._tr_values) / len(self._tr_values)
+        # 计算 ATR（True Range 简单平均）
+        self._atr = self._atr_ind.update(high, low, close)
 
     def generate_signal(self) -> Signal:
         if self._last_close is None or self._atr is None:
             return Signal.HOLD
 
-        if len(self._highs) < self.entry_period:
+        if self._bar_count < self.entry_period:
             return Signal.HOLD
 
         if not self._in_position:
             # 突破入场通道上轨
-            channel_high = max(list(self._highs)[:-1]) if len(self._highs) > 1 else self._highs[0]
-            if self._last_close > channel_high:
+            if self._last_close > self._channel_high:
                 return Signal.BUY
         else:
             # 跌破出场通道下轨
-            channel_low = min(self._lows)
-            if self._last_close < channel_low:
+            if self._last_close < self._channel_low:
                 return Signal.SELL
 
             # ATR 止损
@@ -85,6 +91,68 @@ class TurtleStrategy(Strategy):
 
         return Signal.HOLD
 
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        """批量信号：按"每个信号都成交"驱动 signal_stepper() 推演持仓"""
+        signals = filled_signals(self.signal_stepper(data), len(data))
+        return pd.Series(signals, index=data.index, name="signal", dtype=object)
+
+    def signal_stepper(self, data: pd.DataFrame) -> Generator[Signal, tuple, None]:
+        """
+        批量计算唐奇安通道与 ATR，按成交回报顺序推进持仓与入场价
+
+        通道与 ATR 均为数组运算，仅入场价相关的止损判断需要顺序推进。
+        """
+        highs = data["high"].to_numpy(dtype=np.float64)
+        lows = data["low"].to_numpy(dtype=np.float64)
+        closes = data["close"].to_numpy(dtype=np.float64)
+        n = len(closes)
+
+        # 入场通道上轨：不含当根的前 entry_period - 1 根最高价
+        if self.entry_period == 1:
+            channel_high = highs
+        else:
+            channel_high = np.full(n, np.nan)
+            channel_high[1:] = self.indicator("rolling_max", highs[:-1], window=self.entry_period - 1)
+
+        # 出场通道下轨：含当根的最近 exit_period 根最低价（不足时取已有数据）
+        channel_low = self.indicator("rolling_min", lows, window=self.exit_period, min_periods=1)
+
+        # ATR：最近 atr_period 个 True Range 的简单平均
+        atr_values = self.indicator(
+            "atr", highs, lows, closes, period=self.atr_period, smoothing="simple"
+        )
+
+        ready = ~np.isnan(atr_values)
+        ready[: self.entry_period - 1] = False
+        entry = (ready & (closes > channel_high)).tolist()
+        channel_exit = (ready & (closes < channel_low)).tolist()
+        stop_offset = (self.atr_multiplier * atr_values).tolist()
+        ready = ready.tolist()
+        close_list = closes.tolist()
+
+        in_position = False
+        entry_price = None
+        fills_after, fills_before = yield
+        for i in range(n):
+            # 成交时以当根收盘价为入场价：信号之后的成交属于上一根
+            for fill in fills_after:
+                in_position = fill == Signal.BUY
+                entry_price = close_list[i - 1] if in_position else None
+            for fill in fills_before:
+                in_position = fill == Signal.BUY
+                entry_price = close_list[i] if in_position else None
+
+            signal = Signal.HOLD
+            if not in_position:
+                if entry[i]:
+                    signal = Signal.BUY
+            elif channel_exit[i] or (
+                ready[i] and entry_price and close_list[i] < entry_price - stop_offset[i]
+            ):
+                signal = Signal.SELL
+
+            fills_after, fills_before = yield signal
+
     def on_fill(self, signal: Signal) -> None:
         if signal == Signal.BUY:
             self._in_position = True
@@ -94,10 +162,13 @@ class TurtleStrategy(Strategy):
             self._entry_price = None
 
     def reset(self) -> None:
-        self._highs.clear()
-        self._lows.clear()
-        self._closes.clear()
-        self._tr_values.clear()
+        if self._prev_highs is not None:
+            self._prev_highs.reset()
+        self._lows.reset()
+        self._atr_ind.reset()
+        self._bar_count = 0
+        self._channel_high = None
+        self._channel_low = None
         self._last_close = None
         self._atr = None
         self._entry_price = None
@@ -0,0 +1,24 @@
+import pytest
+
+from tests.parity import DATASETS, PARQUET_DIR, STRATEGY_CASES, dataset
+
+
+def pytest_collection_modifyitems(config, items):
+    if not PARQUET_DIR.is_dir():
+        skip = pytest.mark.skip(reason=f"缺少本地行情目录 {PARQUET_DIR}")
+        for item in items:
+            if "bars" in getattr(item, "fixturenames", ()):
+                item.add_marker(skip)
+
+
+@pytest.fixture(params=DATASETS)
+def bars(request):
+    return dataset(request.param)
+
+
+@pytest.fixture(
+    params=STRATEGY_CASES,
+    ids=[f"{name}-{'-'.join(map(str, params.values())) or 'default'}" for name, params in STRATEGY_CASES],
+)
+def strategy_case(request):
+    return request.param
@@ -0,0 +1,93 @@
+"""
+一致性测试的公共数据与断言
+
+行情取自 data/parquet 的本地品种，另构造边界输入：
+  - 000688 在第 785 根后插入 30 根价格不变的 bar（停牌等价格持平区间）
+  - 510300 的前 5 / 30 根（短于各指标周期的短历史）
+  - 80 根恒定价格
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import BacktestResult
+
+
+PARQUET_DIR = Path(__file__).resolve().parent.parent / "data" / "parquet"
+
+SYMBOLS = ("000688", "510300", "510500", "512800")
+
+DATASETS = (*SYMBOLS, "000688_flat", "510300_short5", "510300_short30", "constant")
+
+# 每个策略：默认参数 + 一组短周期参数
+STRATEGY_CASES = (
+    ("ma_cross", {}),
+    ("ma_cross", {"short_window": 3, "long_window": 10}),
+    ("ema20_pullback", {}),
+    ("ema20_pullback", {"ema_period": 10, "pullback_lookback": 3}),
+    ("turtle", {}),
+    ("turtle", {"entry_period": 10, "exit_period": 5, "atr_period": 7}),
+    ("grid", {}),
+    ("grid", {"grid_num": 5, "lookback_period": 20}),
+    ("momentum", {}),
+    ("momentum", {"lookback_period": 5}),
+    ("mean_reversion", {}),
+    ("mean_reversion", {"bb_period": 10, "rsi_period": 6}),
+)
+
+_cache: dict[str, pd.DataFrame] = {}
+
+
+def load_symbol(symbol: str) -> pd.DataFrame:
+    return pd.read_parquet(PARQUET_DIR / f"{symbol}.parquet")
+
+
+def with_flat_segment(df: pd.DataFrame, at: int, length: int) -> pd.DataFrame:
+    """在第 at 根之后插入 length 根价格不变（开高低收均为前收）的 bar，日期整体重排为连续交易日"""
+    flat = pd.concat([df.iloc[[at - 1]]] * length)
+    price = df["close"].iloc[at - 1]
+    flat[["open", "high", "low", "close"]] = price
+    out = pd.concat([df.iloc[:at], flat, df.iloc[at:]])
+    out.index = pd.bdate_range(df.index[0], periods=len(out), name="date")
+    return out
+
+
+def constant_bars(n: int, price: float) -> pd.DataFrame:
+    template = load_symbol("510300").iloc[:n].copy()
+    template[["open", "high", "low", "close"]] = price
+    return template
+
+
+def dataset(name: str) -> pd.DataFrame:
+    """按名称取测试行情（进程内缓存，调用方不得修改）"""
+    if name not in _cache:
+        if name in SYMBOLS:
+            df = load_symbol(name)
+        elif name == "000688_flat":
+            df = with_flat_segment(load_symbol("000688"), 785, 30)
+        elif name.startswith("510300_short"):
+            df = load_symbol("510300").iloc[: int(name[len("510300_short") :])]
+        elif name == "constant":
+            df = constant_bars(80, 3.217)
+        else:
+            raise ValueError(f"未知测试行情: '{name}'")
+        _cache[name] = df
+    return _cache[name]
+
+
+def assert_same_result(actual: BacktestResult, expected: BacktestResult) -> None:
+    """交易记录与净值曲线逐位一致"""
+    assert actual.trades.to_dicts() == expected.trades.to_dicts()
+    pd.testing.assert_series_equal(
+        actual.equity_curve, expected.equity_curve, check_exact=True, check_names=False, check_freq=False
+    )
+    assert actual.final_equity == expected.final_equity
+
+
+def assert_bitwise_equal(actual, expected) -> None:
+    """浮点数组逐位一致（NaN 位置相同）"""
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    np.testing.assert_array_equal(actual, expected, strict=True)
@@ -0,0 +1,32 @@
+"""
+基线策略 - 改造前逐 bar 以 list / deque 计算指标的原始实现（保持原样，勿修改）
+
+仅供一致性测试使用：当前策略（流式指标、批量信号）的回测结果须与这些实现逐位一致。
+"""
+
+from tests.reference.ema20_pullback import EMA20PullbackStrategy
+from tests.reference.grid import GridStrategy
+from tests.reference.ma_cross import MACrossStrategy
+from tests.reference.mean_reversion import MeanReversionStrategy
+from tests.reference.momentum import MomentumStrategy
+from tests.reference.turtle import TurtleStrategy
+
+# 与 src.config.STRATEGY_REGISTRY 同名的基线策略
+REFERENCE_REGISTRY = {
+    "ma_cross": MACrossStrategy,
+    "ema20_pullback": EMA20PullbackStrategy,
+    "turtle": TurtleStrategy,
+    "grid": GridStrategy,
+    "momentum": MomentumStrategy,
+    "mean_reversion": MeanReversionStrategy,
+}
+
+__all__ = [
+    "EMA20PullbackStrategy",
+    "GridStrategy",
+    "MACrossStrategy",
+    "MeanReversionStrategy",
+    "MomentumStrategy",
+    "TurtleStrategy",
+    "REFERENCE_REGISTRY",
+]
@@ -0,0 +1,96 @@
+"""
+基线交易统计 - 改造前逐笔遍历 list[dict] 的原始实现（保持原样，勿修改）
+
+仅供一致性测试使用：当前列式实现（TradeLog）的结果须与这些实现逐位一致。
+"""
+
+import pandas as pd
+
+
+def win_rate(trades: list[dict]) -> float:
+    """胜率 = 盈利交易数 / 总交易数"""
+    if not trades:
+        return 0.0
+    winning = sum(1 for t in trades if t.get("pnl", 0) > 0)
+    return winning / len(trades)
+
+
+def profit_loss_ratio(trades: list[dict]) -> float:
+    """盈亏比 = 平均盈利 / |平均亏损|"""
+    if not trades:
+        return 0.0
+    profits = [t["pnl"] for t in trades if t.get("pnl", 0) > 0]
+    losses = [t["pnl"] for t in trades if t.get("pnl", 0) < 0]
+    if not profits:
+        return 0.0
+    if not losses:
+        return float("inf")
+    avg_profit = sum(profits) / len(profits)
+    avg_loss = abs(sum(losses) / len(losses))
+    return avg_profit / avg_loss if avg_loss > 0 else float("inf")
+
+
+def expectancy(trades: list[dict]) -> float:
+    """
+    期望值 = 胜率 × 盈亏比 - (1 - 胜率)
+
+    黄金公式: 期望值 > 0 是盈利的数学基础
+    """
+    wr = win_rate(trades)
+    plr = profit_loss_ratio(trades)
+    if plr == float("inf"):
+        return float("inf")
+    return wr * plr - (1 - wr)
+
+
+def trade_frequency(trades: list[dict], total_days: int) -> float:
+    """交易频率: 平均几个交易日做一次交易"""
+    if not trades or total_days <= 0:
+        return 0.0
+    return total_days / len(trades)
+
+
+def avg_holding_period(trades: list[dict]) -> float:
+    """平均持仓天数"""
+    if not trades:
+        return 0.0
+    holding_days = []
+    for t in trades:
+        try:
+            open_dt = pd.Timestamp(t["date_open"])
+            close_dt = pd.Timestamp(t["date_close"])
+            days = (close_dt - open_dt).days
+            holding_days.append(max(days, 1))  # 至少 1 天
+        except (KeyError, ValueError):
+            continue
+    return sum(holding_days) / len(holding_days) if holding_days else 0.0
+
+
+def max_consecutive_losses(trades: list[dict]) -> int:
+    """最大连续亏损次数"""
+    if not trades:
+        return 0
+    max_streak = 0
+    current_streak = 0
+    for t in trades:
+        if t.get("pnl", 0) < 0:
+            current_streak += 1
+            max_streak = max(max_streak, current_streak)
+        else:
+            current_streak = 0
+    return max_streak
+
+
+def max_consecutive_wins(trades: list[dict]) -> int:
+    """最大连续盈利次数"""
+    if not trades:
+        return 0
+    max_streak = 0
+    current_streak = 0
+    for t in trades:
+        if t.get("pnl", 0) > 0:
+            current_streak += 1
+            max_streak = max(max_streak, current_streak)
+        else:
+            current_streak = 0
+    return max_streak
@@ -0,0 +1,25 @@
+"""
+BatchRunner 结果缓存命中时的行为
+"""
+
+from src.backtest.multi import MultiStrategyEngine
+from src.benchmarks.storage_reads import make_bars
+from src.research.batch_runner import BatchRunner
+from src.research.result_cache import ResultCache
+from tests.parity import STRATEGY_CASES
+
+
+def test_all_cached_skips_engine_pass(tmp_path, monkeypatch):
+    """一个品种的策略全部命中结果缓存时不再遍历行情，结果与首次回测相同"""
+    runner = BatchRunner(storage_dir=str(tmp_path), result_cache=ResultCache(tmp_path / "result_cache"))
+    bars = make_bars(400)
+    indexed = [(i, {"name": name, "params": params}) for i, (name, params) in enumerate(STRATEGY_CASES)]
+    first = runner._run_task("bench", bars, indexed)
+
+    def fail(self, df):
+        raise AssertionError("全部命中缓存时不应遍历行情")
+
+    monkeypatch.setattr(MultiStrategyEngine, "run", fail)
+    second = runner._run_task("bench", bars, indexed)
+    assert all(row["cached"] for row in second)
+    assert [{k: v for k, v in row.items() if k != "cached"} for row in second] == first
@@ -0,0 +1,47 @@
+"""
+批量信号（generate_signals / signal_stepper）与逐 bar on_bar() + generate_signal() 的回测结果一致
+"""
+
+import pytest
+
+from src.backtest.engine import BacktestEngine
+from src.config import STRATEGY_REGISTRY
+from src.strategy.base import filled_signals, signal_codes
+from tests.parity import assert_same_result
+
+
+def per_bar(name: str, params: dict):
+    """禁用批量信号的策略实例，引擎回退逐 bar 模式"""
+    strategy = STRATEGY_REGISTRY[name](**params)
+    strategy.generate_signals = lambda data: None
+    strategy.signal_stepper = lambda data: None
+    return strategy
+
+
+def test_batch_matches_per_bar(bars, strategy_case):
+    name, params = strategy_case
+    expected = BacktestEngine(STRATEGY_REGISTRY[name](**params)).run(bars, mode="iterrows")
+    assert_same_result(BacktestEngine(STRATEGY_REGISTRY[name](**params)).run(bars), expected)
+    assert_same_result(BacktestEngine(per_bar(name, params)).run(bars), expected)
+
+
+def test_fill_dependent_signals_follow_stepper(bars, strategy_case):
+    name, params = strategy_case
+    strategy = STRATEGY_REGISTRY[name](**params)
+    if not strategy.fill_dependent_signals:
+        pytest.skip("批量信号与成交无关")
+    signals = strategy.generate_signals(bars)
+    assert signals is not None
+    assert signals.tolist() == filled_signals(strategy.signal_stepper(bars), len(bars))
+
+
+def test_signal_grid_matches_generate_signals(bars, strategy_case):
+    name, params = strategy_case
+    cls = STRATEGY_REGISTRY[name]
+    [codes] = cls.generate_signal_grid(bars, [params])
+    strategy = cls(**params)
+    signals = None if cls.fill_dependent_signals else strategy.generate_signals(bars)
+    if signals is None:
+        assert codes is None
+    else:
+        assert codes.tolist() == signal_codes(signals).tolist()
@@ -0,0 +1,46 @@
+"""
+断点快照恢复后增量追加（checkpoint / restore / append）与对完整历史重新回测的结果一致
+"""
+
+import pytest
+
+from src.backtest.engine import BacktestEngine, EngineCheckpoint
+from src.config import STRATEGY_REGISTRY
+from tests.parity import assert_same_result
+
+# 断点位置（占全部 bar 的比例）
+SPLITS = (0.3, 0.9)
+
+
+def full_run(bars, name, params):
+    return BacktestEngine(STRATEGY_REGISTRY[name](**params)).run(bars)
+
+
+@pytest.mark.parametrize("split", SPLITS)
+def test_restore_then_append_matches_full_run(bars, strategy_case, split, tmp_path):
+    """前段回测 → 快照存盘 → 新引擎加载恢复 → 追加后段（含重叠的已处理 bar）"""
+    name, params = strategy_case
+    at = max(1, int(len(bars) * split))
+    engine = BacktestEngine(STRATEGY_REGISTRY[name](**params))
+    engine.run(bars.iloc[:at])
+    engine.checkpoint().save(tmp_path / "engine.ckpt")
+
+    resumed = BacktestEngine(STRATEGY_REGISTRY[name](**params))
+    resumed.restore(EngineCheckpoint.load(tmp_path / "engine.ckpt"))
+    assert_same_result(resumed.append(bars.iloc[max(0, at - 3) :]), full_run(bars, name, params))
+
+
+def test_chunked_appends_match_full_run(bars, strategy_case):
+    """逐段追加，每段之后的结果都与对已到达历史的完整回测一致；快照不受之后追加的影响"""
+    name, params = strategy_case
+    engine = BacktestEngine(STRATEGY_REGISTRY[name](**params))
+    step = max(1, len(bars) // 4)
+    engine.run(bars.iloc[:step])
+    checkpoint = engine.checkpoint()
+    for end in range(2 * step, len(bars) + step, step):
+        result = engine.append(bars.iloc[end - step : end])
+        assert_same_result(result, full_run(bars.iloc[:end], name, params))
+
+    resumed = BacktestEngine(STRATEGY_REGISTRY[name](**params))
+    resumed.restore(checkpoint)
+    assert_same_result(resumed.append(bars), full_run(bars, name, params))
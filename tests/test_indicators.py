@@ -0,0 +1,109 @@
+"""
+流式指标与批量指标逐位一致，并与改造前的 list 计算（sum(recent) / len 等）逐位一致
+"""
+
+import numpy as np
+import pytest
+
+from src.indicators import (
+    ATR, EMA, MACD, ROC, RSI, RollingMax, RollingMean, RollingMin, RollingSum, RollingVariance,
+    TrueRange, WilderAverage,
+    atr, ema, macd, roc, rolling_max, rolling_mean, rolling_min, rolling_std, rolling_sum,
+    rolling_variance, rsi, true_range, wilder_average,
+)
+from tests.parity import assert_bitwise_equal
+
+WINDOWS = (1, 2, 5, 10, 20, 60)
+
+# 滚动方差由精确的 x 与 x * x 窗口和相减得到，与两遍法的差异只来自这一步的舍入：
+# |方差 - 两遍法方差| <= VARIANCE_TOLERANCE * 均值²（约 4.5 个 ULP）
+VARIANCE_TOLERANCE = 1e-15
+
+
+def stream(indicator, *columns: np.ndarray) -> np.ndarray:
+    """逐个 update()，未就绪（None）记为 NaN"""
+    out = []
+    for row in zip(*(c.tolist() for c in columns)):
+        value = indicator.update(*row)
+        out.append(np.nan if value is None else value)
+    return np.array(out, dtype=np.float64)
+
+
+def baseline_windows(values: np.ndarray, window: int):
+    """(下标, 窗口 list)，与原策略 list(deque)[-window:] 相同"""
+    values = values.tolist()
+    for i in range(window - 1, len(values)):
+        yield i, values[i - window + 1 : i + 1]
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_rolling_streaming_matches_batch(bars, window):
+    close = bars["close"].to_numpy(dtype=np.float64)
+    assert_bitwise_equal(stream(RollingSum(window), close), rolling_sum(close, window))
+    assert_bitwise_equal(stream(RollingMean(window), close), rolling_mean(close, window))
+    assert_bitwise_equal(stream(RollingMax(window), close), rolling_max(close, window))
+    assert_bitwise_equal(stream(RollingMin(window), close), rolling_min(close, window))
+
+    variance = RollingVariance(window)
+    means, variances, stds = [], [], []
+    for value in close.tolist():
+        variance.update(value)
+        means.append(np.nan if variance.mean is None else variance.mean)
+        variances.append(np.nan if variance.variance is None else variance.variance)
+        stds.append(np.nan if variance.std is None else variance.std)
+    batch_mean, batch_variance = rolling_variance(close, window)
+    assert_bitwise_equal(means, batch_mean)
+    assert_bitwise_equal(variances, batch_variance)
+    assert_bitwise_equal(stds, rolling_std(close, window))
+
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_rolling_matches_baseline_lists(bars, window):
+    """均值、最值与原 list 计算逐位一致，方差在 VARIANCE_TOLERANCE 以内"""
+    close = bars["close"].to_numpy(dtype=np.float64)
+    mean, variance = rolling_variance(close, window)
+    rolling_means = rolling_mean(close, window)
+    stds = rolling_std(close, window)
+    highs, lows = rolling_max(close, window), rolling_min(close, window)
+    for i, recent in baseline_windows(close, window):
+        expected_mean = sum(recent) / len(recent)
+        assert rolling_means[i] == expected_mean
+        assert mean[i] == expected_mean
+        expected_variance = sum((x - expected_mean) ** 2 for x in recent) / len(recent)
+        assert abs(variance[i] - expected_variance) <= VARIANCE_TOLERANCE * expected_mean**2
+        assert stds[i] == variance[i] ** 0.5
+        assert highs[i] == max(recent)
+        assert lows[i] == min(recent)
+
+
+def test_rolling_variance_flat_prices():
+    close = np.r_[np.linspace(3.0, 3.4, 25), np.full(40, 3.217), np.linspace(3.2, 2.9, 10)]
+    mean, variance = rolling_variance(close, 20)
+    flat = slice(25 + 19, 65)
+    assert (variance[flat] == 0.0).all()
+    assert (mean[flat] == close[flat]).all()
+
+
+@pytest.mark.parametrize("period", (3, 14))
+@pytest.mark.parametrize("smoothing", ("simple", "wilder"))
+def test_oscillators_streaming_matches_batch(bars, period, smoothing):
+    close = bars["close"].to_numpy(dtype=np.float64)
+    high = bars["high"].to_numpy(dtype=np.float64)
+    low = bars["low"].to_numpy(dtype=np.float64)
+    assert_bitwise_equal(stream(RSI(period, smoothing), close), rsi(close, period, smoothing))
+    assert_bitwise_equal(stream(ATR(period, smoothing), high, low, close), atr(high, low, close, period, smoothing))
+    assert_bitwise_equal(stream(WilderAverage(period), close), wilder_average(close, period))
+    assert_bitwise_equal(stream(ROC(period), close), roc(close, period))
+
+
+def test_trend_streaming_matches_batch(bars):
+    close = bars["close"].to_numpy(dtype=np.float64)
+    high = bars["high"].to_numpy(dtype=np.float64)
+    low = bars["low"].to_numpy(dtype=np.float64)
+    assert_bitwise_equal(stream(EMA(20), close), ema(close, 20))
+    assert_bitwise_equal(stream(TrueRange(), high, low, close), true_range(high, low, close))
+
+    indicator = MACD(12, 26, 9)
+    streamed = np.array([indicator.update(value) for value in close.tolist()]).reshape(-1, 3)
+    for column, batch in zip(streamed.T, macd(close, 12, 26, 9)):
+        assert_bitwise_equal(column, batch)
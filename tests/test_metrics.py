@@ -0,0 +1,46 @@
+"""
+交易统计（列式 TradeLog 上的向量化计算）与改造前逐笔遍历 list[dict] 的结果逐位一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import metrics
+from src.backtest.engine import TradeLog
+from tests.reference import metrics as reference
+
+TRADE_METRICS = (
+    "win_rate", "profit_loss_ratio", "expectancy", "avg_holding_period",
+    "max_consecutive_losses", "max_consecutive_wins",
+)
+
+
+def random_ledger(rng: np.random.Generator) -> list[dict]:
+    """随机交易记录：盈亏含正负与 0，持仓天数含同日平仓"""
+    n = int(rng.integers(1, 80))
+    pnl = np.round(rng.normal(0, 1000, n) * rng.choice([1e-3, 1, 1e3], n), int(rng.integers(0, 6)))
+    pnl[rng.random(n) < 0.05] = 0.0
+    opens = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1000, n), unit="D")
+    closes = opens + pd.to_timedelta(rng.integers(0, 60, n), unit="D")
+    return [
+        {"pnl": float(p), "date_open": str(o.date()), "date_close": str(c.date())}
+        for p, o, c in zip(pnl, opens, closes)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_trade_metrics_match_baseline(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(50):
+        trades = random_ledger(rng)
+        for name in TRADE_METRICS:
+            expected = getattr(reference, name)(trades)
+            assert getattr(metrics, name)(trades) == expected, name
+            assert getattr(metrics, name)(TradeLog.from_dicts(trades)) == expected, name
+
+
+def test_trade_metrics_on_empty_ledger():
+    for name in TRADE_METRICS:
+        assert getattr(metrics, name)([]) == getattr(reference, name)([])
+        assert getattr(metrics, name)(TradeLog()) == getattr(reference, name)([])
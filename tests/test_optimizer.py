@@ -0,0 +1,36 @@
+"""
+参数网格搜索：tensor 后端（参数组合 × 时间的整体数组计算）与 event 后端（逐组合事件驱动回测）的结果表一致
+"""
+
+import inspect
+
+import pandas as pd
+import pytest
+
+from src.backtest.early_stop import EarlyStop
+from src.config import STRATEGY_REGISTRY
+from src.research.optimizer import ParameterOptimizer
+from tests.parity import STRATEGY_CASES
+
+
+def param_space(name: str) -> dict[str, list]:
+    """由 STRATEGY_CASES 中该策略的非默认参数与默认值组成的参数网格"""
+    defaults = inspect.signature(STRATEGY_REGISTRY[name]).parameters
+    space: dict[str, set] = {}
+    for case, params in STRATEGY_CASES:
+        if case == name:
+            for key, value in params.items():
+                space.setdefault(key, {defaults[key].default}).add(value)
+    return {key: sorted(values) for key, values in space.items()}
+
+
+@pytest.mark.parametrize("name", sorted({name for name, _ in STRATEGY_CASES}))
+@pytest.mark.parametrize(
+    "early_stop", (None, EarlyStop(max_drawdown=-0.05)), ids=("no_early_stop", "early_stop")
+)
+def test_tensor_grid_search_matches_event(bars, name, early_stop):
+    optimizer = ParameterOptimizer(early_stop=early_stop)
+    space = param_space(name)
+    expected = optimizer.grid_search(name, space, bars, backend="event")
+    actual = optimizer.grid_search(name, space, bars, backend="tensor")
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
@@ -0,0 +1,118 @@
+"""
+DataStorage 增量写入后的元数据起止日期、行情面板与品种文件的一致性
+"""
+
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.benchmarks.storage_reads import make_bars
+from src.data import panel as panel_module
+from src.data.bar_cache import BarCache
+from src.data.storage import DataStorage
+
+
+def assert_panel_matches_files(storage: DataStorage, field: str = "close") -> None:
+    """面板与逐品种读取的行情一致（只比较有数据的日期与品种）"""
+    symbols = storage.panel._file_symbols()
+    expected = pd.concat({s: storage.load_bars(s)[field].astype("float64") for s in symbols}, axis=1).sort_index()
+    panel = storage.load_panel(field).dropna(how="all").dropna(axis=1, how="all")
+    pd.testing.assert_frame_equal(panel, expected, check_names=False, check_freq=False)
+
+
+@pytest.mark.parametrize("statistics", (True, False))
+def test_metadata_recovered_from_files_without_row(tmp_path, statistics):
+    """数据库重建后（无元数据行）再追加增量，起止日期仍覆盖已有的主文件与增量文件"""
+    bars = make_bars(600)
+    storage = DataStorage(str(tmp_path), use_cache=False)
+    storage.save_bars("510300", bars.iloc[:-10])
+    storage.save_bars("510300", bars.iloc[-10:-5])
+    if not statistics:
+        pq.write_table(
+            pa.Table.from_pandas(bars.iloc[:-10]), storage._parquet_path("510300"), write_statistics=False
+        )
+    storage.close()
+    os.remove(storage.db_path)
+
+    storage = DataStorage(str(tmp_path), use_cache=False)
+    storage.save_bars("510300", bars.iloc[-5:])
+    [meta] = storage.list_symbols()
+    storage.close()
+    assert meta["first_date"] == str(bars.index.min().date())
+    assert meta["last_date"] == str(bars.index.max().date())
+
+
+@pytest.mark.parametrize("use_mmap", (False, True))
+def test_cached_loads_are_writable_unless_readonly(tmp_path, use_mmap):
+    """经行情缓存 / 内存映射加载默认返回可写副本，原地修改不影响之后的加载"""
+    bars = make_bars(300)
+    storage = DataStorage(str(tmp_path), bar_cache=BarCache(), use_mmap=use_mmap)
+    storage.save_bars("bench", bars)
+
+    df = storage.load_bars("bench", "2025-01-01")
+    close = df["close"].iloc[0]
+    df.loc[df.index[0], "close"] = -1.0
+    assert storage.load_bars("bench", "2025-01-01")["close"].iloc[0] == close
+
+    view = storage.load_bars("bench", "2025-01-01", readonly=True)
+    with pytest.raises(ValueError):
+        view.loc[view.index[0], "close"] = -1.0
+    storage.close()
+
+
+def test_concurrent_appends_keep_every_panel_delta(tmp_path, monkeypatch):
+    """多个线程（各自的 DataStorage）同时追加不同品种，面板增量互不覆盖，合并后与各品种文件一致"""
+    monkeypatch.setattr(panel_module, "PANEL_COMPACT_DELTAS", 4)
+    storage = DataStorage(str(tmp_path), use_cache=False)
+    storage.save_bars("seed", make_bars(100))
+    storage.load_panel()  # 构建面板，之后的写入走面板增量
+
+    def write(i: int) -> None:
+        worker = DataStorage(str(tmp_path), use_cache=False)
+        bars = make_bars(120, seed=i)
+        worker.save_bars(f"s{i}", bars.iloc[:60])
+        for start in range(60, 120, 5):
+            worker.save_bars(f"s{i}", bars.iloc[start : start + 5])
+        worker.close()
+
+    threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert storage.panel.refresh() == []
+    assert_panel_matches_files(storage)
+    assert_panel_matches_files(storage, "volume")
+    assert not [name for name in os.listdir(storage.panel.panel_dir) if name.endswith(".tmp") or name == ".lock"]
+    storage.close()
+
+
+@pytest.mark.parametrize("change", ("replace", "delete", "add", "replace_then_save"))
+def test_panel_picks_up_files_changed_outside_save_bars(tmp_path, change):
+    """不经 save_bars 改写、删除、新增的品种文件在读取面板时按当前行情重写"""
+    storage = DataStorage(str(tmp_path), use_cache=False)
+    for i in range(3):
+        storage.save_bars(f"s{i}", make_bars(200, seed=i))
+    storage.save_bars("s1", make_bars(210, seed=1).iloc[-10:])
+    storage.load_panel()
+
+    if change == "delete":
+        os.remove(storage._parquet_path("s1"))
+    elif change == "add":
+        make_bars(80, seed=9).to_parquet(storage._parquet_path("s9"))
+    else:
+        # 整体替换主文件（如从其他机器复制来的行情），旧增量文件随之删除
+        (make_bars(150, seed=7) * 2).to_parquet(storage._parquet_path("s1"))
+        for delta in storage._delta_paths("s1"):
+            os.remove(delta)
+        if change == "replace_then_save":
+            storage.save_bars("s1", make_bars(160, seed=8).iloc[-10:])
+
+    assert_panel_matches_files(storage)
+    assert_panel_matches_files(storage, "volume")
+    storage.close()
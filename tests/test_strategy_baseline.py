@@ -0,0 +1,19 @@
+"""
+当前策略（流式指标 + 批量信号）与改造前逐 bar list 计算的基线策略回测结果逐位一致
+"""
+
+import pytest
+
+from src.backtest.engine import RUN_MODES, BacktestEngine
+from src.config import STRATEGY_REGISTRY
+from tests.parity import assert_same_result
+from tests.reference import REFERENCE_REGISTRY
+
+
+@pytest.mark.parametrize("mode", RUN_MODES)
+def test_strategy_matches_baseline(bars, strategy_case, mode):
+    name, params = strategy_case
+    expected = BacktestEngine(REFERENCE_REGISTRY[name](**params)).run(bars, mode="iterrows")
+    actual = BacktestEngine(STRATEGY_REGISTRY[name](**params)).run(bars, mode=mode)
+    assert_same_result(actual, expected)
+
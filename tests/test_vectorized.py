@@ -0,0 +1,55 @@
+"""
+向量化回测引擎（预计算信号数组）与事件驱动引擎逐 bar 运行的结果一致
+"""
+
+import numpy as np
+import pytest
+
+from src.backtest.engine import BacktestEngine
+from src.backtest.vectorized import VectorizedBacktestEngine
+from src.config import STRATEGY_REGISTRY
+from src.strategy.base import signal_codes
+from tests.parity import STRATEGY_CASES, assert_same_result
+
+
+def test_vectorized_matches_event_engine(bars, strategy_case):
+    name, params = strategy_case
+    strategy = STRATEGY_REGISTRY[name](**params)
+    if strategy.fill_dependent_signals:
+        pytest.skip("批量信号依赖成交回报，事件驱动引擎按 signal_stepper() 推进")
+    signals = strategy.generate_signals(bars)
+    if signals is None:
+        pytest.skip("该参数下批量信号与持仓相关，不支持向量化回测")
+
+    expected = BacktestEngine(STRATEGY_REGISTRY[name](**params)).run(bars, mode="iterrows")
+    actual = VectorizedBacktestEngine().run(bars, signals, strategy_name=strategy.name)
+    assert_same_result(actual, expected)
+
+
+@pytest.mark.parametrize("name", sorted({name for name, _ in STRATEGY_CASES}))
+def test_run_grid_matches_event_engine(bars, name):
+    cls = STRATEGY_REGISTRY[name]
+    param_sets = [params for case, params in STRATEGY_CASES if case == name]
+    grid = cls.generate_signal_grid(bars, param_sets)
+    supported = [i for i, codes in enumerate(grid) if codes is not None]
+    if not supported:
+        pytest.skip("无支持批量信号的参数组合")
+
+    matrix = np.array([grid[i] for i in supported]).reshape(len(supported), len(bars))
+    equity, trade_count, stop_bar = VectorizedBacktestEngine().run_grid(bars, matrix)
+    assert (stop_bar == -1).all()
+    for row, i in enumerate(supported):
+        expected = BacktestEngine(cls(**param_sets[i])).run(bars, mode="iterrows")
+        np.testing.assert_array_equal(equity[row], expected.equity_curve.to_numpy())
+        assert trade_count[row] == len(expected.trades)
+
+
+def test_signal_codes_round_trip(bars, strategy_case):
+    name, params = strategy_case
+    strategy = STRATEGY_REGISTRY[name](**params)
+    signals = strategy.generate_signals(bars)
+    if signals is None:
+        pytest.skip("不支持批量信号")
+    codes = signal_codes(signals)
+    expected = VectorizedBacktestEngine().run(bars, signals)
+    assert_same_result(VectorizedBacktestEngine().run(bars, codes), expected)